@@ -0,0 +1,44 @@
+"""Run benchmarks: python -m benchmarks [-k FILTER] [-o results.json] [-b baseline.json] [-t 0.2]"""
+
+import argparse
+import json
+import sys
+
+from .cases import CASES
+from .runner import compare, run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks of regta-period")
+    parser.add_argument("-k", "--filter", default="", help="run only cases whose names contain this substring")
+    parser.add_argument("-o", "--output", help="write results as JSON into this file")
+    parser.add_argument("-b", "--baseline", help="compare results with JSON results from this file")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 means 20%%")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="amount of measurements of every case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum duration of a measurement in seconds")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if args.filter in case.name]
+    results = run(cases, args.repeat, args.min_time)
+    for name, result in results["results"].items():
+        print(f"{name:40} {result['ns_per_op']:12.1f} ns/op")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        failed = False
+        print()
+        for name, base, current, passed in compare(results, baseline, args.threshold):
+            failed = failed or not passed
+            status = "ok" if passed else "FAIL"
+            print(f"{name:40} {base:12.1f} -> {current:12.1f} ns/op {current / base - 1:+7.1%} {status}")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+from typing import Callable, Dict, List, NamedTuple
+
+from datetime import datetime, timedelta, timezone
+from functools import reduce
+from heapq import heapify, heapreplace
+from operator import or_
+
+from regta_period import AbstractPeriod, cron, Period, PeriodAggregation
+from regta_period.wheel import TimingWheel
+
+MOMENTS = [datetime(2022, 7, 24) + timedelta(hours=i * 17, minutes=i, microseconds=i) for i in range(100)]
+AWARE_MOMENTS = [dt.replace(tzinfo=timezone.utc) for dt in MOMENTS]
+MOMENTS_NS = [(dt - datetime(1970, 1, 1)) // timedelta(microseconds=1) * 1000 for dt in MOMENTS]
+
+
+class Case(NamedTuple):
+    """Benchmark case.
+
+    Attributes:
+        name (str): Unique name of the case.
+        setup (Callable[[], Callable[[], object]]): Prepare everything and return the measured function.
+        operations (int): Amount of operations made by one call of the measured function.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    operations: int
+
+
+CASES: List[Case] = []
+
+
+def _add_get_next_cases(name: str, create: Callable[[], AbstractPeriod]) -> None:
+    def setup_get_next() -> Callable[[], object]:
+        p = create()
+        moments = AWARE_MOMENTS if p.is_timezone_in_use else MOMENTS
+        return lambda: [p.get_next(dt) for dt in moments]
+
+    def setup_get_interval() -> Callable[[], object]:
+        p = create()
+        moments = AWARE_MOMENTS if p.is_timezone_in_use else MOMENTS
+        return lambda: [p.get_interval(dt) for dt in moments]
+
+    def setup_get_next_ns() -> Callable[[], object]:
+        p = create()
+        return lambda: [p.get_next_ns(epoch_ns) for epoch_ns in MOMENTS_NS]
+
+    CASES.append(Case(f"get_next/{name}", setup_get_next, len(MOMENTS)))
+    CASES.append(Case(f"get_interval/{name}", setup_get_interval, len(MOMENTS)))
+    CASES.append(Case(f"get_next_ns/{name}", setup_get_next_ns, len(MOMENTS_NS)))
+
+
+def _create_aggregation(n: int) -> PeriodAggregation:
+    return PeriodAggregation(*(
+        Period(days=1 + i % 3, time=f"{i % 24}:{i * 7 % 60:02}", timezone=+3) for i in range(n)
+    ))
+
+
+PERIODS: Dict[str, Callable[[], AbstractPeriod]] = {
+    "regular": lambda: Period(seconds=7, milliseconds=3),
+    "at": lambda: Period().every(3).days.at("17:00"),
+    "fixed_offset": lambda: Period().every(3).days.at("17:00").by(+3),
+    "zoneinfo": lambda: Period().daily.at("9:30").by("Europe/Berlin"),
+    "zoneinfo_elapsed": lambda: Period().every(5).hours.by("Europe/Berlin"),
+    "weekdays": lambda: Period().on.weekdays.at("18:00"),
+    "sparse_weekdays": lambda: Period().every(5).hours.on.saturday,
+    "aggregation_1": lambda: _create_aggregation(1),
+    "aggregation_10": lambda: _create_aggregation(10),
+    "aggregation_100": lambda: _create_aggregation(100),
+    "aggregation_1000": lambda: _create_aggregation(1000),
+    # the same moments as a single period with several exact times and as an aggregation
+    "at_24_times": lambda: Period().on.weekdays.at(*(f"{i}:30" for i in range(24))).by(+3),
+    "aggregation_24_times": lambda: PeriodAggregation(*(Period().on.weekdays.at(f"{i}:30").by(+3) for i in range(24))),
+    # days of month found by tables of months and by bitsets of days of the year
+    "last_business_day": lambda: Period().monthly.on.weekdays.on_days(-1).at("18:00").by("Europe/Berlin"),
+    "cron_first_day": lambda: cron.parse("0 18 1 * *", "Europe/Berlin"),
+    # progressions intersected by the Chinese remainder theorem and a merge-walk over a time window
+    "intersection_crt": lambda: Period().every(6).hours.by(+3) & Period().every(4).hours.on.weekdays.by(+3),
+    "intersection_walk": lambda: Period(minutes=7).by(+3) & Period(minutes=5).within("09:00", "18:00").by(+3),
+}
+for _name, _create in PERIODS.items():
+    _add_get_next_cases(_name, _create)
+
+
+def _setup_construction() -> Callable[[], object]:
+    return lambda: Period().every(3).days.at("17:00").by("Europe/Moscow")
+
+
+def _setup_or_chain() -> Callable[[], object]:
+    periods = [Period(hours=i + 1) for i in range(100)]
+    return lambda: reduce(or_, periods)
+
+
+CASES.append(Case("construction/builder", _setup_construction, 1))
+CASES.append(Case("construction/or_chain_100", _setup_or_chain, 100))
+
+
+SCHEDULED_PERIODS = [Period(seconds=1 + i % 600, milliseconds=i % 7) for i in range(100_000)]
+TICK_NS = 10 ** 8
+
+
+def _setup_wheel() -> Callable[[], object]:
+    now = MOMENTS_NS[0]
+    wheel = TimingWheel(now)
+    for period in SCHEDULED_PERIODS:
+        wheel.insert(period)
+
+    def advance() -> object:
+        nonlocal now
+        now += TICK_NS
+        return wheel.advance(now)
+
+    return advance
+
+
+def _setup_heapq() -> Callable[[], object]:
+    now = MOMENTS_NS[0]
+    queue = [(period.get_next_ns(now), i) for i, period in enumerate(SCHEDULED_PERIODS)]
+    heapify(queue)
+
+    def advance() -> object:
+        nonlocal now
+        now += TICK_NS
+        due = []
+        while queue[0][0] <= now:
+            moment, i = queue[0]
+            due.append((moment, SCHEDULED_PERIODS[i]))
+            heapreplace(queue, (SCHEDULED_PERIODS[i].get_next_ns(now), i))
+        return due
+
+    return advance
+
+
+def _setup_wheel_insert_cancel() -> Callable[[], object]:
+    wheel = TimingWheel(MOMENTS_NS[0])
+    return lambda: [wheel.cancel(wheel.insert(period)) for period in SCHEDULED_PERIODS[:100]]
+
+
+# advancing 100k periods by 100 ms ticks, the heap of the next moments is the baseline
+CASES.append(Case("scheduling/wheel_advance_100000", _setup_wheel, 1))
+CASES.append(Case("scheduling/heapq_advance_100000", _setup_heapq, 1))
+CASES.append(Case("scheduling/wheel_insert_cancel", _setup_wheel_insert_cancel, 100))
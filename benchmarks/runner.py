@@ -0,0 +1,64 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+import platform
+from timeit import Timer
+
+import regta_period
+
+from .cases import Case
+
+VERSION = 1
+
+
+def measure(case: Case, repeat: int = 5, min_time: float = 0.2) -> float:
+    """Measure the best time of an operation of the case.
+
+    Args:
+        case (Case): Benchmark case.
+        repeat (int): Amount of measurements, the best one is taken.
+        min_time (float): Minimum duration of a measurement in seconds.
+
+    Return:
+        float: Nanoseconds per operation.
+    """
+    timer = Timer(case.setup())
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / case.operations * 1e9
+
+
+def run(cases: Iterable[Case], repeat: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    """Measure cases and collect results in a JSON-compatible dict."""
+    return {
+        "version": VERSION,
+        "regta_period": regta_period.__version__,
+        "python": platform.python_version(),
+        "results": {case.name: {"ns_per_op": measure(case, repeat, min_time)} for case in cases},
+    }
+
+
+def compare(
+        results: Dict[str, Any],
+        baseline: Dict[str, Any],
+        threshold: float,
+) -> List[Tuple[str, float, float, bool]]:
+    """Compare results with a baseline.
+
+    Args:
+        results (Dict[str, Any]): Results made by :func:`run`.
+        baseline (Dict[str, Any]): Baseline results made by :func:`run`.
+        threshold (float): Allowed slowdown, e.g. 0.2 means 20%.
+
+    Return:
+        List[Tuple[str, float, float, bool]]: Name, baseline time, current time and if it's passed,
+        for every case present in both results.
+    """
+    comparison = []
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        passed = result["ns_per_op"] <= base["ns_per_op"] * (1 + threshold)
+        comparison.append((name, base["ns_per_op"], result["ns_per_op"], passed))
+    return comparison
@@ -1,10 +1,14 @@
+from .abstract import AbstractPeriod
 from .enums import Weekdays
-from .periods import AbstractPeriod, Period, PeriodAggregation
+from .intersection import PeriodIntersection
+from .periods import FrozenPeriod, Period, PeriodAggregation
 
 __version__ = '0.2.0'
 __all__ = [
     "AbstractPeriod",
+    "FrozenPeriod",
     "Period",
     "PeriodAggregation",
+    "PeriodIntersection",
     "Weekdays",
 ]
@@ -0,0 +1,267 @@
+from typing import Any, AsyncIterator, cast, Iterator, Sequence, Union
+
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timedelta
+from itertools import takewhile
+
+from .batch import Batch, is_datetimes, is_vectorized, Microseconds, numpy
+from .timestamps import from_timestamp, MICROSECOND, NANOSECONDS, to_timestamp, utc
+
+Timestamps = Union[Sequence[datetime], Sequence[int], array, "numpy.ndarray"]
+
+# the Gregorian calendar repeats every 400 years, so a period without moments within them has no moments at all
+MAX_LOOKBACK = timedelta(days=146097)
+
+
+class AbstractPeriod(ABC):
+    """The minimum interface every period object has."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def get_interval(self, dt: datetime) -> timedelta:
+        """Get time to the next moment as timedelta since passed moment.
+
+        Args:
+            dt (datetime): Current moment (:math:`t`)
+
+        Return:
+            timedelta: Interval to the next moment (:math:`f(t)`)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_next(self, dt: datetime) -> datetime:
+        """Get the next moment since passed moment.
+
+        Args:
+            dt (datetime): Current moment (:math:`t`)
+
+        Return:
+            datetime: The next moment (:math:`t + f(t)`)
+        """
+        raise NotImplementedError
+
+    def get_prev(self, dt: datetime) -> datetime:
+        """Get the last moment before passed moment, e.g. the last missed moment after a restart.
+
+        Args:
+            dt (datetime): Current moment. It's not included even if it's a moment of the period.
+
+        Return:
+            datetime: The previous moment.
+        """
+        # The generic implementation looks back by doubling steps until there's a moment, and then goes forward
+        # to the last one, subclasses override it with closed-form calculations.
+        step = max(self.get_interval(dt), MICROSECOND)
+        while True:
+            if step > MAX_LOOKBACK:
+                raise ValueError(f"The period has no moments within {MAX_LOOKBACK.days} days before {dt}")
+            moment = self.get_next(dt - step)
+            if moment < dt:
+                break
+            step *= 2
+        next_moment = self.get_next(moment)
+        while next_moment < dt:
+            moment, next_moment = next_moment, self.get_next(next_moment)
+        return moment
+
+    @property
+    @abstractmethod
+    def is_timezone_in_use(self) -> bool:
+        """If timezone is specified, return True, else False."""
+        raise NotImplementedError
+
+    def _check_datetime(self, dt: datetime) -> None:
+        if (dt.tzinfo is None) == self.is_timezone_in_use:
+            raise TypeError(
+                "Can't calculate moments of a period with a time zone for a naive datetime "
+                "and vice versa, a period without a time zone for an aware datetime"
+            )
+
+    def get_next_ns(self, epoch_ns: int) -> int:
+        """Get the next moment since passed moment as integer epoch nanoseconds, e.g. :func:`time.time_ns`.
+
+        Moments of periods without a time zone are calculated as if their time is UTC.
+
+        Args:
+            epoch_ns (int): Current moment in nanoseconds since the epoch.
+
+        Return:
+            int: The next moment in nanoseconds since the epoch.
+        """
+        # The generic implementation goes through datetime objects, subclasses override it with integer calculations.
+        # Moments are whole microseconds, so the next one since the truncated moment is also the next one since
+        # the passed moment.
+        dt = from_timestamp(epoch_ns // NANOSECONDS, utc if self.is_timezone_in_use else None)
+        return to_timestamp(self.get_next(dt)) * NANOSECONDS
+
+    def get_prev_ns(self, epoch_ns: int) -> int:
+        """Get the last moment before passed moment as integer epoch nanoseconds, see :meth:`get_prev`.
+
+        Args:
+            epoch_ns (int): Current moment in nanoseconds since the epoch.
+
+        Return:
+            int: The previous moment in nanoseconds since the epoch.
+        """
+        # moments are whole microseconds, so moments before the rounded up moment are before the passed one
+        dt = from_timestamp(-(-epoch_ns // NANOSECONDS), utc if self.is_timezone_in_use else None)
+        return to_timestamp(self.get_prev(dt)) * NANOSECONDS
+
+    def get_interval_ns(self, epoch_ns: int) -> int:
+        """Get time to the next moment since passed moment in integer nanoseconds.
+
+        Args:
+            epoch_ns (int): Current moment in nanoseconds since the epoch.
+
+        Return:
+            int: Interval to the next moment in nanoseconds.
+        """
+        return self.get_next_ns(epoch_ns) - epoch_ns
+
+    def iter(self, start: datetime) -> Iterator[datetime]:
+        """Iterate over moments since passed moment lazily.
+
+        Args:
+            start (datetime): Current moment. It's not included even if it's a moment of the period.
+
+        Return:
+            Iterator[datetime]: Infinite iterator of the next moments in ascending order.
+        """
+        moment = self.get_next(start)
+        while True:
+            yield moment
+            moment = self.get_next(moment)
+
+    def iter_reversed(self, start: datetime) -> Iterator[datetime]:
+        """Iterate over moments before passed moment lazily, e.g. to look back over missed moments.
+
+        Args:
+            start (datetime): Current moment. It's not included even if it's a moment of the period.
+
+        Return:
+            Iterator[datetime]: Infinite iterator of the previous moments in descending order.
+        """
+        moment = self.get_prev(start)
+        while True:
+            yield moment
+            moment = self.get_prev(moment)
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Iterate over moments in the range :math:`(start, end]` lazily.
+
+        Args:
+            start (datetime): The beginning of the range, exclusive.
+            end (datetime): The end of the range, inclusive.
+
+        Return:
+            Iterator[datetime]: Iterator of the moments in ascending order.
+        """
+        return takewhile(lambda moment: moment <= end, self.iter(start))
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Count moments in the range :math:`(start, end]`, the same ones as :meth:`between` yields.
+
+        Args:
+            start (datetime): The beginning of the range, exclusive.
+            end (datetime): The end of the range, inclusive.
+
+        Return:
+            int: Amount of moments.
+        """
+        # The generic implementation iterates over moments, subclasses override it with closed-form calculations
+        return sum(1 for _ in self.between(start, end))
+
+    def shard(self, k: int, n: int) -> "AbstractPeriod":
+        """Get a view of the moments whose ordinals modulo :math:`n` equal :math:`k`,
+        see :class:`regta_period.shards.ShardedPeriod`.
+
+        Args:
+            k (int): Index of the shard, :math:`0 \\le k < n`.
+            n (int): Amount of shards.
+        """
+        from .shards import ShardedPeriod  # pylint: disable=import-outside-toplevel,cyclic-import
+        return ShardedPeriod(cast(Any, self), k, n)
+
+    def exclude(self, calendar: Any) -> "AbstractPeriod":
+        """Get a view of the moments outside blackout windows and holidays of the calendar,
+        see :class:`regta_period.exclusions.ExcludedPeriod`.
+
+        Args:
+            calendar (ExclusionCalendar): Blackout windows and holidays.
+        """
+        from .exclusions import ExcludedPeriod  # pylint: disable=import-outside-toplevel,cyclic-import
+        return ExcludedPeriod(self, calendar)
+
+    def __and__(self, other: "AbstractPeriod") -> "AbstractPeriod":
+        """Create :class:`regta_period.PeriodIntersection` of moments of both periods,
+        e.g. :code:`Period().every(6).hours & Period().every(4).hours`.
+        """
+        from .intersection import PeriodIntersection  # pylint: disable=import-outside-toplevel,cyclic-import
+        return PeriodIntersection(self, other)
+
+    def aiter(self, start: Union[datetime, None] = None) -> AsyncIterator[datetime]:
+        """Iterate over moments asynchronously, see :func:`regta_period.aio.iter_moments`.
+
+        Args:
+            start (Union[datetime, None]): Moment to start after, now by default.
+
+        Return:
+            AsyncIterator[datetime]: Infinite asynchronous iterator of the next moments.
+        """
+        from .aio import iter_moments  # pylint: disable=import-outside-toplevel,cyclic-import
+        return iter_moments(self, start)
+
+    async def sleep_until_next(self) -> datetime:
+        """Sleep until the next moment since now, see :func:`regta_period.aio.sleep_until_next`.
+
+        Return:
+            datetime: The moment.
+        """
+        from .aio import sleep_until_next  # pylint: disable=import-outside-toplevel,cyclic-import
+        return await sleep_until_next(self)
+
+    def get_next_many(self, timestamps: Timestamps) -> Any:
+        """Get the next moments since each of passed moments.
+
+        Sequences of datetime objects are calculated moment by moment. Epoch microseconds and NumPy
+        ``datetime64`` arrays are calculated with whole-array arithmetic if NumPy is installed.
+
+        Args:
+            timestamps (Union[Sequence[datetime], Sequence[int], array.array, numpy.ndarray]):
+                Current moments as datetime objects, epoch microseconds or NumPy ``datetime64`` array.
+
+        Return:
+            The next moments in the same kind of container as passed.
+        """
+        if is_datetimes(timestamps):
+            return [self.get_next(dt) for dt in cast(Sequence[datetime], timestamps)]
+        batch = Batch(timestamps)
+        return batch.moments(self._get_next_many(batch.values))
+
+    def get_interval_many(self, timestamps: Timestamps) -> Any:
+        """Get time to the next moments since each of passed moments.
+
+        Args:
+            timestamps (Union[Sequence[datetime], Sequence[int], array.array, numpy.ndarray]):
+                Current moments as datetime objects, epoch microseconds or NumPy ``datetime64`` array.
+
+        Return:
+            Intervals as :obj:`list` of :obj:`timedelta` for datetime objects, microseconds for epoch microseconds,
+            and ``timedelta64`` array for ``datetime64`` array.
+        """
+        if is_datetimes(timestamps):
+            return [self.get_interval(dt) for dt in cast(Sequence[datetime], timestamps)]
+        batch = Batch(timestamps)
+        return batch.intervals(self._get_next_many(batch.values))
+
+    def _get_next_many(self, values: Microseconds) -> Microseconds:
+        # The generic implementation goes moment by moment, subclasses override it with faster calculations
+        timezone = utc if self.is_timezone_in_use else None
+        moments = [
+            to_timestamp(self.get_next(from_timestamp(value, timezone)))
+            for value in (values.tolist() if is_vectorized(values) else values)
+        ]
+        return numpy.array(moments, dtype=numpy.int64) if is_vectorized(values) else moments
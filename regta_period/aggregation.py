@@ -0,0 +1,304 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from datetime import datetime, timedelta
+from heapq import heapify, heapreplace, merge
+from threading import Lock
+
+from .abstract import AbstractPeriod
+from .batch import is_vectorized, Microseconds, numpy
+from .moments import CompiledPeriod
+from .ordinals import get_union_nth, get_union_ordinal, get_union_terms
+from .periods import FrozenPeriod, Period
+from .timestamps import from_timestamp, to_timestamp, utc
+
+
+class PeriodAggregation(AbstractPeriod):
+    """Aggregation class for :class:`Period`.
+
+    It contains the logic of how to get the nearest time moment and add data into
+    the last period object.
+
+    In the stateful mode it keeps the next moment of every period in a priority queue and
+    recalculates only periods whose moments have passed, so a scheduler that advances
+    monotonically pays O(log n) per moment instead of O(n).
+    The state is reset when the passed moment goes back or its time zone changes.
+    Periods mustn't be changed directly while the stateful mode is in use,
+    changes made via the aggregation reset the state.
+
+    Args:
+        *periods (Tuple[Union[Period, FrozenPeriod]]): Periods to aggregate.
+        stateful (bool): Cache the next moments of the periods between calls.
+
+    Attributes:
+        periods (Tuple[Union[Period, FrozenPeriod]]): Aggregated periods.
+        stateful (bool): If the stateful mode is in use.
+    """
+
+    def __init__(self, *periods: Union[Period, FrozenPeriod], stateful: bool = False):
+        if not periods:
+            raise ValueError("No period has been passed")
+        for period in periods:
+            period._compile()  # pylint: disable=protected-access
+        self.periods = periods
+        self.stateful = stateful
+        self._lock = Lock()
+        self._queue: List[Tuple[Any, int]] = []
+        self._last: Any = None
+
+    def _get_next_stateful(self, current: Any, get_next: Callable[[Any, Any], Any]) -> Any:
+        """Get the next moment from the priority queue of the next moments of the periods.
+        Moments are either datetime objects or epoch nanoseconds, the state is reset when the kind changes.
+        """
+        with self._lock:
+            last = self._last
+            if (
+                last is None
+                or type(last) is not type(current)  # pylint: disable=unidiomatic-typecheck
+                or getattr(last, "tzinfo", None) is not getattr(current, "tzinfo", None)
+                or current < last
+            ):
+                self._queue = [(get_next(period, current), i) for i, period in enumerate(self.periods)]
+                heapify(self._queue)
+            else:
+                queue = self._queue
+                while queue[0][0] <= current:
+                    _, i = queue[0]
+                    heapreplace(queue, (get_next(self.periods[i], current), i))
+            self._last = current
+            return self._queue[0][0]
+
+    def get_next(self, dt: datetime) -> datetime:
+        if not self.stateful:
+            return min(map(lambda period: period.get_next(dt), self.periods))
+        return self._get_next_stateful(dt, lambda period, current: period.get_next(current))
+
+    def get_next_ns(self, epoch_ns: int) -> int:
+        if not self.stateful:
+            return min(period.get_next_ns(epoch_ns) for period in self.periods)
+        return self._get_next_stateful(epoch_ns, lambda period, current: period.get_next_ns(current))
+
+    def get_prev(self, dt: datetime) -> datetime:
+        """Get the last moment before passed moment as the latest of the previous moments of the periods."""
+        return max(period.get_prev(dt) for period in self.periods)
+
+    def get_prev_ns(self, epoch_ns: int) -> int:
+        return max(period.get_prev_ns(epoch_ns) for period in self.periods)
+
+    def _get_union_terms(self) -> Union[List[Tuple[int, CompiledPeriod]], None]:
+        """Get terms of counts of moments, see :func:`regta_period.ordinals.get_union_terms`,
+        or None if the periods have different time zones."""
+        # pylint: disable=protected-access
+        periods = self.periods
+        if any(
+            period._timezone != periods[0]._timezone or period._timezone_offset != periods[0]._timezone_offset
+            for period in periods
+        ):
+            return None
+        # equal periods are counted once, and the order doesn't matter
+        return get_union_terms(tuple(sorted({period._compile() for period in periods}, key=repr)))
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Count moments in the range :math:`(start, end]`.
+
+        Moments of periods are counted in closed form, see :meth:`Period.index_of`, and common moments
+        of periods are subtracted by the inclusion-exclusion principle. If periods have different
+        time zones or too many common moments, moments are counted one by one.
+        """
+        terms = self._get_union_terms()
+        if terms is None:
+            return super().count_between(start, end)
+        self.periods[0]._check_datetime(start)  # pylint: disable=protected-access
+        self.periods[0]._check_datetime(end)  # pylint: disable=protected-access
+        return max(get_union_ordinal(terms, to_timestamp(end)) - get_union_ordinal(terms, to_timestamp(start)), 0)
+
+    def _get_countable_terms(self) -> List[Tuple[int, CompiledPeriod]]:
+        terms = self._get_union_terms()
+        if terms is None:
+            raise ValueError("Moments of periods with different time zones or lots of common moments can't be numbered")
+        return terms
+
+    def index_of(self, dt: datetime) -> int:
+        """Get the ordinal of the last moment at or before passed moment.
+
+        Moments are numbered since the epoch, the first moment at or after 01.01.1970 00:00 UTC has the ordinal 0.
+
+        Args:
+            dt (datetime): Moment.
+
+        Return:
+            int: Ordinal of the moment, or of the last moment before it.
+        """
+        self.periods[0]._check_datetime(dt)  # pylint: disable=protected-access
+        return get_union_ordinal(self._get_countable_terms(), to_timestamp(dt))
+
+    def nth(self, n: int) -> datetime:
+        """Get the moment with the passed ordinal, see :meth:`index_of`.
+
+        Args:
+            n (int): Ordinal of the moment.
+
+        Return:
+            datetime: The moment in UTC. It's naive if the time zone isn't in use.
+        """
+        timestamp = get_union_nth(self._get_countable_terms(), n)
+        return from_timestamp(timestamp, utc if self.is_timezone_in_use else None)
+
+    def optimize(self) -> "PeriodAggregation":
+        """Create a new :class:`PeriodAggregation` with the same moments and fewer periods.
+
+        Periods which differ only in weekdays are merged into one period,
+        and periods whose moments are moments of another period are removed.
+        The passed periods aren't changed.
+        """
+        # pylint: disable=protected-access
+        merged: Dict[Tuple[Any, ...], Union[Period, FrozenPeriod]] = {}
+        for period in self.periods:
+            compiled = period._compile()
+            key = (
+                period._timezone, period._timezone_offset, compiled.regular_offset, compiled.time_offset,
+                compiled.slots, compiled.window, compiled.calendar,
+                # days of month are counted among weekdays, so weekdays of such periods can't be merged
+                compiled.weekdays if compiled.calendar is not None else None,
+            )
+            same = merged.get(key)
+            merged[key] = period if same is None else same._merge_weekdays(period)
+
+        periods = list(merged.values())
+        optimized = [
+            period for i, period in enumerate(periods)
+            # equal periods include each other, the first of them is kept
+            if not any(
+                other._includes(period) and (j < i or not period._includes(other))
+                for j, other in enumerate(periods) if i != j
+            )
+        ]
+        return PeriodAggregation(*optimized, stateful=self.stateful)
+
+    def freeze(self) -> "PeriodAggregation":
+        """Create a new :class:`PeriodAggregation` of frozen periods, see :meth:`Period.freeze`.
+        The aggregation itself stays mutable, so the stateful mode still needs a lock.
+        """
+        return PeriodAggregation(*(period.freeze() for period in self.periods), stateful=self.stateful)
+
+    def _reset_state(self) -> None:
+        with self._lock:
+            self._last = None
+
+    def iter(self, start: datetime) -> Iterator[datetime]:
+        previous = None
+        for moment in merge(*(period.iter(start) for period in self.periods)):
+            if moment != previous:
+                yield moment
+                previous = moment
+
+    def iter_reversed(self, start: datetime) -> Iterator[datetime]:
+        previous = None
+        for moment in merge(*(period.iter_reversed(start) for period in self.periods), reverse=True):
+            if moment != previous:
+                yield moment
+                previous = moment
+
+    def _get_next_many(self, values: Microseconds) -> Microseconds:
+        # pylint: disable=protected-access
+        moments: List[Any] = [period._get_next_many(values) for period in self.periods]
+        if is_vectorized(values):
+            return numpy.minimum.reduce(moments)
+        return list(map(min, zip(*moments)))
+
+    def get_interval(self, dt: datetime) -> timedelta:
+        if not self.stateful:
+            return min(map(lambda period: period.get_interval(dt), self.periods))
+        return timedelta(microseconds=to_timestamp(self.get_next(dt)) - to_timestamp(dt))
+
+    @property
+    def is_timezone_in_use(self) -> bool:
+        return any(map(lambda period: period.is_timezone_in_use, self.periods))
+
+    @property
+    def OR(self) -> "PeriodAggregation":
+        """Create a new :class:`PeriodAggregation` from these periods of
+        aggregation and a new empty period.
+
+        It's designed to write better human-readable code,
+        e.g. :code:`.on.weekdays.at("18:00").OR.on.weekends.at("21:00")`.
+        It's uppercase because :code:`or` is a reserved word in python.
+        """
+        return PeriodAggregation(*self.periods, Period(), stateful=self.stateful)
+
+    def __or__(self, other: Union[Period, FrozenPeriod, "PeriodAggregation"]) -> "PeriodAggregation":
+        """Create a new :class:`PeriodAggregation` from these periods of
+        aggregation and the passed period."""
+        if isinstance(other, PeriodAggregation):
+            return PeriodAggregation(*self.periods, *other.periods, stateful=self.stateful)
+        return PeriodAggregation(*self.periods, other, stateful=self.stateful)
+
+    def __eq__(self, other: object) -> bool:
+        """Aggregations are equal if they consist of equal periods regardless of their order and repeats."""
+        if not isinstance(other, PeriodAggregation):
+            return NotImplemented
+        return frozenset(self.periods) == frozenset(other.periods)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.periods))
+
+    def __dir__(self) -> Iterable[str]:
+        """Extended implementation of the standard.
+        It adds attributes of :class:`Period` class.
+        """
+        return sorted(set(dir(PeriodAggregation)) | set(dir(Period)))
+
+    def __getattr__(self, attr):
+        """Return an attribute of the last period in the list of periods with
+        a wrap to return this object instead of the last period.
+        """
+        self._reset_state()
+        _attr = getattr(self.periods[-1], attr)
+
+        if isinstance(getattr(Period, attr), property):
+            return self
+
+        def wrapper(*args, **kwargs):
+            _attr(*args, **kwargs)
+            self._reset_state()
+            return self
+
+        return wrapper
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {' OR '.join(map(repr, self.periods))}>"
+
+
+class FrozenPeriodAggregation(PeriodAggregation):
+    """Immutable form of :class:`PeriodAggregation` whose periods are frozen, see :class:`FrozenPeriod`.
+
+    It has no state, so it's safe to share between threads without locks. New aggregations made
+    by :code:`|` and :attr:`OR` are mutable.
+
+    Args:
+        *periods (Tuple[Union[Period, FrozenPeriod]]): Periods to aggregate, they are frozen.
+    """
+
+    _frozen = False
+
+    def __init__(self, *periods: Union[Period, FrozenPeriod]):
+        super().__init__(*(period.freeze() for period in periods))
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen:
+            raise AttributeError(f"{self.__class__.__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __getattr__(self, attr):
+        """Frozen periods have no builder methods, so attributes aren't looked up in the last period."""
+        raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {attr!r}")
+
+    def __dir__(self) -> Iterable[str]:
+        return sorted(set(dir(self.__class__)) | set(self.__dict__))
+
+    def freeze(self) -> "FrozenPeriodAggregation":
+        """Return this aggregation, it's already frozen."""
+        return self
@@ -0,0 +1,145 @@
+from typing import AsyncIterator, List, Tuple, Union
+
+import asyncio
+from datetime import datetime
+from heapq import heappop, heappush
+from itertools import count
+from time import time_ns
+from weakref import WeakKeyDictionary
+
+from .abstract import AbstractPeriod
+from .timestamps import from_timestamp, NANOSECONDS, SECOND, to_timestamp, utc
+
+# The longest sleep between checks of the wall clock in seconds, so adjustments of the clock are picked up
+MAX_DELAY = 60
+
+_timers: "WeakKeyDictionary[asyncio.AbstractEventLoop, SharedTimer]" = WeakKeyDictionary()
+
+
+class SharedTimer:
+    """A single timer handle of an event loop shared by all coroutines waiting for moments.
+
+    Waiters are kept in a heap by their deadlines in wall clock epoch nanoseconds, and only the earliest
+    deadline is scheduled with :meth:`asyncio.AbstractEventLoop.call_at`. The wall clock and
+    :meth:`asyncio.AbstractEventLoop.time` drift apart, so a deadline is converted into the loop time
+    when it's scheduled, and the wall clock is checked again when the timer fires. Waiters are never woken up
+    before their deadlines, and the timer is rescheduled for the remaining time instead.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Event loop of the timer.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._counter = count()
+        self._handle: Union[asyncio.TimerHandle, None] = None
+        self._deadline: Union[int, None] = None
+
+    def wait(self, deadline: int) -> "asyncio.Future[None]":
+        """Get a future done at the passed moment.
+
+        Args:
+            deadline (int): Moment in nanoseconds since the epoch by the wall clock.
+
+        Return:
+            asyncio.Future: Future resolved with ``None``. Cancelling it doesn't affect other waiters.
+        """
+        future = self._loop.create_future()
+        heappush(self._waiters, (deadline, next(self._counter), future))
+        if self._deadline is None or deadline < self._deadline:
+            self._schedule()
+        return future
+
+    def _schedule(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._deadline = None
+        waiters = self._waiters
+        while waiters and waiters[0][2].done():  # cancelled waiters are dropped lazily
+            heappop(waiters)
+        if not waiters:
+            return
+        deadline = waiters[0][0]
+        delay = min(max(deadline - time_ns(), 0) / (SECOND * NANOSECONDS), MAX_DELAY)
+        self._handle = self._loop.call_at(self._loop.time() + delay, self._fire)
+        self._deadline = deadline
+
+    def _fire(self) -> None:
+        self._handle = None
+        self._deadline = None
+        now = time_ns()
+        waiters = self._waiters
+        while waiters and waiters[0][0] <= now:
+            _, _, future = heappop(waiters)
+            if not future.done():
+                future.set_result(None)
+        self._schedule()
+
+    def __len__(self) -> int:
+        return sum(not future.done() for _, _, future in self._waiters)
+
+
+def get_timer(loop: Union[asyncio.AbstractEventLoop, None] = None) -> SharedTimer:
+    """Get the shared timer of the event loop.
+
+    Args:
+        loop (Union[asyncio.AbstractEventLoop, None]): Event loop, the running one by default.
+    """
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    timer = _timers.get(loop)
+    if timer is None:
+        timer = _timers[loop] = SharedTimer(loop)
+    return timer
+
+
+async def sleep_until(epoch_ns: int) -> None:
+    """Sleep until the passed moment by the wall clock.
+
+    Args:
+        epoch_ns (int): Moment in nanoseconds since the epoch.
+    """
+    if epoch_ns > time_ns():
+        await get_timer().wait(epoch_ns)
+
+
+def _to_datetime(period: AbstractPeriod, epoch_ns: int) -> datetime:
+    return from_timestamp(epoch_ns // NANOSECONDS, utc if period.is_timezone_in_use else None)
+
+
+async def sleep_until_next(period: AbstractPeriod) -> datetime:
+    """Sleep until the next moment of the period since now.
+
+    Args:
+        period (AbstractPeriod): Period.
+
+    Return:
+        datetime: The moment in UTC. It's naive if the period doesn't use a time zone.
+    """
+    moment = period.get_next_ns(time_ns())
+    await sleep_until(moment)
+    return _to_datetime(period, moment)
+
+
+async def iter_moments(period: AbstractPeriod, start: Union[datetime, None] = None) -> AsyncIterator[datetime]:
+    """Iterate over moments of the period asynchronously, sleeping until each of them.
+
+    The next moment is calculated from the previous moment rather than from the time of waking up,
+    so latency of the event loop doesn't accumulate. Moments which have passed while the consumer
+    was busy are skipped.
+
+    Args:
+        period (AbstractPeriod): Period.
+        start (Union[datetime, None]): Moment to start after, now by default. Naive datetime objects are UTC.
+
+    Return:
+        AsyncIterator[datetime]: Infinite iterator of moments in UTC. They're naive if the period
+        doesn't use a time zone.
+    """
+    moment = to_timestamp(start) * NANOSECONDS if start is not None else time_ns()
+    while True:
+        moment = period.get_next_ns(max(moment, time_ns()))
+        await sleep_until(moment)
+        yield _to_datetime(period, moment)
@@ -0,0 +1,79 @@
+from typing import Any, Sequence, Union
+
+from array import array
+from datetime import datetime
+
+numpy: Any
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is an optional extra, the pure python fallback is used without it
+    numpy = None
+
+# list of int or NumPy array of int64
+Microseconds = Any
+
+
+def is_datetimes(timestamps: Any) -> bool:
+    """If passed timestamps are a sequence of datetime objects, return True, else False."""
+    if isinstance(timestamps, array) or (numpy is not None and isinstance(timestamps, numpy.ndarray)):
+        return False
+    return len(timestamps) > 0 and isinstance(timestamps[0], datetime)
+
+
+def is_vectorized(values: Microseconds) -> bool:
+    """If values are evaluated with whole-array arithmetic, return True, else False."""
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+class Batch:
+    """Batch of timestamps represented as integer epoch microseconds.
+
+    It keeps the passed container to return results in the same kind of container.
+    If NumPy is installed, values are :class:`numpy.ndarray` of int64, else :obj:`list` of :obj:`int`.
+
+    Args:
+        timestamps (Union[Sequence[int], array.array, numpy.ndarray]):
+            Epoch microseconds as a sequence, :class:`array.array` or NumPy integer array,
+            or NumPy ``datetime64`` array.
+
+    Attributes:
+        values (Union[List[int], numpy.ndarray]): Epoch microseconds of the timestamps.
+    """
+
+    values: Microseconds
+
+    def __init__(self, timestamps: Union[Sequence[int], array, "numpy.ndarray"]):
+        self._timestamps = timestamps
+        if numpy is not None and isinstance(timestamps, numpy.ndarray):
+            if timestamps.dtype.kind == "M":
+                self.values = timestamps.astype("datetime64[us]").astype(numpy.int64)
+            else:
+                self.values = timestamps.astype(numpy.int64)
+        elif numpy is not None and isinstance(timestamps, array):
+            self.values = numpy.asarray(timestamps, dtype=numpy.int64)
+        else:
+            self.values = list(timestamps)
+
+    def moments(self, values: Microseconds) -> Any:
+        """Convert epoch microseconds into the kind of the passed container."""
+        timestamps = self._timestamps
+        if numpy is not None and isinstance(timestamps, numpy.ndarray):
+            if timestamps.dtype.kind == "M":
+                return values.astype("datetime64[us]").astype(timestamps.dtype)
+            return values
+        if isinstance(timestamps, array):
+            return array(timestamps.typecode, values.tolist() if is_vectorized(values) else values)
+        return values.tolist() if is_vectorized(values) else values
+
+    def intervals(self, values: Microseconds) -> Any:
+        """Convert differences between epoch microseconds and the timestamps into the kind of the passed container.
+        Intervals of ``datetime64`` arrays are ``timedelta64`` arrays of the same unit.
+        """
+        timestamps = self._timestamps
+        if is_vectorized(values):
+            intervals = values - self.values
+            if isinstance(timestamps, numpy.ndarray) and timestamps.dtype.kind == "M":
+                unit, _ = numpy.datetime_data(timestamps.dtype)
+                return intervals.astype("timedelta64[us]").astype(f"timedelta64[{unit}]")
+            return self.moments(intervals)
+        return self.moments([moment - value for moment, value in zip(values, self.values)])
@@ -0,0 +1,193 @@
+from typing import Any, Dict, FrozenSet, NamedTuple, Tuple, Union
+
+from array import array
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from functools import lru_cache
+from math import gcd
+
+from .timestamps import EPOCH_WEEKDAY
+
+# The Gregorian calendar repeats every 400 years, and the amount of days in them is a multiple of a week,
+# so months of a single cycle since January 1970 cover all dates and weekdays.
+CYCLE_MONTHS = 400 * 12
+CYCLE_DAYS = 146097
+
+_ALL_MONTHS = (1 << 13) - 2
+
+
+class CalendarWindow(NamedTuple):
+    """Months and days of month when moments of a period are allowed.
+
+    A month is allowed if it matches the regular offsets in months and years and months of year.
+    If a regular offset in months or years is set, only the first day of month is allowed by default,
+    and only January if it's in years.
+    Days of month are counted among days matching weekdays of the period, so the last business day
+    of month is the day -1 of a period on weekdays.
+    """
+
+    months: int = 0  # regular offset in months since January 1970, 0 if it isn't in use
+    years: int = 0  # regular offset in years since 1970, 0 if it isn't in use
+    months_of_year: int = 0  # mask where bit i is set for the month i, 0 means all months
+    days: Tuple[int, ...] = ()  # sorted days of month counted since 1, or since -1 from the end; all days if empty
+
+
+@lru_cache(maxsize=None)
+def _get_table() -> Tuple["array[int]", "array[int]"]:
+    """Get days since 01.01.1970 of the first days of months of the cycle and lengths of the months."""
+    first_days, lengths = array("q"), array("q")
+    day = 0
+    for i in range(CYCLE_MONTHS):
+        length = monthrange(1970 + i // 12, i % 12 + 1)[1]
+        first_days.append(day)
+        lengths.append(length)
+        day += length
+    return first_days, lengths
+
+
+def get_month(day: int) -> int:
+    """Get the index of the month since January 1970 by the day since 01.01.1970."""
+    cycle, day = divmod(day, CYCLE_DAYS)
+    return cycle * CYCLE_MONTHS + bisect_right(_get_table()[0], day) - 1
+
+
+def get_month_days(month: int) -> Tuple[int, int]:
+    """Get the first day since 01.01.1970 and the length of the month by its index since January 1970."""
+    cycle, month = divmod(month, CYCLE_MONTHS)
+    first_days, lengths = _get_table()
+    return cycle * CYCLE_DAYS + first_days[month], lengths[month]
+
+
+@lru_cache(maxsize=None)
+def _resolve(window: CalendarWindow) -> CalendarWindow:
+    """Fill in the defaults: every month, the first day of month and January of regular offsets in years."""
+    is_regular = bool(window.months or window.years)
+    return CalendarWindow(
+        months=window.months or 1,
+        years=window.years or 1,
+        months_of_year=window.months_of_year or (1 << 1 if window.years else _ALL_MONTHS),
+        days=window.days or ((1,) if is_regular else ()),
+    )
+
+
+def get_cycle(window: CalendarWindow) -> int:
+    """Get days after which allowed days repeat."""
+    window = _resolve(window)
+    months = window.months // gcd(window.months, 12 * window.years) * 12 * window.years
+    return months // gcd(months, CYCLE_MONTHS) * CYCLE_DAYS
+
+
+@lru_cache(maxsize=None)
+def _get_allowed_days(
+        days: Tuple[int, ...],
+        weekdays: FrozenSet[int],
+        length: int,
+        first_weekday: int,
+) -> Tuple[int, ...]:
+    """Get sorted offsets of allowed days since the first day of month. Months of the same length starting
+    on the same weekday have the same allowed days, so there are only a few of these tables.
+    """
+    matching = [i for i in range(length) if not weekdays or (first_weekday + i) % 7 in weekdays]
+    if not days:
+        return tuple(matching)
+    # days out of the month are skipped, e.g. the 31st day in short months
+    return tuple(sorted({
+        matching[day - 1 if day > 0 else day] for day in days if -len(matching) <= day <= len(matching)
+    }))
+
+
+def get_next_day(window: CalendarWindow, weekdays: FrozenSet[int], day: int) -> Union[int, None]:
+    """Get the first allowed day since 01.01.1970 since the passed day inclusive by tables of months.
+
+    Args:
+        window (CalendarWindow): Months and days of month.
+        weekdays (FrozenSet[int]): Values of weekdays which days of month are counted among, empty means all.
+        day (int): Day since 01.01.1970.
+
+    Return:
+        Union[int, None]: The day, or None if no day is ever allowed.
+    """
+    window = _resolve(window)
+    month = get_month(day)
+    # allowed months repeat every cycle, so there's no allowed day if nothing is found within it
+    limit = month + get_cycle(window) // CYCLE_DAYS * CYCLE_MONTHS
+    while month <= limit:
+        if (month // 12) % window.years:
+            month += (-month) % (12 * window.years)
+        elif month % window.months:
+            month += (-month) % window.months
+        elif not window.months_of_year >> (month % 12 + 1) & 1:
+            month += 1
+        else:
+            first_day, length = get_month_days(month)
+            allowed_days = _get_allowed_days(window.days, weekdays, length, (first_day + EPOCH_WEEKDAY) % 7)
+            i = bisect_left(allowed_days, day - first_day)
+            if i < len(allowed_days):
+                return first_day + allowed_days[i]
+            month += 1
+    return None
+
+
+def get_prev_day(window: CalendarWindow, weekdays: FrozenSet[int], day: int) -> Union[int, None]:
+    """Get the last allowed day since 01.01.1970 before the passed day inclusive, see :func:`get_next_day`."""
+    window = _resolve(window)
+    month = get_month(day)
+    limit = month - get_cycle(window) // CYCLE_DAYS * CYCLE_MONTHS
+    while month >= limit:
+        if (month // 12) % window.years:
+            month = (month // 12 - (month // 12) % window.years) * 12 + 11
+        elif month % window.months:
+            month -= month % window.months
+        elif not window.months_of_year >> (month % 12 + 1) & 1:
+            month -= 1
+        else:
+            first_day, length = get_month_days(month)
+            allowed_days = _get_allowed_days(window.days, weekdays, length, (first_day + EPOCH_WEEKDAY) % 7)
+            i = bisect_right(allowed_days, day - first_day)
+            if i:
+                return first_day + allowed_days[i - 1]
+            month -= 1
+    return None
+
+
+def make_window(
+        window: Union[CalendarWindow, None],
+        **values: Any,
+) -> Union[CalendarWindow, None]:
+    """Create a copy of the window with the passed values, or None if nothing is restricted.
+
+    Args:
+        window (Union[CalendarWindow, None]): The window to change.
+        **values: Fields of :class:`CalendarWindow`.
+    """
+    window = (window or CalendarWindow())._replace(**values)
+    return window if window != CalendarWindow() else None
+
+
+def add_days(window: Union[CalendarWindow, None], days: Tuple[int, ...]) -> Union[CalendarWindow, None]:
+    """Create a copy of the window with more days of month, from 1 to 31 or from -31 to -1."""
+    if not days or not all(1 <= abs(day) <= 31 for day in days):
+        raise ValueError(f"Wrong days of month: {days!r}")
+    window = window or CalendarWindow()
+    return make_window(window, days=tuple(sorted({*window.days, *days})))
+
+
+def add_months(window: Union[CalendarWindow, None], months: Tuple[int, ...]) -> Union[CalendarWindow, None]:
+    """Create a copy of the window with more months of year, from 1 to 12."""
+    if not months or not all(1 <= month <= 12 for month in months):
+        raise ValueError(f"Wrong months of year: {months!r}")
+    window = window or CalendarWindow()
+    mask = window.months_of_year
+    for month in months:
+        mask |= 1 << month
+    return make_window(window, months_of_year=mask)
+
+
+def describe(window: Union[CalendarWindow, None]) -> Dict[str, str]:
+    """Get values of the window to show in representations of periods."""
+    if window is None:
+        return {}
+    data = {"months": str(window.months), "years": str(window.years)}
+    data["months_of_year"] = ",".join(str(i) for i in range(1, 13) if window.months_of_year >> i & 1)
+    data["days_of_month"] = ",".join(map(str, window.days))
+    return {key: value for key, value in data.items() if value not in ("", "0")}
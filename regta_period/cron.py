@@ -0,0 +1,268 @@
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from calendar import isleap
+from datetime import date, datetime, time, timedelta, timezone as datetime_timezone, tzinfo
+from functools import lru_cache
+
+from .abstract import AbstractPeriod
+from .aggregation import FrozenPeriodAggregation
+from .enums import Weekdays
+from .periods import FrozenPeriod, Period
+from .timestamps import DAY, MICROSECOND, MINUTE, to_timestamp
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_WEEKDAYS = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+
+# minimum, maximum and names of values starting from the minimum
+_FIELDS: Tuple[Tuple[int, int, Tuple[str, ...]], ...] = (
+    (0, 59, ()),  # minute
+    (0, 23, ()),  # hour
+    (1, 31, ()),  # day of month
+    (1, 12, _MONTHS),  # month
+    (0, 7, _WEEKDAYS),  # day of week, both 0 and 7 are Sunday
+)
+
+_MINUTES_IN_DAY = DAY // MINUTE
+_ALL_MONTHS = (1 << 13) - 2
+_ALL_DAYS = (1 << 32) - 2
+_ALL_WEEKDAYS = (1 << 7) - 1
+_DAYS_IN_MONTHS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+class CalendarPeriod(AbstractPeriod):
+    """Period whose moments fall only on days matching days of month, months and weekdays of a cron expression.
+
+    These fields can't be expressed by regular and time offsets, so days are checked against bitsets.
+    A bitset of matching days of a year is precomputed once per year, and the next matching day is found
+    by its lowest set bit.
+
+    Args:
+        period (AbstractPeriod): Period of time of the moments within matching days.
+        months (int): Mask of months where bit :math:`i` is set for the month :math:`i`.
+        days (int): Mask of days of month where bit :math:`i` is set for the day :math:`i`.
+        weekdays (int): Mask of weekdays made by :meth:`Weekdays.to_mask`.
+        either (bool): A day matches if it matches days of month or weekdays, not both of them.
+        timezone (Union[tzinfo, None]): Time zone of days. It must be the time zone of the period.
+
+    Attributes:
+        period (AbstractPeriod): Period of time of the moments within matching days.
+        months (int): Mask of months.
+        days (int): Mask of days of month.
+        weekdays (int): Mask of weekdays.
+        either (bool): If days of month and weekdays are alternatives.
+        timezone (Union[tzinfo, None]): Time zone of days.
+    """
+
+    def __init__(
+            self,
+            period: AbstractPeriod,
+            months: int,
+            days: int,
+            weekdays: int,
+            either: bool = False,
+            timezone: Union[tzinfo, None] = None,
+    ):
+        if not any(
+            months >> month & 1 and days >> day & 1
+            for month, days_in_month in enumerate(_DAYS_IN_MONTHS, 1)
+            for day in range(1, days_in_month + 1)
+        ) and not (either and weekdays and months):
+            raise ValueError("The period never falls on the specified days of month")
+        self.period = period
+        self.months = months
+        self.days = days
+        self.weekdays = weekdays
+        self.either = either
+        self.timezone = timezone
+        self._years: Dict[int, int] = {}
+
+    def _matches(self, day: date) -> bool:
+        if not self.months >> day.month & 1:
+            return False
+        matches_day = self.days >> day.day & 1
+        matches_weekday = self.weekdays >> day.weekday() & 1
+        return bool(matches_day or matches_weekday) if self.either else bool(matches_day and matches_weekday)
+
+    def _get_year(self, year: int) -> int:
+        """Get the bitset of the year where bit :math:`i` is set if the day :math:`i` since 1 January matches."""
+        bits = self._years.get(year)
+        if bits is None:
+            bits = 0
+            first_day = date(year, 1, 1)
+            for i in range(366 if isleap(year) else 365):
+                if self._matches(first_day + timedelta(days=i)):
+                    bits |= 1 << i
+            self._years[year] = bits
+        return bits
+
+    def _get_next_day(self, day: date) -> date:
+        """Get the first matching day since the passed day inclusive."""
+        index = day.timetuple().tm_yday - 1
+        # the Gregorian calendar repeats every 400 years
+        for year in range(day.year, day.year + 401):
+            bits = self._get_year(year) >> index
+            if bits:
+                return date(year, 1, 1) + timedelta(days=index + (bits & -bits).bit_length() - 1)
+            index = 0
+        raise ValueError("The period never falls on the specified days")
+
+    def get_next(self, dt: datetime) -> datetime:
+        moment = self.period.get_next(dt)
+        while True:
+            local = moment.astimezone(self.timezone) if self.timezone is not None else moment
+            day = self._get_next_day(local.date())
+            if day == local.date():
+                return moment.astimezone(dt.tzinfo) if dt.tzinfo is not None else moment
+            # the moment before the midnight of the matching day, so moments at the midnight are included
+            moment = self.period.get_next(datetime.combine(day, time(), self.timezone) - MICROSECOND)
+
+    def get_interval(self, dt: datetime) -> timedelta:
+        return timedelta(microseconds=to_timestamp(self.get_next(dt)) - to_timestamp(dt))
+
+    @property
+    def is_timezone_in_use(self) -> bool:
+        return self.period.is_timezone_in_use
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__}: {self.period!r}, months={self.months:#x}, days={self.days:#x}, "
+            f"weekdays={self.weekdays:#x}, either={self.either}>"
+        )
+
+
+def _parse_value(value: str, minimum: int, names: Tuple[str, ...]) -> int:
+    if value in names:
+        return names.index(value) + minimum
+    if not value.isdigit():
+        raise ValueError(f"Wrong value: {value!r}")
+    return int(value)
+
+
+def _parse_field(field: str, minimum: int, maximum: int, names: Tuple[str, ...]) -> Set[int]:
+    values: Set[int] = set()
+    for part in field.split(","):
+        part, _, step_part = part.partition("/")
+        step = int(step_part) if step_part.isdigit() else 0 if step_part else 1
+        if part in ("*", "?"):
+            start, end = minimum, maximum
+        elif "-" in part:
+            start_part, end_part = part.split("-", 1)
+            start, end = _parse_value(start_part, minimum, names), _parse_value(end_part, minimum, names)
+        else:
+            start = _parse_value(part, minimum, names)
+            end = maximum if step_part else start
+        if not minimum <= start <= end <= maximum or step < 1:
+            raise ValueError(f"Wrong field: {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _to_mask(values: Iterable[int]) -> int:
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+def _get_steps(timezone: Union[tzinfo, None]) -> List[int]:
+    """Get regular offsets in minutes to cover minutes of day by, in ascending order."""
+    steps = [step for step in range(1, _MINUTES_IN_DAY + 1) if _MINUTES_IN_DAY % step == 0]
+    if timezone is not None and not isinstance(timezone, datetime_timezone):
+        # Periods with regular offsets less than a day are elapsed time. UTC offsets change by whole hours
+        # (with rare exceptions), so only steps dividing an hour stay in line with the local wall clock time.
+        steps = [step for step in steps if 60 % step == 0 or step == _MINUTES_IN_DAY]
+    return steps
+
+
+def _cover_minutes(minutes: Set[int], timezone: Union[tzinfo, None]) -> Tuple[Tuple[int, int], ...]:
+    """Cover minutes of day by as few residue classes as possible. Every residue class is a pair of
+    a regular offset in minutes dividing a day and a remainder, larger classes are tried first.
+    """
+    covered: Set[int] = set()
+    residue_classes: List[Tuple[int, int]] = []
+    for step in _get_steps(timezone):
+        for remainder in range(step):
+            residue_class = range(remainder, _MINUTES_IN_DAY, step)
+            if minutes.issuperset(residue_class) and not covered.issuperset(residue_class):
+                covered.update(residue_class)
+                residue_classes.append((step, remainder))
+        if covered == minutes:
+            break
+    return tuple(residue_classes)
+
+
+def _compile_time(
+        residue_classes: Tuple[Tuple[int, int], ...],
+        timezone: Union[tzinfo, None],
+        weekdays: int,
+) -> AbstractPeriod:
+    """Make a frozen period of every residue class of minutes of day, see :func:`_cover_minutes`."""
+    periods = [
+        FrozenPeriod(regular_offset=step * MINUTE, time_offset=remainder * 60, timezone=timezone, weekdays=weekdays)
+        for step, remainder in residue_classes
+    ]
+    return periods[0] if len(periods) == 1 else FrozenPeriodAggregation(*periods)
+
+
+def _get_timezone(timezone: Union[tzinfo, str, int, float, None]) -> Union[tzinfo, None]:
+    # pylint: disable=protected-access
+    period = Period(timezone=timezone)  # converted the same way as time zones of periods
+    if period._timezone_offset is not None:
+        return datetime_timezone(timedelta(seconds=period._timezone_offset))
+    return period._timezone
+
+
+@lru_cache(maxsize=None)
+def _parse(fields: Tuple[str, ...], timezone: Union[tzinfo, str, int, float, None]) -> AbstractPeriod:
+    minute, hour, day, month, weekday = (
+        _parse_field(field, *spec) for field, spec in zip(fields, _FIELDS)
+    )
+    minutes = {h * 60 + m for h in hour for m in minute}
+    months, days = _to_mask(month), _to_mask(day)
+    weekdays = Weekdays.to_mask(Weekdays((value - 1) % 7) for value in weekday)
+
+    # Like in cron, if both day fields are restricted, a day matches either of them
+    either = not fields[2].startswith(("*", "?")) and not fields[4].startswith(("*", "?"))
+    if either and (days == _ALL_DAYS or weekdays == _ALL_WEEKDAYS):
+        days, weekdays, either = _ALL_DAYS, _ALL_WEEKDAYS, False
+
+    tz = _get_timezone(timezone)
+    residue_classes = _cover_minutes(minutes, tz)
+    if not either and days == _ALL_DAYS and months == _ALL_MONTHS:
+        return _compile_time(residue_classes, tz, weekdays if weekdays != _ALL_WEEKDAYS else 0)
+    return CalendarPeriod(_compile_time(residue_classes, tz, 0), months, days, weekdays, either, tz)
+
+
+def parse(expression: str, timezone: Union[tzinfo, str, int, float, None] = None) -> AbstractPeriod:
+    """Compile a cron expression into the cheapest equivalent period.
+
+    Minutes and hours are covered by as few :class:`FrozenPeriod` objects as possible, and days of week
+    become their time windows. If days of month or months are restricted, the result is
+    :class:`CalendarPeriod`. Results are memoized and immutable, so equal expressions share one object
+    with its compiled form and bitsets of days.
+
+    Args:
+        expression (str): Cron expression of five fields: minute, hour, day of month, month and day of week.
+            Lists, ranges, steps, names of months and weekdays, and macros such as ``@daily`` are supported.
+        timezone (Union[tzinfo, str, int, float, None]):
+            Time zone of the expression, see :class:`Period`. Periods with a :class:`zoneinfo.ZoneInfo`
+            time zone use only regular offsets dividing an hour or equal to a day.
+
+    Return:
+        AbstractPeriod: :class:`FrozenPeriod`, :class:`regta_period.aggregation.FrozenPeriodAggregation`
+        or :class:`CalendarPeriod`.
+    """
+    fields = MACROS.get(expression.strip().lower(), expression).lower().split()
+    if len(fields) != len(_FIELDS):
+        raise ValueError(f"Wrong cron expression: {expression!r}")
+    return _parse(tuple(fields), timezone)
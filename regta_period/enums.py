@@ -1,3 +1,5 @@
+from typing import Iterable, Set
+
 from datetime import datetime
 from enum import Enum, unique
 
@@ -18,3 +20,16 @@ class Weekdays(Enum):
     def get(cls, dt: datetime) -> "Weekdays":
         """Create a :class:`Weekdays` object by a datetime object."""
         return cls(dt.weekday())
+
+    @classmethod
+    def to_mask(cls, weekdays: Iterable["Weekdays"]) -> int:
+        """Pack weekdays into a 7-bit mask where bit :math:`i` is set for the weekday with value :math:`i`."""
+        mask = 0
+        for weekday in weekdays:
+            mask |= 1 << weekday.value
+        return mask
+
+    @classmethod
+    def from_mask(cls, mask: int) -> Set["Weekdays"]:
+        """Unpack weekdays from a 7-bit mask made by :meth:`to_mask`."""
+        return {weekday for weekday in cls if mask >> weekday.value & 1}
@@ -0,0 +1,231 @@
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from os import PathLike
+
+from .abstract import AbstractPeriod
+from .timestamps import from_timestamp, NANOSECONDS, to_timestamp
+
+
+class ExclusionCalendar:
+    """Blackout windows and holidays during which moments of periods are skipped.
+
+    Windows are half-open ranges :math:`[start, end)`, and a holiday is the whole day in the time zone
+    of the calendar. They're merged and kept in sorted arrays of epoch microseconds, so a moment is checked
+    with a binary search in O(log n).
+
+    Args:
+        windows (Iterable[Tuple[datetime, datetime]]): Blackout windows, see :meth:`add_window`.
+        dates (Iterable[date]): Holidays, see :meth:`add_date`.
+        timezone (Union[tzinfo, None]): Time zone of holidays and naive datetime objects, UTC by default.
+
+    Attributes:
+        timezone (Union[tzinfo, None]): Time zone of holidays and naive datetime objects.
+    """
+
+    def __init__(
+            self,
+            windows: Iterable[Tuple[datetime, datetime]] = (),
+            dates: Iterable[date] = (),
+            timezone: Union[tzinfo, None] = None,
+    ):
+        self.timezone = timezone
+        self._windows: List[Tuple[int, int]] = []
+        self._starts = array("q")
+        self._ends = array("q")
+        self._indexed = True
+        for start, end in windows:
+            self.add_window(start, end)
+        for day in dates:
+            self.add_date(day)
+
+    @classmethod
+    def load(cls, path: Union[str, "PathLike[str]"], timezone: Union[tzinfo, None] = None) -> "ExclusionCalendar":
+        """Load a calendar from a text file.
+
+        Every line is either a holiday in ISO format, e.g. ``2022-12-25``, or a blackout window as two
+        ISO datetime objects separated by whitespace, e.g. ``2022-12-30T18:00 2023-01-09T09:00``.
+        Empty lines and comments after ``#`` are skipped.
+
+        Args:
+            path (Union[str, PathLike]): Path of the file.
+            timezone (Union[tzinfo, None]): Time zone of holidays and naive datetime objects, UTC by default.
+        """
+        calendar = cls(timezone=timezone)
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                values = line.split("#", 1)[0].split()
+                if len(values) == 1:
+                    calendar.add_date(date.fromisoformat(values[0]))
+                elif len(values) == 2:
+                    calendar.add_window(datetime.fromisoformat(values[0]), datetime.fromisoformat(values[1]))
+                elif values:
+                    raise ValueError(f"Wrong line {number} of {str(path)!r}: {line.strip()!r}")
+        return calendar
+
+    def _to_timestamp(self, dt: datetime) -> int:
+        if dt.tzinfo is None and self.timezone is not None:
+            dt = dt.replace(tzinfo=self.timezone)
+        return to_timestamp(dt)
+
+    def add_window(self, start: datetime, end: datetime) -> "ExclusionCalendar":
+        """Add a blackout window :math:`[start, end)`. Naive datetime objects are in the time zone of the calendar.
+
+        Args:
+            start (datetime): The beginning of the window, inclusive.
+            end (datetime): The end of the window, exclusive.
+        """
+        window = self._to_timestamp(start), self._to_timestamp(end)
+        if window[0] >= window[1]:
+            raise ValueError(f"Blackout window {start} - {end} is empty")
+        self._windows.append(window)
+        self._indexed = False
+        return self
+
+    def add_date(self, day: date) -> "ExclusionCalendar":
+        """Add a holiday, the whole day in the time zone of the calendar.
+
+        Args:
+            day (date): The day.
+        """
+        return self.add_window(
+            datetime.combine(day, time(), tzinfo=self.timezone),
+            datetime.combine(day + timedelta(days=1), time(), tzinfo=self.timezone),
+        )
+
+    def _index(self) -> None:
+        """Sort windows and merge the overlapping and adjacent ones."""
+        if self._indexed:
+            return
+        starts, ends = array("q"), array("q")
+        for start, end in sorted(self._windows):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts, self._ends = starts, ends
+        self._indexed = True
+
+    def get_end(self, timestamp: int) -> Union[int, None]:
+        """Get the end of the blackout window including the moment, or None if the moment isn't excluded.
+
+        Args:
+            timestamp (int): Moment in epoch microseconds.
+
+        Return:
+            Union[int, None]: The end of the window in epoch microseconds, exclusive.
+        """
+        self._index()
+        i = bisect_right(self._starts, timestamp) - 1
+        if i >= 0 and timestamp < self._ends[i]:
+            return self._ends[i]
+        return None
+
+    def get_windows(self, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Iterate over merged blackout windows overlapping the range :math:`[start, end)`.
+
+        Args:
+            start (int): The beginning of the range in epoch microseconds, inclusive.
+            end (int): The end of the range in epoch microseconds, exclusive.
+
+        Return:
+            Iterator[Tuple[int, int]]: Windows as epoch microseconds in ascending order.
+        """
+        self._index()
+        starts, ends = self._starts, self._ends
+        i = bisect_right(ends, start)
+        while i < len(starts) and starts[i] < end:
+            yield starts[i], ends[i]
+            i += 1
+
+    def __len__(self) -> int:
+        """Amount of merged blackout windows."""
+        self._index()
+        return len(self._starts)
+
+    def _key(self) -> Tuple[Any, ...]:
+        self._index()
+        return tuple(self._starts), tuple(self._ends)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExclusionCalendar):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self)} windows>"
+
+
+class ExcludedPeriod(AbstractPeriod):
+    """Moments of a period outside blackout windows of a calendar.
+
+    The next moment jumps past a blackout window at once, so a query costs O(log n) per window crossed.
+
+    Args:
+        period (AbstractPeriod): Period.
+        calendar (ExclusionCalendar): Blackout windows and holidays. Changes of it are applied to the period.
+
+    Attributes:
+        period (AbstractPeriod): Period.
+        calendar (ExclusionCalendar): Blackout windows and holidays.
+    """
+
+    def __init__(self, period: AbstractPeriod, calendar: ExclusionCalendar):
+        self.period = period
+        self.calendar = calendar
+
+    def get_next_ns(self, epoch_ns: int) -> int:
+        moment = self.period.get_next_ns(epoch_ns)
+        end = self.calendar.get_end(moment // NANOSECONDS)
+        while end is not None:
+            # the next moment since the last nanosecond of the window, so the end of the window is included
+            moment = self.period.get_next_ns(end * NANOSECONDS - 1)
+            end = self.calendar.get_end(moment // NANOSECONDS)
+        return moment
+
+    def get_next(self, dt: datetime) -> datetime:
+        moment = self.period.get_next(dt)
+        end = self.calendar.get_end(to_timestamp(moment))
+        if end is None:
+            return moment
+        return from_timestamp(self.get_next_ns(end * NANOSECONDS - 1) // NANOSECONDS, dt.tzinfo)
+
+    def get_interval(self, dt: datetime) -> timedelta:
+        return self.get_next(dt) - dt
+
+    @property
+    def is_timezone_in_use(self) -> bool:
+        return self.period.is_timezone_in_use
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Count moments in the range :math:`(start, end]` as moments of the period
+        minus its moments in blackout windows within the range.
+        """
+        count = self.period.count_between(start, end)
+        first, last = to_timestamp(start) + 1, to_timestamp(end) + 1
+        for window_start, window_end in self.calendar.get_windows(first, last):
+            count -= self.period.count_between(
+                from_timestamp(max(window_start, first) - 1, start.tzinfo),
+                from_timestamp(min(window_end, last) - 1, start.tzinfo),
+            )
+        return count
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.period, self.calendar
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExcludedPeriod):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.period!r}, {self.calendar!r}>"
@@ -0,0 +1,164 @@
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from datetime import datetime, timedelta
+from functools import partial
+
+from .abstract import AbstractPeriod, MAX_LOOKBACK
+from .moments import CompiledPeriod, get_next_moment, get_next_timestamp, get_prev_timestamp, intersect, is_progression
+from .ordinals import get_ordinal, is_countable
+from .periods import FrozenPeriod, Period
+from .timestamps import DAY, from_timestamp, MICROSECOND, NANOSECONDS, to_timestamp
+
+# Limits of the merge-walk, common moments which are further or take more steps are considered missing
+MAX_STEPS = 1 << 16
+_HORIZON = MAX_LOOKBACK // MICROSECOND * NANOSECONDS
+
+
+def _get_next_ns(compiled: CompiledPeriod, epoch_ns: int) -> int:
+    return get_next_timestamp(compiled, epoch_ns // NANOSECONDS) * NANOSECONDS
+
+
+def _get_prev_ns(compiled: CompiledPeriod, epoch_ns: int) -> int:
+    return get_prev_timestamp(compiled, -(-epoch_ns // NANOSECONDS)) * NANOSECONDS
+
+
+def _is_combinable(compiled: CompiledPeriod) -> bool:
+    """If moments of the period are a progression in its local time which can be intersected arithmetically,
+    see :func:`regta_period.moments.intersect`, return True, else False.
+    """
+    return is_progression(compiled) and (compiled.table is None or compiled.regular_offset % DAY == 0)
+
+
+def _combine(periods: Tuple[AbstractPeriod, ...]) -> Tuple[Union[CompiledPeriod, AbstractPeriod], ...]:
+    """Intersect progressions with the same time zone into single progressions and keep the other periods as is."""
+    # pylint: disable=protected-access
+    progressions: Dict[Tuple[Any, Any], CompiledPeriod] = {}
+    others: List[AbstractPeriod] = []
+    for period in periods:
+        if not isinstance(period, FrozenPeriod) or not _is_combinable(period._compile()):
+            others.append(period)
+            continue
+        key = period._timezone, period._timezone_offset
+        same = progressions.get(key)
+        compiled = period._compile() if same is None else intersect(same, period._compile())
+        # moments of the common progression may never fall on the common weekdays
+        if compiled is None or (compiled.weekdays and get_next_moment(compiled, -1) is None):
+            raise ValueError("The periods have no common moments")
+        progressions[key] = compiled
+    return (*progressions.values(), *others)
+
+
+def _walk(getters: Tuple[Callable[[int], int], ...], epoch_ns: int, direction: int) -> int:
+    """Find the first moment which all the periods agree on since passed moment, forward or backward.
+
+    Every period in turn jumps to its first moment at or since the candidate, and the candidate is moved to it
+    until all the periods return the same moment.
+
+    Args:
+        getters (Tuple[Callable[[int], int], ...]): Functions of the next or previous moments of the periods
+            in epoch nanoseconds.
+        epoch_ns (int): Current moment in nanoseconds since the epoch.
+        direction (int): 1 to find the next moment, -1 to find the previous one.
+    """
+    moment = getters[0](epoch_ns)
+    agreed, i = 1, 1 % len(getters)
+    for _ in range(MAX_STEPS):
+        if agreed == len(getters):
+            return moment
+        # moments are whole microseconds, so the moment itself is the first one since a nanosecond before it
+        candidate = getters[i](moment - direction)
+        if candidate == moment:
+            agreed += 1
+        else:
+            moment, agreed = candidate, 1
+            if (moment - epoch_ns) * direction > _HORIZON:
+                break
+        i = (i + 1) % len(getters)
+    raise ValueError(f"The periods have no common moments within {MAX_LOOKBACK.days} days and {MAX_STEPS} steps")
+
+
+class PeriodIntersection(AbstractPeriod):
+    """Moments which are moments of all the periods, made by :code:`&`.
+
+    Periods with the same time zone whose moments are single arithmetic progressions filtered by weekdays
+    are intersected in closed form by the Chinese remainder theorem: the common moments of offsets :math:`a`
+    and :math:`b` are a progression with the offset :math:`lcm(a, b)`, or there are none. Other constraints,
+    i.e. time windows, several exact times, days of month, different time zones and other periods,
+    are satisfied by a merge-walk over the remaining progressions, bounded by :data:`MAX_STEPS` jumps and
+    400 years. Periods are compiled when the intersection is made, so later changes of them aren't applied,
+    and :obj:`ValueError` is raised at once if the periods have no common moments.
+
+    Args:
+        *periods (AbstractPeriod): Periods to intersect. All or none of them must have a time zone.
+
+    Attributes:
+        periods (Tuple[AbstractPeriod, ...]): Intersected periods, :class:`Period` objects are frozen.
+    """
+
+    def __init__(self, *periods: AbstractPeriod):
+        if not periods:
+            raise ValueError("No period has been passed")
+        flattened: List[AbstractPeriod] = []
+        for period in periods:
+            if isinstance(period, PeriodIntersection):
+                flattened.extend(period.periods)
+            else:
+                flattened.append(period.freeze() if isinstance(period, Period) else period)
+        if len({period.is_timezone_in_use for period in flattened}) > 1:
+            raise TypeError("Can't intersect periods with and without a time zone")
+        self.periods: Tuple[AbstractPeriod, ...] = tuple(flattened)
+
+        parts = _combine(self.periods)
+        self._compiled = parts[0] if len(parts) == 1 and isinstance(parts[0], CompiledPeriod) else None
+        self._next_getters = tuple(
+            partial(_get_next_ns, part) if isinstance(part, CompiledPeriod) else part.get_next_ns for part in parts
+        )
+        self._prev_getters = tuple(
+            partial(_get_prev_ns, part) if isinstance(part, CompiledPeriod) else part.get_prev_ns for part in parts
+        )
+        if len(parts) > 1:
+            _walk(self._next_getters, 0, 1)  # raises ValueError if there are no common moments
+
+    def get_next_ns(self, epoch_ns: int) -> int:
+        return _walk(self._next_getters, epoch_ns, 1)
+
+    def get_prev_ns(self, epoch_ns: int) -> int:
+        return _walk(self._prev_getters, epoch_ns, -1)
+
+    def get_next(self, dt: datetime) -> datetime:
+        self._check_datetime(dt)
+        return from_timestamp(self.get_next_ns(to_timestamp(dt) * NANOSECONDS) // NANOSECONDS, dt.tzinfo)
+
+    def get_prev(self, dt: datetime) -> datetime:
+        self._check_datetime(dt)
+        return from_timestamp(self.get_prev_ns(to_timestamp(dt) * NANOSECONDS) // NANOSECONDS, dt.tzinfo)
+
+    def get_interval(self, dt: datetime) -> timedelta:
+        return timedelta(microseconds=to_timestamp(self.get_next(dt)) - to_timestamp(dt))
+
+    @property
+    def is_timezone_in_use(self) -> bool:
+        return self.periods[0].is_timezone_in_use
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Count moments in the range :math:`(start, end]`, in closed form if the periods are intersected
+        into a single progression, see :meth:`Period.index_of`, else one by one.
+        """
+        compiled = self._compiled
+        if compiled is None or not is_countable(compiled):
+            return super().count_between(start, end)
+        self._check_datetime(start)
+        self._check_datetime(end)
+        return max(get_ordinal(compiled, to_timestamp(end)) - get_ordinal(compiled, to_timestamp(start)), 0)
+
+    def __eq__(self, other: object) -> bool:
+        """Intersections are equal if they consist of equal periods regardless of their order and repeats."""
+        if not isinstance(other, PeriodIntersection):
+            return NotImplemented
+        return frozenset(self.periods) == frozenset(other.periods)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.periods))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {' AND '.join(map(repr, self.periods))}>"
@@ -0,0 +1,491 @@
+from typing import cast, FrozenSet, List, NamedTuple, Tuple, Union
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta, timezone as datetime_timezone, tzinfo
+from functools import lru_cache
+from math import gcd
+
+from .batch import is_vectorized, Microseconds, numpy
+from .calendars import CalendarWindow, get_cycle, get_next_day, get_prev_day
+from .enums import Weekdays
+from .timestamps import DAY, EPOCH_WEEKDAY, MICROSECOND, SECOND, WEEK
+from .timezones import get_transition_table, TransitionTable
+
+# The Gregorian calendar repeats every 400 years, so a period without moments within them has no moments at all
+GREGORIAN_CYCLE = 146097 * DAY
+
+
+class CompiledPeriod(NamedTuple):
+    """Values of a period prepared for calculations. All durations are in microseconds."""
+
+    initial_timestamp: int  # epoch microseconds of the first moment, if timezone offset is fixed
+    table: Union[TransitionTable, None]  # UTC offsets of the timezone, if it isn't fixed
+    regular_offset: int
+    time_offset: int
+    weekdays: FrozenSet[int]
+    weekday_skips: Tuple[int, ...]  # days to skip to the closest allowed weekday by weekday
+    cycle: int  # LCM of the regular offset and a week, weekdays of moments repeat with this period
+    slots: Tuple[int, ...] = (0,)  # sorted offsets of exact times since the time offset, within the regular offset
+    window: Union[Tuple[int, int], None] = None  # local time of day when moments are allowed, [start, end)
+    calendar: Union[CalendarWindow, None] = None  # months and days of month when moments are allowed
+
+
+@lru_cache(maxsize=None)
+def get_weekday_tables(mask: int) -> Tuple[FrozenSet[int], Tuple[int, ...]]:
+    """Get values of weekdays of the mask and days to skip to the closest allowed weekday by weekday.
+    There are only 128 masks, so the tables are shared by all periods.
+    """
+    weekdays = frozenset(weekday.value for weekday in Weekdays.from_mask(mask))
+    weekday_skips = tuple(
+        next(i for i in range(8) if not weekdays or (weekday + i) % 7 in weekdays)
+        for weekday in range(7)
+    )
+    return weekdays, weekday_skips
+
+
+def compile_period(
+        regular_offset: int,
+        time_offset: int,
+        timezone: Union[tzinfo, None],
+        timezone_offset: Union[int, None],
+        weekdays: int,
+        extra_times: Tuple[int, ...] = (),
+        window: Union[Tuple[int, int], None] = None,
+        calendar: Union[CalendarWindow, None] = None,
+) -> CompiledPeriod:
+    """Prepare values of a period for calculations.
+
+    Args:
+        regular_offset (int): Regular offset in microseconds, 0 means a day.
+        time_offset (int): Time offset in seconds.
+        timezone (Union[tzinfo, None]): Time zone for exact time.
+        timezone_offset (Union[int, None]): Offset for the time offset in seconds if time zone object isn't used.
+        weekdays (int): Mask of weekdays made by :meth:`Weekdays.to_mask`.
+        extra_times (Tuple[int, ...]): Sorted offsets of other exact times since the time offset in seconds.
+        window (Union[Tuple[int, int], None]): Local time of day when moments are allowed in seconds, ``[start, end)``.
+            It wraps past midnight if the start is greater than the end.
+        calendar (Union[CalendarWindow, None]): Months and days of month when moments are allowed.
+    """
+    # if regular offset is not specified, calculate as .daily
+    regular_offset = regular_offset or DAY
+    if extra_times and (regular_offset % DAY or extra_times[-1] * SECOND >= DAY):
+        raise ValueError(
+            "Several exact times must be within a day, and regular offset must be a multiple of a day. "
+            "Hint: try to use | instead"
+        )
+    if window is not None and (extra_times or window[0] == window[1]):
+        raise ValueError("Time window must be nonempty and can't be combined with several exact times")
+    time_offset *= SECOND
+    offset = timezone_offset * SECOND if timezone_offset is not None else 0
+    table = None
+    if isinstance(timezone, datetime_timezone):
+        offset = cast(timedelta, timezone.utcoffset(None)) // MICROSECOND
+    elif timezone is not None:
+        table = get_transition_table(timezone)
+        offset = time_offset - table.to_utc(time_offset)
+    weekday_values, weekday_skips = get_weekday_tables(weekdays)
+    cycle = regular_offset // gcd(regular_offset, WEEK) * WEEK
+    if calendar is not None:
+        if get_next_day(calendar, weekday_values, 0) is None:
+            raise ValueError(
+                "The period never falls on the specified months and days of month. "
+                "Hint: check the combination of months, days of month and weekdays"
+            )
+        # the calendar repeats every 400 years, and their length is a multiple of a week
+        calendar_cycle = get_cycle(calendar) * DAY
+        cycle = regular_offset // gcd(regular_offset, calendar_cycle) * calendar_cycle
+    return CompiledPeriod(
+        initial_timestamp=time_offset - offset,
+        table=table,
+        regular_offset=regular_offset,
+        time_offset=time_offset,
+        weekdays=weekday_values,
+        weekday_skips=weekday_skips,
+        cycle=cycle,
+        slots=(0,) + tuple(offset * SECOND for offset in extra_times),
+        window=(window[0] * SECOND, window[1] * SECOND) if window is not None else None,
+        calendar=calendar,
+    )
+
+
+def get_moment_weekdays(compiled: CompiledPeriod) -> FrozenSet[int]:
+    """Get weekdays which moments of the period can fall on."""
+    weekdays = compiled.weekdays or frozenset(range(7))
+    if compiled.regular_offset % DAY:
+        return weekdays
+    first_day = compiled.time_offset // DAY + EPOCH_WEEKDAY
+    days = compiled.regular_offset // DAY
+    return frozenset((first_day + i * days) % 7 for i in range(7)) & weekdays
+
+
+def is_progression(compiled: CompiledPeriod) -> bool:
+    """If moments of the period are a single arithmetic progression filtered by weekdays, return True, else False.
+    Periods with several exact times, time windows or calendars aren't.
+    """
+    return len(compiled.slots) == 1 and compiled.window is None and compiled.calendar is None
+
+
+def includes(compiled: CompiledPeriod, other: CompiledPeriod) -> bool:
+    """If all moments of the other period are moments of the period, return True, else False.
+    Periods must have the same time zone. Periods with several exact times, time windows or calendars are only
+    compared for equality.
+    """
+    if not is_progression(compiled) or not is_progression(other):
+        return compiled == other
+    return (
+        other.regular_offset % compiled.regular_offset == 0
+        and (other.time_offset - compiled.time_offset) % compiled.regular_offset == 0
+        and get_moment_weekdays(other) <= (compiled.weekdays or frozenset(range(7)))
+    )
+
+
+def get_next_moment(compiled: CompiledPeriod, delta_t: int) -> Union[int, None]:
+    slots = compiled.slots
+    if len(slots) == 1:
+        return _get_next_first_moment(compiled, delta_t)
+    # Other exact times are slots after the moment of the first one, and slots of consecutive moments don't
+    # overlap, so the next moment is a slot of the first moment whose last slot is after delta_t.
+    moment = _get_next_first_moment(compiled, delta_t - slots[-1])
+    if moment is None:
+        return None
+    return moment + slots[bisect_right(slots, delta_t - moment)]
+
+
+def _get_next_opening(compiled: CompiledPeriod, local: int) -> Union[int, None]:
+    """Get None if the local time is allowed by the time window, weekdays and the calendar, else the local time
+    when the next allowed time may begin: the next opening of the time window or the next allowed day.
+    """
+    day, time = divmod(local, DAY)
+    window = compiled.window
+    if window is not None:
+        start, end = window
+        if not (start <= time < end if start < end else time >= start or time < end):
+            # the window is closed, so it opens today, or tomorrow if it's been closed since today's end
+            return (day + (time >= start)) * DAY + start
+    if compiled.calendar is not None:
+        # weekdays are taken into account by the calendar, the next day is never None after compile_period
+        next_day = cast(int, get_next_day(compiled.calendar, compiled.weekdays, day))
+        return next_day * DAY if next_day != day else None
+    days_to_skip = compiled.weekday_skips[(day + EPOCH_WEEKDAY) % 7]
+    if days_to_skip:
+        return (day + days_to_skip) * DAY
+    return None
+
+
+def _get_next_first_moment(compiled: CompiledPeriod, delta_t: int) -> Union[int, None]:
+    # Moments are offsets since the initial datetime, i.e. multiples of the regular offset.
+    # Instead of checking moments one by one, jump straight to the next allowed weekday or time window.
+    # Weekdays and time of day of moments repeat every cycle, so there's no match if nothing is found within it.
+    moment = delta_t + compiled.regular_offset - delta_t % compiled.regular_offset
+    if not compiled.weekdays and compiled.window is None and compiled.calendar is None:
+        return moment
+
+    limit = moment + compiled.cycle
+    while moment < limit:
+        opening = _get_next_opening(compiled, compiled.time_offset + moment)
+        if opening is None:
+            return moment
+        day_start = opening - compiled.time_offset
+        moment = day_start + (-day_start) % compiled.regular_offset
+
+    return None
+
+
+def get_next_moments_vectorized(compiled: CompiledPeriod, delta_t: "numpy.ndarray") -> "numpy.ndarray":
+    # The same as get_next_moment, but with whole-array arithmetic
+    moments = delta_t + compiled.regular_offset - delta_t % compiled.regular_offset
+    if not compiled.weekdays:
+        return moments
+
+    weekday_skips = numpy.array(compiled.weekday_skips, dtype=numpy.int64)
+    limits = moments + compiled.cycle
+    pending = numpy.arange(moments.size)
+    while pending.size:
+        days = (compiled.time_offset + moments[pending]) // DAY
+        days_to_skip = weekday_skips[(days + EPOCH_WEEKDAY) % 7]
+        rejected = days_to_skip != 0
+        pending = pending[rejected]
+        day_starts = (days[rejected] + days_to_skip[rejected]) * DAY - compiled.time_offset
+        moments[pending] = day_starts + (-day_starts) % compiled.regular_offset
+        if (moments[pending] >= limits[pending]).any():
+            raise ValueError("The period never falls on the specified weekdays")
+
+    return moments
+
+
+def _get_slot_timestamps(compiled: CompiledPeriod, table: TransitionTable, moment: int) -> List[int]:
+    """Get epoch microseconds of all exact times of the moment of the first exact time by local time."""
+    return [table.to_utc(compiled.time_offset + moment + slot) for slot in compiled.slots]
+
+
+def get_next_timestamp(compiled: CompiledPeriod, timestamp: int) -> int:
+    """Get epoch microseconds of the next moment of the period since the passed epoch microseconds."""
+    table = compiled.table
+    if table is None:
+        delta_t = timestamp - compiled.initial_timestamp
+        moment = get_next_moment(compiled, delta_t)
+    elif compiled.regular_offset % DAY == 0:
+        # Moments are calculated by local wall clock time and mapped to UTC.
+        # The mapping is monotonic for such offsets, so the first moment after the passed one is found
+        # by starting a bit earlier than the local time.
+        delta_t = table.to_local(timestamp) - compiled.time_offset - 2 * DAY
+        while True:
+            moment = _get_next_first_moment(compiled, delta_t)
+            if moment is None:
+                break
+            # local time in a gap is mapped forward, so exact times of a day may change their order in UTC
+            later = [
+                next_timestamp for next_timestamp in _get_slot_timestamps(compiled, table, moment)
+                if next_timestamp > timestamp
+            ]
+            if later:
+                return min(later)
+            delta_t = moment
+    else:
+        # Moments are elapsed time since the first one, but weekdays are calculated by local time
+        delta_t = timestamp - compiled.initial_timestamp
+        moment = get_next_elapsed_moment(compiled, table, delta_t)
+
+    if moment is None:  # prevented by check_compiled, but may appear after direct changes
+        raise ValueError("The period never falls on the specified weekdays, time window and days of month")
+    return timestamp + moment - delta_t
+
+
+def get_next_timestamps(compiled: CompiledPeriod, values: Microseconds) -> Microseconds:
+    """Get epoch microseconds of the next moments of the period since each of the passed epoch microseconds."""
+    if is_vectorized(values):
+        if (
+            compiled.table is not None or len(compiled.slots) > 1
+            or compiled.window is not None or compiled.calendar is not None
+        ):
+            # offsets of the time zone vary, slots, windows and calendars are looked up,
+            # so it's calculated moment by moment
+            return numpy.array([get_next_timestamp(compiled, value) for value in values.tolist()])
+        delta_t = values - compiled.initial_timestamp
+        return values + (get_next_moments_vectorized(compiled, delta_t) - delta_t)
+    return [get_next_timestamp(compiled, value) for value in values]
+
+
+def get_next_elapsed_moment(
+        compiled: CompiledPeriod,
+        table: TransitionTable,
+        delta_t: int,
+) -> Union[int, None]:
+    moment = delta_t + compiled.regular_offset - delta_t % compiled.regular_offset
+    if not compiled.weekdays and compiled.window is None and compiled.calendar is None:
+        return moment
+
+    # The UTC offset is fixed between transitions, so local time of moments repeats every cycle there.
+    # If nothing is found within a cycle of the same offset, the search goes on from the next transition,
+    # e.g. a time window which moments fall into only in winter is skipped through the whole summer.
+    limit = moment + GREGORIAN_CYCLE
+    since, offset = moment, table.utcoffset(compiled.initial_timestamp + moment)
+    while moment < limit:
+        current_offset = table.utcoffset(compiled.initial_timestamp + moment)
+        if current_offset != offset:
+            since, offset = moment, current_offset
+        elif moment - since >= compiled.cycle:
+            transition = table.get_next_transition(compiled.initial_timestamp + moment)
+            if transition is not None:
+                transition -= compiled.initial_timestamp
+                moment = transition + (-transition) % compiled.regular_offset
+                continue
+            since = limit  # transitions outside the horizon are unknown, so moments are checked one by one
+        opening = _get_next_opening(compiled, compiled.initial_timestamp + moment + current_offset)
+        if opening is None:
+            return moment
+        day_start = table.to_utc(opening) - compiled.initial_timestamp
+        # local time in a fold may be mapped back, so the moment always moves forward
+        moment = max(day_start + (-day_start) % compiled.regular_offset, moment + compiled.regular_offset)
+
+    return None
+
+
+def falls_on_windows(compiled: CompiledPeriod) -> bool:
+    """Check that the period falls on its weekdays, time window and days of month at least once."""
+    if not compiled.weekdays and compiled.window is None and compiled.calendar is None:
+        return True
+    table = compiled.table
+    if table is None or compiled.regular_offset % DAY == 0:
+        variants = [compiled]
+    else:
+        # Local time of elapsed time moments depends on the UTC offset, so the period falls on them
+        # if it does with any of the offsets of the time zone, see get_next_elapsed_moment
+        offsets = {*table.offsets, compiled.time_offset - compiled.initial_timestamp}
+        variants = [
+            compiled._replace(table=None, time_offset=compiled.initial_timestamp + offset) for offset in offsets
+        ]
+    return any(get_next_moment(variant, -1) is not None for variant in variants)
+
+
+def check_compiled(compiled: CompiledPeriod) -> None:
+    """Raise :obj:`ValueError` if the period never falls on its weekdays, time window and days of month."""
+    if not falls_on_windows(compiled):
+        raise ValueError(
+            "The period never falls on the specified weekdays, time window and days of month. "
+            "Hint: check the combination of regular offset, exact time, weekdays, time window and days of month"
+        )
+
+
+@lru_cache(maxsize=None)
+def _get_weekday_back_skips(weekdays: FrozenSet[int]) -> Tuple[int, ...]:
+    """Get days to go back to the closest allowed weekday by weekday."""
+    return tuple(next(i for i in range(8) if (weekday - i) % 7 in weekdays) for weekday in range(7))
+
+
+def _get_prev_closing(compiled: CompiledPeriod, local: int) -> Union[int, None]:
+    """Get None if the local time is allowed, else the local time when the last allowed time before it ended:
+    the last closing of the time window or the end of the last allowed day, see :func:`_get_next_opening`.
+    """
+    day, time = divmod(local, DAY)
+    window = compiled.window
+    if window is not None:
+        start, end = window
+        if not (start <= time < end if start < end else time >= start or time < end):
+            # the window is closed, so it's closed since today's end, or since yesterday's one
+            return (day - (time < end)) * DAY + end
+    if compiled.calendar is not None:
+        prev_day = cast(int, get_prev_day(compiled.calendar, compiled.weekdays, day))
+        return (prev_day + 1) * DAY if prev_day != day else None
+    if compiled.weekdays:
+        days_to_skip = _get_weekday_back_skips(compiled.weekdays)[(day + EPOCH_WEEKDAY) % 7]
+        if days_to_skip:
+            return (day - days_to_skip + 1) * DAY
+    return None
+
+
+def _get_prev_first_moment(compiled: CompiledPeriod, delta_t: int) -> Union[int, None]:
+    # The same as _get_next_first_moment, but the last multiple of the regular offset before delta_t
+    # jumps straight back to the end of the last allowed day or time window.
+    moment = delta_t - 1 - (delta_t - 1) % compiled.regular_offset
+    if not compiled.weekdays and compiled.window is None and compiled.calendar is None:
+        return moment
+
+    limit = moment - compiled.cycle
+    while moment > limit:
+        closing = _get_prev_closing(compiled, compiled.time_offset + moment)
+        if closing is None:
+            return moment
+        day_end = closing - compiled.time_offset
+        moment = day_end - 1 - (day_end - 1) % compiled.regular_offset
+
+    return None
+
+
+def get_prev_moment(compiled: CompiledPeriod, delta_t: int) -> Union[int, None]:
+    """Get the last moment before delta_t, see :func:`get_next_moment`."""
+    moment = _get_prev_first_moment(compiled, delta_t)
+    if moment is None or len(compiled.slots) == 1:
+        return moment
+    # the next moment of the first exact time is after delta_t, so the last slot before delta_t is of this one
+    slots = compiled.slots
+    return moment + slots[bisect_left(slots, delta_t - moment) - 1]
+
+
+def get_prev_elapsed_moment(
+        compiled: CompiledPeriod,
+        table: TransitionTable,
+        delta_t: int,
+) -> Union[int, None]:
+    moment = delta_t - 1 - (delta_t - 1) % compiled.regular_offset
+    if not compiled.weekdays and compiled.window is None and compiled.calendar is None:
+        return moment
+
+    # the same as in get_next_elapsed_moment, but going back to the previous transition
+    limit = moment - GREGORIAN_CYCLE
+    since, offset = moment, table.utcoffset(compiled.initial_timestamp + moment)
+    while moment > limit:
+        current_offset = table.utcoffset(compiled.initial_timestamp + moment)
+        if current_offset != offset:
+            since, offset = moment, current_offset
+        elif since - moment >= compiled.cycle:
+            transition = table.get_prev_transition(compiled.initial_timestamp + moment)
+            if transition is not None:
+                transition -= compiled.initial_timestamp
+                moment = transition - 1 - (transition - 1) % compiled.regular_offset
+                continue
+            since = limit
+        closing = _get_prev_closing(compiled, compiled.initial_timestamp + moment + current_offset)
+        if closing is None:
+            return moment
+        day_end = table.to_utc(closing) - compiled.initial_timestamp
+        # local time in a fold may be mapped forward, so the moment always moves back
+        moment = min(day_end - 1 - (day_end - 1) % compiled.regular_offset, moment - compiled.regular_offset)
+
+    return None
+
+
+def get_prev_timestamp(compiled: CompiledPeriod, timestamp: int) -> int:
+    """Get epoch microseconds of the last moment of the period before the passed epoch microseconds."""
+    table = compiled.table
+    if table is None:
+        delta_t = timestamp - compiled.initial_timestamp
+        moment = get_prev_moment(compiled, delta_t)
+    elif compiled.regular_offset % DAY == 0:
+        # the same as in get_next_timestamp, but starting a bit later than the local time
+        delta_t = table.to_local(timestamp) - compiled.time_offset + 2 * DAY
+        while True:
+            moment = _get_prev_first_moment(compiled, delta_t)
+            if moment is None:
+                break
+            earlier = [
+                prev_timestamp for prev_timestamp in _get_slot_timestamps(compiled, table, moment)
+                if prev_timestamp < timestamp
+            ]
+            if earlier:
+                return max(earlier)
+            delta_t = moment
+    else:
+        delta_t = timestamp - compiled.initial_timestamp
+        moment = get_prev_elapsed_moment(compiled, table, delta_t)
+
+    if moment is None:  # prevented by check_compiled, but may appear after direct changes
+        raise ValueError("The period never falls on the specified weekdays, time window and days of month")
+    return timestamp + moment - delta_t
+
+
+def _get_inverse(a: int, m: int) -> int:
+    """Get the modular multiplicative inverse, ``pow(a, -1, m)`` isn't available in python < 3.8."""
+    x, next_x, r, next_r = 1, 0, a % m, m
+    while next_r:
+        quotient = r // next_r
+        x, next_x = next_x, x - quotient * next_x
+        r, next_r = next_r, r - quotient * next_r
+    return x % m
+
+
+def intersect(compiled: CompiledPeriod, other: CompiledPeriod) -> Union[CompiledPeriod, None]:
+    """Get the period of moments of both periods by the Chinese remainder theorem, or None if they have no common
+    moments. Periods must have the same time zone, and regular offsets must be multiples of a day
+    if it's a :class:`zoneinfo.ZoneInfo` time zone.
+    """
+    if compiled.weekdays and other.weekdays:
+        weekdays = compiled.weekdays & other.weekdays
+        if not weekdays:
+            return None
+    else:
+        weekdays = compiled.weekdays or other.weekdays
+    # moments of the both periods are time offsets plus multiples of the regular offsets in local time
+    a, b = compiled.regular_offset, other.regular_offset
+    divisor = gcd(a, b)
+    difference = other.time_offset - compiled.time_offset
+    if difference % divisor:
+        return None
+    regular_offset = a // divisor * b
+    time_offset = (
+        compiled.time_offset + a * (difference // divisor * _get_inverse(a // divisor, b // divisor) % (b // divisor))
+    ) % regular_offset
+    table = compiled.table
+    weekday_values, weekday_skips = get_weekday_tables(sum(1 << weekday for weekday in weekdays))
+    return CompiledPeriod(
+        initial_timestamp=(
+            time_offset - (compiled.time_offset - compiled.initial_timestamp) if table is None
+            else table.to_utc(time_offset)
+        ),
+        table=table,
+        regular_offset=regular_offset,
+        time_offset=time_offset,
+        weekdays=weekday_values,
+        weekday_skips=weekday_skips,
+        cycle=regular_offset // gcd(regular_offset, WEEK) * WEEK,
+    )
@@ -0,0 +1,193 @@
+from typing import Any, List, Sequence, Union
+
+from array import array
+from bisect import bisect_right
+import mmap
+import os
+from struct import Struct
+from zlib import crc32
+
+from .abstract import AbstractPeriod
+from .exclusions import ExcludedPeriod
+from .serialization import to_bytes
+
+VERSION = 1
+
+_MAGIC = b"RPOT"
+# magic, version, reserved, amount of periods, the beginning and the end of the horizon in epoch nanoseconds
+_HEADER = Struct("=4sHHqqq")
+# fingerprint (-1 if the period has none), offset and length of the row of every period
+_ROW = 3
+
+
+def _get_fingerprint(period: AbstractPeriod) -> Union[int, None]:
+    """Get the checksum of the canonical binary form of the period, see :func:`regta_period.serialization.to_bytes`,
+    with blackout windows of excluded periods. Periods without such a form get None, so their rows are never reused.
+    """
+    try:
+        if isinstance(period, ExcludedPeriod):
+            starts, ends = period.calendar._key()  # pylint: disable=protected-access
+            return crc32(to_bytes(period.period) + array("q", (*starts, *ends)).tobytes())
+        return crc32(to_bytes(period))
+    except ValueError:
+        return None
+
+
+def _get_moments(period: AbstractPeriod, moment: int, end: int, moments: "array[int]") -> None:
+    """Append moments of the period in the range :math:`(moment, end]`."""
+    get_next_ns = period.get_next_ns
+    moment = get_next_ns(moment)
+    while moment <= end:
+        moments.append(moment)
+        moment = get_next_ns(moment)
+
+
+def write_table(
+        path: Union[str, "os.PathLike[str]"],
+        periods: Sequence[AbstractPeriod],
+        start: int,
+        end: int,
+) -> None:
+    """Write moments of the periods in the horizon :math:`(start, end]` into a table file.
+
+    If the file already has a table, rows of the same periods at the same positions are reused:
+    moments before the new beginning of the horizon are dropped, and only moments after the end of
+    the old horizon are calculated. Periods are matched by their binary form made by
+    :func:`regta_period.serialization.to_bytes`, and rows of periods which can't be encoded are calculated anew.
+    The new table is written into a temporary file which replaces the old one, so readers never see
+    a partially written table.
+
+    Args:
+        path (Union[str, PathLike]): Path of the table file.
+        periods (Sequence[AbstractPeriod]): Periods, their positions are the indexes of rows.
+        start (int): The beginning of the horizon in epoch nanoseconds, exclusive, e.g. :func:`time.time_ns`.
+        end (int): The end of the horizon in epoch nanoseconds, inclusive.
+    """
+    old = None
+    try:
+        old = OccurrenceTable(path)
+    except (OSError, ValueError):  # no table or not a table, everything is calculated
+        pass
+
+    index, moments = array("q"), array("q")
+    for i, period in enumerate(periods):
+        fingerprint = _get_fingerprint(period)
+        offset = len(moments)
+        if old is not None and i < len(old) and old.is_reusable(i, fingerprint, start):
+            moments.extend(old.get_moments(i, start, end))
+            _get_moments(period, max(old.end, start), end, moments)
+        else:
+            _get_moments(period, start, end, moments)
+        index.extend((fingerprint if fingerprint is not None else -1, offset, len(moments) - offset))
+    if old is not None:
+        old.close()
+
+    temporary_path = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, VERSION, 0, len(periods), start, end))
+        file.write(index.tobytes())
+        file.write(moments.tobytes())
+    os.replace(temporary_path, path)
+
+
+class OccurrenceTable:
+    """Read-only memory-mapped table of moments written by :func:`write_table`.
+
+    Every process maps the same file, so moments are calculated once and pages are shared by the OS.
+    The next moment is looked up with a binary search within the row of a period. Values are stored in
+    the native byte order, so a table is meant to be shared within a host.
+
+    Args:
+        path (Union[str, PathLike]): Path of the table file.
+
+    Attributes:
+        path (Union[str, PathLike]): Path of the table file.
+        start (int): The beginning of the horizon in epoch nanoseconds, exclusive.
+        end (int): The end of the horizon in epoch nanoseconds, inclusive.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        self.path = path
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as file:
+            self._inode = os.fstat(file.fileno()).st_ino
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size or _HEADER.unpack_from(self._mmap)[:2] != (_MAGIC, VERSION):
+            self._mmap.close()
+            raise ValueError(f"{str(self.path)!r} isn't an occurrence table of version {VERSION}")
+        _, _, _, amount, self.start, self.end = _HEADER.unpack_from(self._mmap)
+        view = memoryview(self._mmap)
+        end_of_index = _HEADER.size + amount * _ROW * 8
+        self._index = view[_HEADER.size:end_of_index].cast("q")
+        self._moments = view[end_of_index:].cast("q")
+        view.release()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._index.release()
+        self._moments.release()
+        self._mmap.close()
+
+    def reload(self) -> bool:
+        """Map the file again if it's been replaced by :func:`write_table`.
+
+        Return:
+            bool: If the table has been reloaded.
+        """
+        if os.stat(self.path).st_ino == self._inode:
+            return False
+        self.close()
+        self._open()
+        return True
+
+    def __enter__(self) -> "OccurrenceTable":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Amount of periods."""
+        return len(self._index) // _ROW
+
+    def _get_row(self, i: int) -> range:
+        if not 0 <= i < len(self):
+            raise IndexError(f"No period with index {i}")
+        offset, length = self._index[i * _ROW + 1], self._index[i * _ROW + 2]
+        return range(offset, offset + length)
+
+    def is_reusable(self, i: int, fingerprint: Union[int, None], start: int) -> bool:
+        """If the row has moments of the period with the fingerprint since the moment, return True, else False."""
+        return self._index[i * _ROW] == fingerprint and self.start <= start <= self.end
+
+    def get_moments(self, i: int, start: int, end: int) -> List[int]:
+        """Get moments of the period in the range :math:`(start, end]` within the horizon.
+
+        Args:
+            i (int): Index of the period.
+            start (int): The beginning of the range in epoch nanoseconds, exclusive.
+            end (int): The end of the range in epoch nanoseconds, inclusive.
+        """
+        row = self._get_row(i)
+        moments = self._moments
+        first = bisect_right(moments, start, row.start, row.stop)
+        return moments[first:bisect_right(moments, end, first, row.stop)].tolist()
+
+    def get_next_ns(self, i: int, epoch_ns: int) -> Union[int, None]:
+        """Get the next moment of the period since passed moment.
+
+        Args:
+            i (int): Index of the period.
+            epoch_ns (int): Current moment in nanoseconds since the epoch.
+
+        Return:
+            Union[int, None]: The next moment in nanoseconds since the epoch, or None if it's not within
+            the horizon, then it should be calculated by the period itself.
+        """
+        row = self._get_row(i)
+        if not self.start <= epoch_ns < self.end:
+            return None
+        position = bisect_right(self._moments, epoch_ns, row.start, row.stop)
+        return self._moments[position] if position < row.stop else None
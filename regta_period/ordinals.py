@@ -0,0 +1,201 @@
+from typing import List, Tuple, Union
+
+from functools import lru_cache
+
+from .moments import CompiledPeriod, includes, intersect, is_progression
+from .timestamps import DAY, EPOCH_WEEKDAY, WEEK
+
+# Limit of terms of the inclusion-exclusion principle, aggregations with more terms are counted moment by moment
+MAX_TERMS = 4096
+
+
+def floor_sum(n: int, m: int, a: int, b: int) -> int:
+    """Get the sum of :math:`\\lfloor (a i + b) / m \\rfloor` for :math:`0 \\le i < n` in O(log m)."""
+    result = 0
+    while True:
+        if a >= m or a < 0:
+            result += n * (n - 1) // 2 * (a // m)
+            a %= m
+        if b >= m or b < 0:
+            result += n * (b // m)
+            b %= m
+        y_max = a * n + b
+        if y_max < m:
+            return result
+        n, b = divmod(y_max, m)
+        m, a = a, m
+
+
+def is_countable(compiled: CompiledPeriod) -> bool:
+    """If moments of the period can be counted in closed form, return True, else False.
+    Weekdays of elapsed time periods with a :class:`zoneinfo.ZoneInfo` time zone depend on UTC offsets,
+    and moments of periods with several exact times, time windows or calendars aren't a single arithmetic progression.
+    """
+    return is_progression(compiled) and (
+        not compiled.weekdays or compiled.table is None or compiled.regular_offset % DAY == 0
+    )
+
+
+def check_countable(compiled: CompiledPeriod) -> None:
+    """Raise :obj:`ValueError` if moments of the period can't be counted in closed form, see :func:`is_countable`."""
+    if not is_countable(compiled):
+        raise ValueError(
+            "Moments of a period with several exact times, a time window, days of month, or with weekdays, "
+            "a zoneinfo time zone and a regular offset which isn't a multiple of a day can't be numbered"
+        )
+
+
+def count_moments(compiled: CompiledPeriod, k: int) -> int:
+    """Count indexes of moments in :math:`[0, k)` which fall on the weekdays of the period.
+    It's negative for negative :math:`k`, so counts of ranges are differences of counts.
+
+    Moment :math:`k` falls on the local day :math:`y = \\lfloor (time\\_offset + k R) / DAY \\rfloor`,
+    and :math:`[y \\equiv r \\pmod 7] = \\lfloor (y - r) / 7 \\rfloor - \\lfloor (y - r - 1) / 7 \\rfloor`,
+    so the count is a sum of :func:`floor_sum` over allowed weekdays.
+    """
+    if not compiled.weekdays:
+        return k
+    start, n = (0, k) if k >= 0 else (k, -k)
+    base = compiled.time_offset + start * compiled.regular_offset
+    count = 0
+    for weekday in compiled.weekdays:
+        r = (weekday - EPOCH_WEEKDAY) % 7
+        count += (
+            floor_sum(n, WEEK, compiled.regular_offset, base - r * DAY)
+            - floor_sum(n, WEEK, compiled.regular_offset, base - (r + 1) * DAY)
+        )
+    return count if k >= 0 else -count
+
+
+def get_moment_timestamp(compiled: CompiledPeriod, k: int) -> int:
+    """Get epoch microseconds of the moment with index :math:`k`, regardless of weekdays."""
+    table = compiled.table
+    if table is None or compiled.regular_offset % DAY:
+        return compiled.initial_timestamp + k * compiled.regular_offset
+    return table.to_utc(compiled.time_offset + k * compiled.regular_offset)
+
+
+def get_moment_index(compiled: CompiledPeriod, timestamp: int) -> int:
+    """Get the index of the last moment at or before the passed epoch microseconds, regardless of weekdays."""
+    table = compiled.table
+    if table is None or compiled.regular_offset % DAY:
+        return (timestamp - compiled.initial_timestamp) // compiled.regular_offset
+    # local time is mapped to UTC monotonically, so the index by local time is off by one at most
+    k = (table.to_local(timestamp) - compiled.time_offset) // compiled.regular_offset
+    while get_moment_timestamp(compiled, k) > timestamp:
+        k -= 1
+    while get_moment_timestamp(compiled, k + 1) <= timestamp:
+        k += 1
+    return k
+
+
+def _count_until(compiled: CompiledPeriod, timestamp: int) -> int:
+    """Count moments since the initial moment until the passed epoch microseconds inclusive,
+    it's negative before the initial moment.
+    """
+    return count_moments(compiled, get_moment_index(compiled, timestamp) + 1)
+
+
+@lru_cache(maxsize=256)
+def _count_before_epoch(compiled: CompiledPeriod) -> int:
+    """Count moments since the initial moment before the epoch, see :func:`_count_until`."""
+    return _count_until(compiled, -1)
+
+
+def get_ordinal(compiled: CompiledPeriod, timestamp: int) -> int:
+    """Get the ordinal of the last moment at or before the passed epoch microseconds.
+    Moments are numbered since the epoch, so the first moment at or after it has the ordinal 0,
+    the same as in :func:`get_union_ordinal`.
+    """
+    check_countable(compiled)
+    return _count_until(compiled, timestamp) - _count_before_epoch(compiled) - 1
+
+
+def get_nth(compiled: CompiledPeriod, n: int) -> int:
+    """Get epoch microseconds of the moment with the passed ordinal, see :func:`get_ordinal`."""
+    check_countable(compiled)
+    # the moment is the one with the ordinal n since the initial moment
+    n += _count_before_epoch(compiled)
+    if not compiled.weekdays:
+        return get_moment_timestamp(compiled, n)
+    # weekdays of moments repeat every cycle, so only the position within a cycle is searched
+    cycle = compiled.cycle // compiled.regular_offset
+    q, r = divmod(n, count_moments(compiled, cycle))
+    low, high = 1, cycle
+    while low < high:
+        middle = (low + high) // 2
+        if count_moments(compiled, middle) > r:
+            high = middle
+        else:
+            low = middle + 1
+    return get_moment_timestamp(compiled, q * cycle + low - 1)
+
+
+@lru_cache(maxsize=256)
+def get_union_terms(periods: Tuple[CompiledPeriod, ...]) -> Union[List[Tuple[int, CompiledPeriod]], None]:
+    """Get signed intersections of the periods, whose counts sum up to the count of the union of the periods
+    by the inclusion-exclusion principle. Periods must have the same time zone. Terms are cached,
+    so the returned list mustn't be changed.
+
+    Subsets are extended by the periods in order, so an empty intersection prunes all its supersets.
+    An intersection included in one of the remaining periods is skipped with all its supersets,
+    since adding that period doesn't change them and their terms cancel each other out.
+
+    Return:
+        Union[List[Tuple[int, CompiledPeriod]], None]: Signs and intersections, or None if there are more
+        than :data:`MAX_TERMS` of them, or some periods can't be counted in closed form.
+    """
+    if not all(is_countable(period) and (period.table is None or not period.regular_offset % DAY)
+               for period in periods):
+        return None
+    terms: List[Tuple[int, CompiledPeriod]] = []
+    stack = [(1, period, i) for i, period in enumerate(periods)]
+    while stack:
+        sign, intersection, last = stack.pop()
+        if any(includes(periods[j], intersection) for j in range(last + 1, len(periods))):
+            continue
+        terms.append((sign, intersection))
+        if len(terms) > MAX_TERMS:
+            return None
+        for j in range(last + 1, len(periods)):
+            next_intersection = intersect(intersection, periods[j])
+            if next_intersection is not None:
+                stack.append((-sign, next_intersection, j))
+    return terms
+
+
+def count_union(terms: List[Tuple[int, CompiledPeriod]], timestamp: int) -> int:
+    """Count moments of the union of periods since the epoch until the passed epoch microseconds
+    inclusive, it's negative before the epoch. Counts of ranges are differences of these counts.
+
+    Args:
+        terms (List[Tuple[int, CompiledPeriod]]): Terms made by :func:`get_union_terms`.
+        timestamp (int): Epoch microseconds.
+    """
+    return sum(sign * (get_ordinal(period, timestamp) + 1) for sign, period in terms)
+
+
+def get_union_ordinal(terms: List[Tuple[int, CompiledPeriod]], timestamp: int) -> int:
+    """Get the ordinal of the last moment of the union of periods at or before the passed epoch microseconds.
+    Moments are numbered since the epoch, so the first moment at or after it has the ordinal 0.
+    """
+    return count_union(terms, timestamp) - 1
+
+
+def get_union_nth(terms: List[Tuple[int, CompiledPeriod]], n: int) -> int:
+    """Get epoch microseconds of the moment of the union of periods with the passed ordinal by a binary search,
+    see :func:`get_union_ordinal`.
+    """
+    # the moment is the first one whose ordinal is n, it's in the range (low, high]
+    low, high, step = -1, 0, DAY
+    while get_union_ordinal(terms, high) < n:
+        low, high, step = high, high + step, step * 2
+    while get_union_ordinal(terms, low) >= n:
+        low, high, step = low - step, low, step * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if get_union_ordinal(terms, middle) < n:
+            low = middle
+        else:
+            high = middle
+    return high
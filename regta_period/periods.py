@@ -1,53 +1,200 @@
-from typing import Dict, Iterable, Set, Tuple, Union
+from typing import Any, cast, Dict, Iterable, Iterator, Set, Tuple, Union
 
-from abc import ABC, abstractmethod
-from datetime import datetime, timedelta, timezone as datetime_timezone, tzinfo
+from abc import abstractmethod
+from copy import copy
+from datetime import datetime, timedelta, tzinfo
 
 try:
     import zoneinfo  # type: ignore
 except ImportError:  # Backward compatibility for python < 3.9
     from backports import zoneinfo  # type: ignore
 
+from .abstract import AbstractPeriod
+from .batch import Microseconds
+from .calendars import add_days, add_months, CalendarWindow, describe, make_window
 from .enums import Weekdays
+from .ordinals import get_nth, get_ordinal, is_countable
+from .spread import get_phase
+from .timestamps import DAY, from_timestamp, HOUR, MICROSECOND, MINUTE, NANOSECONDS, SECOND, to_timestamp, utc
+from .timezones import normalize_timezone
 
-utc = datetime_timezone.utc
+from .moments import (  # isort: skip
+    check_compiled, compile_period, CompiledPeriod, falls_on_windows, get_next_timestamp, get_next_timestamps,
+    get_prev_timestamp, includes,
+)
 
 
-class AbstractPeriod(ABC):
-    """The minimum interface every period object has."""
+class _BasePeriod(AbstractPeriod):
+    """Calculation of moments shared by :class:`Period` and :class:`FrozenPeriod`.
+    Subclasses provide values of the period and their compiled form.
+    """
+
+    __slots__ = ()
+
+    _regular_offset: int  # in microseconds
+    _time_offset: int
+    _extra_times: Tuple[int, ...]  # offsets of other exact times since the time offset in seconds
+    _window: Union[Tuple[int, int], None]  # local time of day in seconds
+    _calendar: Union[CalendarWindow, None]
+    _timezone_offset: Union[int, None]
+    _timezone: Union[tzinfo, None]
+
+    @abstractmethod
+    def _compile(self) -> CompiledPeriod:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _get_weekdays(self) -> Iterable[Weekdays]:
+        raise NotImplementedError
 
     @abstractmethod
+    def _merge_weekdays(self, other: "_BasePeriod") -> Union["Period", "FrozenPeriod"]:
+        """Create a copy of this period with weekdays of both periods."""
+        raise NotImplementedError
+
+    def get_next(self, dt: datetime) -> datetime:
+        self._check_datetime(dt)
+        return from_timestamp(get_next_timestamp(self._compile(), to_timestamp(dt)), dt.tzinfo)
+
     def get_interval(self, dt: datetime) -> timedelta:
-        """Get time to the next moment as timedelta since passed moment.
+        self._check_datetime(dt)
+        timestamp = to_timestamp(dt)
+        return timedelta(microseconds=get_next_timestamp(self._compile(), timestamp) - timestamp)
+
+    def get_next_ns(self, epoch_ns: int) -> int:
+        return get_next_timestamp(self._compile(), epoch_ns // NANOSECONDS) * NANOSECONDS
+
+    def get_prev(self, dt: datetime) -> datetime:
+        """Get the last moment before passed moment in closed form, the same way as :meth:`get_next`.
 
         Args:
-            dt (datetime): Current moment (:math:`t`)
+            dt (datetime): Current moment. It's not included even if it's a moment of the period.
 
         Return:
-            timedelta: Interval to the next moment (:math:`f(t)`)
+            datetime: The previous moment.
         """
-        raise NotImplementedError
+        self._check_datetime(dt)
+        return from_timestamp(get_prev_timestamp(self._compile(), to_timestamp(dt)), dt.tzinfo)
+
+    def get_prev_ns(self, epoch_ns: int) -> int:
+        return get_prev_timestamp(self._compile(), -(-epoch_ns // NANOSECONDS)) * NANOSECONDS
+
+    def get_interval_ns(self, epoch_ns: int) -> int:
+        return get_next_timestamp(self._compile(), epoch_ns // NANOSECONDS) * NANOSECONDS - epoch_ns
+
+    def iter(self, start: datetime) -> Iterator[datetime]:
+        self._check_datetime(start)
+        compiled = self._compile()
+        timestamp = to_timestamp(start)
+        while True:
+            timestamp = get_next_timestamp(compiled, timestamp)
+            yield from_timestamp(timestamp, start.tzinfo)
+
+    def iter_reversed(self, start: datetime) -> Iterator[datetime]:
+        self._check_datetime(start)
+        compiled = self._compile()
+        timestamp = to_timestamp(start)
+        while True:
+            timestamp = get_prev_timestamp(compiled, timestamp)
+            yield from_timestamp(timestamp, start.tzinfo)
+
+    def _get_next_many(self, values: Microseconds) -> Microseconds:
+        return get_next_timestamps(self._compile(), values)
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Count moments in the range :math:`(start, end]` in O(log) time, see :meth:`index_of`."""
+        self._check_datetime(start)
+        self._check_datetime(end)
+        if not is_countable(self._compile()):
+            return super().count_between(start, end)
+        return max(self.index_of(end) - self.index_of(start), 0)
+
+    def index_of(self, dt: datetime) -> int:
+        """Get the ordinal of the last moment at or before passed moment.
+
+        Moments are numbered since the epoch, the first moment at or after 01.01.1970 00:00 UTC has the ordinal 0,
+        the same as in :meth:`PeriodAggregation.index_of`. Earlier moments have negative ordinals. Ordinals are
+        calculated in closed form, so they may be used as stable keys of moments.
 
-    @abstractmethod
-    def get_next(self, dt: datetime) -> datetime:
-        """Get the next moment since passed moment.
+        Args:
+            dt (datetime): Moment.
+
+        Return:
+            int: Ordinal of the moment, or of the last moment before it.
+        """
+        self._check_datetime(dt)
+        return get_ordinal(self._compile(), to_timestamp(dt))
+
+    def nth(self, n: int) -> datetime:
+        """Get the moment with the passed ordinal, see :meth:`index_of`.
 
         Args:
-            dt (datetime): Current moment (:math:`t`)
+            n (int): Ordinal of the moment.
 
         Return:
-            datetime: The next moment (:math:`t + f(t)`)
+            datetime: The moment in UTC. It's naive if the time zone isn't in use.
         """
-        raise NotImplementedError
+        timestamp = get_nth(self._compile(), n)
+        return from_timestamp(timestamp, utc if self.is_timezone_in_use else None)
 
     @property
-    @abstractmethod
     def is_timezone_in_use(self) -> bool:
-        """If timezone is specified, return True, else False."""
-        raise NotImplementedError
+        return self._timezone is not None or self._timezone_offset is not None
 
+    def _key(self) -> Tuple[Any, ...]:
+        """Get values which define moments of the period."""
+        compiled = self._compile()
+        # all weekdays are the same as no time windows
+        weekdays = compiled.weekdays if len(compiled.weekdays) < 7 else frozenset()
+        times = self._time_offset, self._extra_times, self._window, self._calendar
+        return compiled.regular_offset, times, self._timezone, self._timezone_offset, weekdays
+
+    def __eq__(self, other: object) -> bool:
+        """Periods are equal if their regular offsets, time offsets, time zones and weekdays are equal.
+        The hash depends on the same values, so a :class:`Period` mustn't be changed while it's a key of a dict.
+        """
+        if not isinstance(other, _BasePeriod):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __or__(self, other: Union["Period", "FrozenPeriod", "PeriodAggregation"]) -> "PeriodAggregation":
+        """Create new :class:`PeriodAggregation` from this period and the passed period."""
+        period = cast(Union[Period, FrozenPeriod], self)
+        if isinstance(other, PeriodAggregation):
+            return PeriodAggregation(period, *other.periods)
+        return PeriodAggregation(period, other)
+
+    def _includes(self, other: "_BasePeriod") -> bool:
+        """If all moments of the other period are moments of this period, return True, else False."""
+        # pylint: disable=protected-access
+        if self._timezone != other._timezone or self._timezone_offset != other._timezone_offset:
+            return False
+        return includes(self._compile(), other._compile())
 
-class Period(AbstractPeriod):
+    def __repr__(self):
+        data: Dict[str, str] = {
+            "regular_offset": f"{(self._regular_offset or DAY) / SECOND}s",
+            "time_offset": ",".join(f"{self._time_offset + offset}s" for offset in (0, *self._extra_times)),
+        }
+        if self._window is not None:
+            data["window"] = f"{self._window[0]}s-{self._window[1]}s"
+        data.update(describe(self._calendar))
+        if self._timezone is not None:
+            data["timezone"] = str(self._timezone)
+        elif self._timezone_offset is not None:
+            data["timezone_offset"] = f"{self._timezone_offset}s"
+        weekdays = self._get_weekdays()
+        if weekdays:
+            data["weekdays"] = ",".join(map(lambda x: x.name.capitalize(), weekdays))
+
+        data_str = ", ".join(f"{key}={value}" for key, value in data.items())
+        return f"<{self.__class__.__name__}: {data_str}>"
+
+
+class Period(_BasePeriod):  # pylint: disable=too-many-instance-attributes
     """The core logic of this module.
 
     Args:
@@ -56,20 +203,33 @@ class Period(AbstractPeriod):
         minutes (int): Amount of minutes for the regular offset.
         seconds (int): Amount of seconds for the regular offset.
         milliseconds (int): Amount of milliseconds for the regular offset.
-        time (str): Exact time of moments (time offset). Format: "HH:MM" or "HH:MM:SS".
+        time (Union[str, Iterable[str]]): Exact time of moments (time offset), or several of them, see :meth:`at`.
+            Format: "HH:MM" or "HH:MM:SS".
         timezone (Union[tzinfo, str, int, float]):
             Time zone for exact time.
             If :obj:`str`, then it will be converted into :obj:`tzinfo` via :class:`zoneinfo.ZoneInfo`.
             If :obj:`int` or :obj:`float`, then it will be used directly as an offset for the time offset.
+            If UTC offset of the time zone varies, periods with regular offsets in whole days follow
+            the local wall clock time, and gaps and folds are resolved as described in
+            :class:`regta_period.timezones.TransitionTable`. Other periods are elapsed time.
         weekdays (Iterable[Weekdays]): Time windows of weekdays.
+        window (Tuple[str, str]): Time window of day, see :meth:`within`.
+        years (int): Amount of years for the regular offset, see :attr:`years`.
+        months (int): Amount of months for the regular offset, see :attr:`months`.
+        days_of_month (Iterable[int]): Days of month, see :meth:`on_days`.
+        months_of_year (Iterable[int]): Months of year, see :meth:`in_months`.
     """
 
     _every: int = 1
-    _regular_offset: float = 0.0
+    _regular_offset: int = 0  # in microseconds
     _time_offset: int = 0
+    _extra_times: Tuple[int, ...] = ()
+    _window: Union[Tuple[int, int], None] = None
+    _calendar: Union[CalendarWindow, None] = None
     _timezone_offset: Union[int, None] = None
     _timezone: Union[tzinfo, None] = None
     _weekdays: Set[Weekdays]
+    _compiled: Union[CompiledPeriod, None] = None
 
     def __init__(
             self,
@@ -78,22 +238,61 @@ class Period(AbstractPeriod):
             minutes: int = 0,
             seconds: int = 0,
             milliseconds: int = 0,
-            time: Union[str, None] = None,
+            time: Union[str, Iterable[str], None] = None,
             timezone: Union[tzinfo, str, int, float, None] = None,
             weekdays: Union[Iterable[Weekdays], None] = None,
+            window: Union[Tuple[str, str], None] = None,
+            years: int = 0,
+            months: int = 0,
+            days_of_month: Union[Iterable[int], None] = None,
+            months_of_year: Union[Iterable[int], None] = None,
     ):
-        self._regular_offset = (
-            milliseconds * 0.001
-            + seconds
-            + minutes * 60
-            + hours * 60 * 60
-            + days * 60 * 60 * 24
-        )
+        self._regular_offset = timedelta(
+            days=days,
+            hours=hours,
+            minutes=minutes,
+            seconds=seconds,
+            milliseconds=milliseconds,
+        ) // MICROSECOND
         if time is not None:
-            self._set_time_offset(*self._parse_time(time))
+            self._set_time_offset(*map(self._parse_time, [time] if isinstance(time, str) else time))
         if timezone is not None:
             self._set_timezone(timezone)
         self._weekdays = set(weekdays) if weekdays is not None else set()
+        if window is not None:
+            self._set_window(*window)
+        self._calendar = make_window(None, years=years, months=months)
+        if days_of_month is not None:
+            self._calendar = add_days(self._calendar, tuple(days_of_month))
+        if months_of_year is not None:
+            self._calendar = add_months(self._calendar, tuple(months_of_year))
+        self._reconfigure()
+        self._compile()
+
+    @classmethod
+    def _from_values(
+            cls,
+            regular_offset: int,
+            time_offset: int,
+            timezone: Union[tzinfo, None],
+            timezone_offset: Union[int, None],
+            weekdays: Set[Weekdays],
+            extra_times: Tuple[int, ...] = (),
+            window: Union[Tuple[int, int], None] = None,
+            calendar: Union[CalendarWindow, None] = None,
+    ) -> "Period":
+        """Create a period from already prepared internal values, skipping the builder."""
+        period = cls.__new__(cls)
+        period._regular_offset = regular_offset
+        period._time_offset = time_offset
+        period._extra_times = extra_times
+        period._window = window
+        period._calendar = calendar
+        period._timezone, period._timezone_offset = normalize_timezone(timezone, timezone_offset)
+        period._weekdays = weekdays
+        period._reconfigure()
+        period._compile()
+        return period
 
     def every(self, n: int) -> "Period":
         """Specify a factor for regular offset properties.
@@ -107,25 +306,55 @@ class Period(AbstractPeriod):
     @property
     def seconds(self) -> "Period":
         """Seconds regular offset property. Must be used only after :attr:`.every` multiplier."""
-        self._regular_offset += self._every
+        self._regular_offset += self._every * SECOND
+        self._reconfigure()
         return self
 
     @property
     def minutes(self) -> "Period":
         """Minutes regular offset property. Must be used only after :attr:`.every` multiplier."""
-        self._regular_offset += self._every * 60
+        self._regular_offset += self._every * MINUTE
+        self._reconfigure()
         return self
 
     @property
     def hours(self) -> "Period":
         """Hours regular offset property. Must be used only after :attr:`.every` multiplier."""
-        self._regular_offset += self._every * 60 * 60
+        self._regular_offset += self._every * HOUR
+        self._reconfigure()
         return self
 
     @property
     def days(self) -> "Period":
         """Days regular offset property. Must be used only after :attr:`.every` multiplier."""
-        self._regular_offset += self._every * 60 * 60 * 24
+        self._regular_offset += self._every * DAY
+        self._reconfigure()
+        return self
+
+    @property
+    def months(self) -> "Period":
+        """Months regular offset property. Must be used only after :attr:`.every` multiplier.
+
+        Months are counted since January 1970, and moments fall on the first day of month
+        unless other days are specified by :meth:`on_days`. Can't be combined with regular offsets less than a month,
+        but exact times and all time windows apply to the days.
+        """
+        calendar = self._calendar or CalendarWindow()
+        self._calendar = make_window(calendar, months=calendar.months + self._every)
+        self._reconfigure()
+        return self
+
+    @property
+    def years(self) -> "Period":
+        """Years regular offset property. Must be used only after :attr:`.every` multiplier.
+
+        Years are counted since 1970, and moments fall on the first day of January
+        unless other days and months are specified by :meth:`on_days` and :meth:`in_months`.
+        Can't be combined with regular offsets less than a month.
+        """
+        calendar = self._calendar or CalendarWindow()
+        self._calendar = make_window(calendar, years=calendar.years + self._every)
+        self._reconfigure()
         return self
 
     @property
@@ -135,7 +364,8 @@ class Period(AbstractPeriod):
         """
         if self._regular_offset:
             raise ValueError("Can't combine .hourly and other regular offset attributes")
-        self._regular_offset = 60.0 * 60
+        self._regular_offset = HOUR
+        self._reconfigure()
         return self
 
     @property
@@ -145,7 +375,30 @@ class Period(AbstractPeriod):
         """
         if self._regular_offset:
             raise ValueError("Can't combine .daily and other regular offset attributes")
-        self._regular_offset = 60.0 * 60 * 24
+        self._regular_offset = DAY
+        self._reconfigure()
+        return self
+
+    @property
+    def monthly(self) -> "Period":
+        """Regular offset = every month. The same as :code:`.every(1).months`.
+        Can't be combined with another regular offset.
+        """
+        if self._regular_offset or self._calendar is not None and (self._calendar.months or self._calendar.years):
+            raise ValueError("Can't combine .monthly and other regular offset attributes")
+        self._calendar = make_window(self._calendar, months=1)
+        self._reconfigure()
+        return self
+
+    @property
+    def yearly(self) -> "Period":
+        """Regular offset = every year. The same as :code:`.every(1).years`.
+        Can't be combined with another regular offset.
+        """
+        if self._regular_offset or self._calendar is not None and (self._calendar.months or self._calendar.years):
+            raise ValueError("Can't combine .yearly and other regular offset attributes")
+        self._calendar = make_window(self._calendar, years=1)
+        self._reconfigure()
         return self
 
     @property
@@ -159,42 +412,49 @@ class Period(AbstractPeriod):
     def monday(self) -> "Period":
         """Add Monday to the time windows list."""
         self._weekdays.add(Weekdays.MONDAY)
+        self._reconfigure()
         return self
 
     @property
     def tuesday(self) -> "Period":
         """Add Tuesday to the time windows list."""
         self._weekdays.add(Weekdays.TUESDAY)
+        self._reconfigure()
         return self
 
     @property
     def wednesday(self) -> "Period":
         """Add Wednesday to the time windows list."""
         self._weekdays.add(Weekdays.WEDNESDAY)
+        self._reconfigure()
         return self
 
     @property
     def thursday(self) -> "Period":
         """Add Thursday to the time windows list."""
         self._weekdays.add(Weekdays.THURSDAY)
+        self._reconfigure()
         return self
 
     @property
     def friday(self) -> "Period":
         """Add Friday to the time windows list."""
         self._weekdays.add(Weekdays.FRIDAY)
+        self._reconfigure()
         return self
 
     @property
     def saturday(self) -> "Period":
         """Add Saturday to the time windows list."""
         self._weekdays.add(Weekdays.SATURDAY)
+        self._reconfigure()
         return self
 
     @property
     def sunday(self) -> "Period":
         """Add Sunday to the time windows list."""
         self._weekdays.add(Weekdays.SUNDAY)
+        self._reconfigure()
         return self
 
     @property
@@ -207,12 +467,14 @@ class Period(AbstractPeriod):
             Weekdays.THURSDAY,
             Weekdays.FRIDAY,
         })
+        self._reconfigure()
         return self
 
     @property
     def weekends(self) -> "Period":
         """Add weekends (Saturday-Sunday) to the time windows list."""
         self._weekdays.update({Weekdays.SATURDAY, Weekdays.SUNDAY})
+        self._reconfigure()
         return self
 
     @staticmethod
@@ -229,28 +491,108 @@ class Period(AbstractPeriod):
 
         return hour, minute, second
 
-    def _set_time_offset(self, hour: int, minute: int, second: int) -> None:
-        checking_delimiter = 24 * 60 * 60
-        if self._regular_offset % checking_delimiter:
+    def _set_time_offset(self, *times: Tuple[int, int, int]) -> None:
+        if self._regular_offset % DAY:
             raise ValueError(
                 "Can't combine .at method and too small regular offset. "
                 "Don't combine attributes which are < day with .at time method."
             )
+        if not times:
+            raise ValueError("No exact time has been passed")
 
-        self._time_offset = hour * 60 * 60 + minute * 60 + second
+        offsets = sorted({hour * 60 * 60 + minute * 60 + second for hour, minute, second in times})
+        self._time_offset = offsets[0]
+        self._extra_times = tuple(offset - offsets[0] for offset in offsets[1:])
 
-    def at(self, time: str) -> "Period":
-        """Specify the moment exact time (time offset, :math:`\Delta t_{time}`).
+    def at(self, time: str, *times: str) -> "Period":
+        """Specify the moment exact time (time offset, :math:`\\Delta t_{time}`).
+
+        Several exact times within a day are kept as sorted offsets since the earliest one,
+        so the next moment is found with a binary search instead of an aggregation of periods,
+        e.g. :code:`.on.weekdays.at("09:00", "13:00", "17:00")`. Weekdays apply to the day of the earliest time.
 
         Args:
             time (str): Exact time. Format: "HH:MM" or "HH:MM:SS".
+            *times (str): Other exact times of the same format.
         """
-        self._set_time_offset(*self._parse_time(time))
+        self._set_time_offset(*map(self._parse_time, (time, *times)))
+        self._reconfigure()
+        return self
+
+    def _set_window(self, start: str, end: str) -> None:
+        hour, minute, second = self._parse_time(start)
+        start_offset = hour * 60 * 60 + minute * 60 + second
+        hour, minute, second = self._parse_time(end)
+        end_offset = hour * 60 * 60 + minute * 60 + second
+        end_offset %= DAY // SECOND  # 24:00 is the end of the day
+        if not 0 <= start_offset < DAY // SECOND or start_offset == end_offset:
+            raise ValueError(f"Wrong time window: {start!r} - {end!r}")
+        self._window = start_offset, end_offset
+
+    def within(self, start: str, end: str) -> "Period":
+        """Allow moments only within a time window of day :math:`[start, end)` in the time zone of the period,
+        e.g. :code:`.every(5).minutes.within("09:00", "18:00")`.
+
+        The window wraps past midnight if the start is later than the end, e.g. :code:`.within("22:00", "06:00")`.
+        Weekdays apply to the day of each moment. The next moment outside the window jumps straight
+        to the next opening of the window, the same way as to the next allowed weekday.
+
+        Args:
+            start (str): Opening time of the window, inclusive. Format: "HH:MM" or "HH:MM:SS".
+            end (str): Closing time of the window, exclusive. Format: "HH:MM" or "HH:MM:SS", "24:00" is midnight.
+        """
+        self._set_window(start, end)
+        self._reconfigure()
+        return self
+
+    def on_days(self, day: int, *days: int) -> "Period":
+        """Add days of month to the time windows list, e.g. :code:`.every(6).hours.on_days(1, 15)`.
+
+        Negative days are counted from the end of month, e.g. :code:`.monthly.on_days(-1)` is the last day of month.
+        If weekdays are specified, days are counted only among them, so :code:`.monthly.on.weekdays.on_days(-1)`
+        is the last business day of month. Days out of a month are skipped, e.g. the 31st day in April.
+        The next allowed day is found by tables of months shared by all periods, see :mod:`regta_period.calendars`.
+
+        Args:
+            day (int): Day of month, from 1 to 31 or from -31 to -1.
+            *days (int): Other days of month.
+        """
+        self._calendar = add_days(self._calendar, (day, *days))
+        self._reconfigure()
+        return self
+
+    def in_months(self, month: int, *months: int) -> "Period":
+        """Add months of year to the time windows list, e.g. :code:`.monthly.in_months(1, 4, 7, 10)`.
+
+        Args:
+            month (int): Month of year, from 1 to 12.
+            *months (int): Other months of year.
+        """
+        self._calendar = add_months(self._calendar, (month, *months))
+        self._reconfigure()
+        return self
+
+    def spread(self, key: Union[str, bytes], max_seconds: int) -> "Period":
+        """Shift moments by a stable phase derived from the key, see :func:`regta_period.spread.get_phase`.
+
+        Periods of different jobs with the same regular offset fall on the same moments,
+        the phase spreads them evenly over the window, e.g. :code:`.every(5).minutes.spread("job-42", 300)`.
+        The phase is added to the time offset, so it must be called after :meth:`at`,
+        and time windows of weekdays apply to the shifted moments.
+
+        Args:
+            key (Union[str, bytes]): Key of the job.
+            max_seconds (int): Length of the window in seconds. It can't be longer than the regular offset.
+        """
+        if max_seconds * SECOND > (self._regular_offset or DAY):
+            raise ValueError("Can't spread moments over a window longer than the regular offset")
+        self._time_offset += get_phase(key, max_seconds)
+        self._reconfigure()
         return self
 
     def _set_timezone(self, timezone: Union[tzinfo, str, int, float]) -> None:
         if isinstance(timezone, tzinfo):
-            self._timezone = timezone
+            self._timezone, self._timezone_offset = normalize_timezone(timezone, self._timezone_offset)
         elif isinstance(timezone, str):
             self._timezone = zoneinfo.ZoneInfo(timezone)
         elif isinstance(timezone, (int, float)):
@@ -268,34 +610,66 @@ class Period(AbstractPeriod):
                 If :obj:`int` or :obj:`float`, then it will be used directly as an offset for the time offset.
         """
         self._set_timezone(timezone)
+        self._reconfigure()
         return self
 
-    def _get_initial_datetime(self) -> datetime:
-        if self._timezone is not None:
-            return datetime.fromtimestamp(self._time_offset, tz=utc).replace(tzinfo=self._timezone)
-        if self._timezone_offset is not None:
-            return datetime.fromtimestamp(self._time_offset - self._timezone_offset, tz=utc)
-        return datetime.utcfromtimestamp(self._time_offset)
-
-    def get_next(self, dt: datetime) -> datetime:
-        delta_t = (dt - self._get_initial_datetime()).total_seconds()
-        # if _regular_offset is not specified, calculate as .daily
-        regular_offset = self._regular_offset or 60.0 * 60 * 24
-        next_seconds = regular_offset - (delta_t % regular_offset)
-
-        res = dt + timedelta(seconds=next_seconds)
-
-        if self._weekdays and Weekdays.get(res) not in self._weekdays:
-            return self.get_next(res)
+    def _compile_at(self, time_offset: int) -> CompiledPeriod:
+        return compile_period(
+            self._regular_offset,
+            time_offset,
+            self._timezone,
+            self._timezone_offset,
+            Weekdays.to_mask(self._weekdays),
+            self._extra_times,
+            self._window,
+            self._calendar,
+        )
 
-        return res
+    def _compile(self) -> CompiledPeriod:
+        if self._compiled is None:
+            compiled = self._compile_at(self._time_offset)
+            check_compiled(compiled)
+            self._compiled = compiled
+        return self._compiled
 
-    def get_interval(self, dt: datetime) -> timedelta:
-        return self.get_next(dt) - dt
+    def _reconfigure(self) -> None:
+        """Drop the compiled form after changes and check the new configuration.
 
-    @property
-    def is_timezone_in_use(self) -> bool:
-        return self._timezone is not None or self._timezone_offset is not None
+        The exact time may still be set by the next builder calls, so a period is rejected here only if it
+        never falls on its weekdays, time window and days of month with any exact time, and the result doesn't
+        depend on the order of the builder calls. Complete periods are checked exactly: on creation with
+        arguments and on the first use.
+        """
+        self._compiled = None
+        calendar = self._calendar
+        if calendar is not None and (calendar.months or calendar.years) and self._regular_offset:
+            raise ValueError(
+                "Can't combine regular offset in months or years and other regular offset attributes. "
+                "Hint: try to use .on_days and .in_months instead"
+            )
+        if not self._weekdays and self._window is None and calendar is None:
+            return
+        time_offsets = {self._time_offset, 0, DAY // SECOND}
+        if self._window is not None:
+            time_offsets.add(self._window[0])
+        if not any(falls_on_windows(self._compile_at(time_offset)) for time_offset in time_offsets):
+            check_compiled(self._compile_at(self._time_offset))
+
+    def _get_weekdays(self) -> Iterable[Weekdays]:
+        return self._weekdays
+
+    def freeze(self) -> "FrozenPeriod":
+        """Create an immutable and hashable :class:`FrozenPeriod` with the same moments."""
+        return FrozenPeriod(
+            self._regular_offset,
+            self._time_offset,
+            self._timezone,
+            self._timezone_offset,
+            Weekdays.to_mask(self._weekdays),
+            self._extra_times,
+            self._window,
+            self._calendar,
+        )
 
     @property
     def AND(self) -> "Period":
@@ -319,7 +693,8 @@ class Period(AbstractPeriod):
         """Combine periods as a sum of regular offset and time windows.
         Can't sum objects with a different time offset and time zone.
         """
-        if self._time_offset != other._time_offset:
+        times = self._time_offset, self._extra_times, self._window, self._calendar
+        if times != (other._time_offset, other._extra_times, other._window, other._calendar):
             raise ValueError(
                 "Can't sum periods with a different time. "
                 "Hint: try to use | instead"
@@ -331,96 +706,127 @@ class Period(AbstractPeriod):
             )
         self._regular_offset += other._regular_offset
         self._weekdays.update(other._weekdays)
+        self._reconfigure()
         return self
 
-    def __or__(self, other: Union["Period", "PeriodAggregation"]) -> "PeriodAggregation":
-        """Create new :class:`PeriodAggregation` from this period and the passed period."""
-        if isinstance(other, Period):
-            return PeriodAggregation(self, other)
-        return PeriodAggregation(self, *other.periods)
-
-    def __repr__(self):
-        data: Dict[str, str] = {
-            "regular_offset": f"{self._regular_offset or 60.0 * 60 * 24}s",
-            "time_offset": f"{self._time_offset}s",
-        }
-        if self._timezone is not None:
-            data["timezone"] = str(self._timezone)
-        elif self._timezone_offset is not None:
-            data["timezone_offset"] = f"{self._timezone_offset}s"
-        if self._weekdays:
-            data["weekdays"] = ",".join(map(lambda x: x.name.capitalize(), self._weekdays))
-
-        data_str = ", ".join(f"{key}={value}" for key, value in data.items())
-        return f"<{self.__class__.__name__}: {data_str}>"
+    def _merge_weekdays(self, other: _BasePeriod) -> "Period":
+        """Create a copy of this period with weekdays of both periods."""
+        # pylint: disable=protected-access
+        period = copy(self)
+        # an empty set means all weekdays
+        weekdays = self._weekdays and other._get_weekdays()
+        period._weekdays = self._weekdays | set(weekdays) if weekdays else set()
+        period._reconfigure()
+        return period
 
 
-class PeriodAggregation(AbstractPeriod):
-    """Aggregation class for :class:`Period`.
+class FrozenPeriod(_BasePeriod):
+    """Immutable and hashable form of :class:`Period` made by :meth:`Period.freeze`.
 
-    It contains the logic of how to get the nearest time moment and add data into
-    the last period object.
+    It's compiled once on creation and has no other state, so it's safe to share between threads
+    without locks. Values are kept in ``__slots__`` and weekdays are a 7-bit mask, so it takes less memory
+    than :class:`Period`. Equal frozen periods have equal hashes.
 
     Args:
-        *periods (Tuple[Period]): Periods to aggregate.
-
-    Attributes:
-        periods (Tuple[Period]): Aggregated periods.
+        regular_offset (int): Regular offset in microseconds, 0 means a day.
+        time_offset (int): Time offset in seconds.
+        timezone (Union[tzinfo, None]): Time zone for exact time.
+        timezone_offset (Union[int, None]): Offset for the time offset in seconds if time zone object isn't used.
+        weekdays (int): Time windows of weekdays as a mask made by :meth:`Weekdays.to_mask`, 0 means all weekdays.
+        extra_times (Tuple[int, ...]): Sorted offsets of other exact times since the time offset in seconds.
+        window (Union[Tuple[int, int], None]): Time window of day in seconds since midnight.
+        calendar (Union[CalendarWindow, None]): Months and days of month.
     """
 
-    def __init__(self, *periods: Period):
-        if not periods:
-            raise ValueError("No period has been passed")
-        self.periods = periods
+    __slots__ = (
+        "_regular_offset", "_time_offset", "_extra_times", "_window", "_calendar", "_timezone", "_timezone_offset",
+        "_weekdays", "_compiled",
+    )
 
-    def get_next(self, dt: datetime) -> datetime:
-        return min(map(lambda period: period.get_next(dt), self.periods))
-
-    def get_interval(self, dt: datetime) -> timedelta:
-        return self.get_next(dt) - dt
+    _weekdays: int
+    _compiled: CompiledPeriod
 
-    @property
-    def is_timezone_in_use(self) -> bool:
-        return any(map(lambda period: period.is_timezone_in_use, self.periods))
-
-    @property
-    def OR(self) -> "PeriodAggregation":
-        """Create a new :class:`PeriodAggregation` from these periods of
-        aggregation and a new empty period.
-
-        It's designed to write better human-readable code,
-        e.g. :code:`.on.weekdays.at("18:00").OR.on.weekends.at("21:00")`.
-        It's uppercase because :code:`or` is a reserved word in python.
-        """
-        return PeriodAggregation(*self.periods, Period())
-
-    def __or__(self, other: Union["Period", "PeriodAggregation"]) -> "PeriodAggregation":
-        """Create a new :class:`PeriodAggregation` from these periods of
-        aggregation and the passed period."""
-        if isinstance(other, Period):
-            return PeriodAggregation(*self.periods, other)
-        return PeriodAggregation(*self.periods, *other.periods)
-
-    def __dir__(self) -> Iterable[str]:
-        """Extended implementation of the standard.
-        It adds attributes of :class:`Period` class.
-        """
-        return sorted(set(dir(PeriodAggregation)) | set(dir(Period)))
+    def __init__(
+            self,
+            regular_offset: int,
+            time_offset: int,
+            timezone: Union[tzinfo, None] = None,
+            timezone_offset: Union[int, None] = None,
+            weekdays: int = 0,
+            extra_times: Tuple[int, ...] = (),
+            window: Union[Tuple[int, int], None] = None,
+            calendar: Union[CalendarWindow, None] = None,
+    ):
+        if weekdays == Weekdays.to_mask(Weekdays):
+            weekdays = 0  # all weekdays are the same as no time windows, but faster
+        timezone, timezone_offset = normalize_timezone(timezone, timezone_offset)
+        compiled = compile_period(
+            regular_offset, time_offset, timezone, timezone_offset, weekdays, extra_times, window, calendar,
+        )
+        check_compiled(compiled)
+        for name, value in (
+                ("_regular_offset", compiled.regular_offset),
+                ("_time_offset", time_offset),
+                ("_extra_times", extra_times),
+                ("_window", window),
+                ("_calendar", calendar),
+                ("_timezone", timezone),
+                ("_timezone_offset", timezone_offset),
+                ("_weekdays", weekdays),
+                ("_compiled", compiled),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def _compile(self) -> CompiledPeriod:
+        return self._compiled
+
+    def _get_weekdays(self) -> Iterable[Weekdays]:
+        return sorted(Weekdays.from_mask(self._weekdays), key=lambda weekday: weekday.value)
+
+    def _merge_weekdays(self, other: _BasePeriod) -> "FrozenPeriod":
+        other_weekdays = other._get_weekdays()  # pylint: disable=protected-access
+        return FrozenPeriod(
+            self._regular_offset,
+            self._time_offset,
+            self._timezone,
+            self._timezone_offset,
+            self._weekdays | Weekdays.to_mask(other_weekdays) if self._weekdays and other_weekdays else 0,
+            self._extra_times,
+            self._window,
+            self._calendar,
+        )
 
-    def __getattr__(self, attr):
-        """Return an attribute of the last period in the list of periods with
-        a wrap to return this object instead of the last period.
-        """
-        _attr = getattr(self.periods[-1], attr)
+    def freeze(self) -> "FrozenPeriod":
+        """Return this period, it's already frozen."""
+        return self
 
-        if isinstance(getattr(Period, attr), property):
-            return self
+    def thaw(self) -> Period:
+        """Create a mutable :class:`Period` with the same moments."""
+        return Period._from_values(  # pylint: disable=protected-access
+            regular_offset=self._regular_offset,
+            time_offset=self._time_offset,
+            timezone=self._timezone,
+            timezone_offset=self._timezone_offset,
+            weekdays=Weekdays.from_mask(self._weekdays),
+            extra_times=self._extra_times,
+            window=self._window,
+            calendar=self._calendar,
+        )
 
-        def wrapper(*args, **kwargs):
-            _attr(*args, **kwargs)
-            return self
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            self.__class__,
+            (
+                self._regular_offset, self._time_offset, self._timezone, self._timezone_offset, self._weekdays,
+                self._extra_times, self._window, self._calendar,
+            ),
+        )
 
-        return wrapper
 
-    def __repr__(self):
-        return f"<{self.__class__.__name__}: {' OR '.join(map(repr, self.periods))}>"
+from .aggregation import PeriodAggregation  # noqa: E402  pylint: disable=wrong-import-position,cyclic-import
@@ -0,0 +1,79 @@
+from typing import Dict, Union
+
+from datetime import datetime, timedelta
+from threading import Lock
+
+from .abstract import AbstractPeriod
+from .timestamps import to_timestamp
+
+
+class PeriodRegistry:
+    """Registry of shared periods with a cache of the next moments of the current tick.
+
+    Equal periods are interned into one frozen instance, see :meth:`regta_period.Period.freeze`.
+    The next moments are cached by period values until a moment of another tick is passed,
+    so lots of jobs with the same schedule cost one calculation per tick.
+
+    Periods whose moments don't depend only on the passed moment, e.g. :class:`regta_period.PeriodAggregation`
+    in the stateful mode, are calculated once per tick too.
+    """
+
+    def __init__(self) -> None:
+        self._periods: Dict[AbstractPeriod, AbstractPeriod] = {}
+        self._lock = Lock()
+        self._tick: Union[datetime, None] = None
+        self._moments: Dict[AbstractPeriod, datetime] = {}
+
+    def intern(self, period: AbstractPeriod) -> AbstractPeriod:
+        """Get the shared instance of the period.
+
+        Args:
+            period (AbstractPeriod): Period. :class:`regta_period.Period` and
+                :class:`regta_period.PeriodAggregation` are frozen, other periods are shared as is.
+
+        Return:
+            AbstractPeriod: The first registered period equal to the passed one.
+        """
+        freeze = getattr(period, "freeze", None)
+        if freeze is not None:
+            period = freeze()
+        with self._lock:
+            return self._periods.setdefault(period, period)
+
+    def get_next(self, period: AbstractPeriod, dt: datetime) -> datetime:
+        """Get the next moment of the period since passed moment using the cache of the tick.
+
+        Args:
+            period (AbstractPeriod): Period. It doesn't have to be interned, equal periods share the cache.
+            dt (datetime): Current moment, i.e. the tick. The cache is dropped when it changes.
+
+        Return:
+            datetime: The next moment.
+        """
+        with self._lock:
+            tick = self._tick
+            if tick is None or tick != dt or tick.tzinfo is not dt.tzinfo:
+                self._tick = dt
+                self._moments.clear()
+            moment = self._moments.get(period)
+            if moment is None:
+                moment = self._moments[period] = period.get_next(dt)
+            return moment
+
+    def get_interval(self, period: AbstractPeriod, dt: datetime) -> timedelta:
+        """Get time to the next moment of the period since passed moment using the cache of the tick.
+
+        Args:
+            period (AbstractPeriod): Period.
+            dt (datetime): Current moment, i.e. the tick.
+
+        Return:
+            timedelta: Interval to the next moment.
+        """
+        return timedelta(microseconds=to_timestamp(self.get_next(period, dt)) - to_timestamp(dt))
+
+    def __len__(self) -> int:
+        return len(self._periods)
+
+    def __contains__(self, period: object) -> bool:
+        return period in self._periods
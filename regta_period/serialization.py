@@ -0,0 +1,303 @@
+from typing import Any, cast, Dict, Iterable, List, Tuple, Union
+
+from datetime import timedelta, timezone as datetime_timezone, tzinfo
+from struct import Struct
+
+try:
+    import zoneinfo  # type: ignore
+except ImportError:  # Backward compatibility for python < 3.9
+    from backports import zoneinfo  # type: ignore
+
+from .aggregation import PeriodAggregation
+from .calendars import CalendarWindow, make_window
+from .enums import Weekdays
+from .periods import AbstractPeriod, FrozenPeriod, Period
+
+VERSION = 1
+
+_MAGIC = b"RP"
+_HEADER = Struct("<2sBI")  # magic, version, amount of records
+_KIND = Struct("<B")
+_PERIOD = Struct("<qiBBiH")  # regular offset, time offset, weekdays, timezone kind, timezone offset, key length
+_AGGREGATION = Struct("<?I")  # stateful, amount of periods
+# time window start and end, -1 if there's no window, amount of extra exact times, regular offsets in months
+# and years, mask of months of year and amount of days of month, followed by extra times as "<i" and days as "<b"
+_EXTENSION = Struct("<iiHIIHB")
+
+_PERIOD_KIND = 0
+_AGGREGATION_KIND = 1
+_EXTENDED_PERIOD_KIND = 2  # a period record followed by an extension
+
+_NO_TIMEZONE = 0
+_FIXED_TIMEZONE = 1
+_ZONEINFO_TIMEZONE = 2
+
+
+def _dump_timezone(period: Period) -> Tuple[Union[str, None], Union[int, None]]:
+    # pylint: disable=protected-access
+    timezone = period._timezone
+    if timezone is None:
+        return None, period._timezone_offset
+    if isinstance(timezone, datetime_timezone):
+        return None, timezone.utcoffset(None) // timedelta(seconds=1)
+    key = getattr(timezone, "key", None)
+    if key is None:
+        raise ValueError(f"Can't serialize time zone {timezone!r}, only zoneinfo.ZoneInfo has a key")
+    return key, None
+
+
+def _load_timezone(key: Union[str, None], cache: Dict[str, tzinfo]) -> Union[tzinfo, None]:
+    if key is None:
+        return None
+    timezone = cache.get(key)
+    if timezone is None:
+        timezone = cache[key] = zoneinfo.ZoneInfo(key)
+    return timezone
+
+
+def to_dict(period: AbstractPeriod) -> Dict[str, Any]:
+    """Encode a period into a dict of JSON-compatible values.
+
+    It stores the regular offset in microseconds, the time offset in seconds, the time zone
+    as a :class:`zoneinfo.ZoneInfo` key or a fixed offset in seconds, and weekdays as a 7-bit mask.
+    Offsets of other exact times since the time offset, the time window of day in seconds, and regular offsets
+    in months and years, a mask of months of year and days of month are stored only if there are any.
+
+    Args:
+        period (AbstractPeriod): :class:`Period`, :class:`FrozenPeriod` or :class:`PeriodAggregation`.
+    """
+    if isinstance(period, FrozenPeriod):
+        period = period.thaw()
+    if isinstance(period, PeriodAggregation):
+        return {
+            "version": VERSION,
+            "type": "aggregation",
+            "stateful": period.stateful,
+            "periods": [to_dict(p) for p in period.periods],
+        }
+    if isinstance(period, Period):
+        # pylint: disable=protected-access
+        key, timezone_offset = _dump_timezone(period)
+        data = {
+            "version": VERSION,
+            "type": "period",
+            "regular_offset": period._regular_offset,
+            "time_offset": period._time_offset,
+            "timezone": key,
+            "timezone_offset": timezone_offset,
+            "weekdays": Weekdays.to_mask(period._weekdays),
+        }
+        if period._extra_times:
+            data["extra_times"] = list(period._extra_times)
+        if period._window is not None:
+            data["window"] = list(period._window)
+        if period._calendar is not None:
+            months, years, months_of_year, days = period._calendar
+            data["calendar"] = {"months": months, "years": years, "months_of_year": months_of_year, "days": list(days)}
+        return data
+    raise ValueError(f"Can't serialize {period!r}")
+
+
+def _load_calendar(data: Union[Dict[str, Any], None]) -> Union[CalendarWindow, None]:
+    if data is None:
+        return None
+    return CalendarWindow(data["months"], data["years"], data["months_of_year"], tuple(data["days"]))
+
+
+def _from_dict(data: Dict[str, Any], cache: Dict[str, tzinfo]) -> AbstractPeriod:
+    if data.get("version") != VERSION:
+        raise ValueError(f"Unsupported version: {data.get('version')!r}")
+    if data["type"] == "aggregation":
+        return PeriodAggregation(
+            *(cast(Period, _from_dict(p, cache)) for p in data["periods"]),
+            stateful=data["stateful"],
+        )
+    if data["type"] == "period":
+        return Period._from_values(  # pylint: disable=protected-access
+            regular_offset=data["regular_offset"],
+            time_offset=data["time_offset"],
+            timezone=_load_timezone(data["timezone"], cache),
+            timezone_offset=data["timezone_offset"],
+            weekdays=Weekdays.from_mask(data["weekdays"]),
+            extra_times=tuple(data.get("extra_times", ())),
+            window=tuple(data["window"]) if data.get("window") is not None else None,
+            calendar=_load_calendar(data.get("calendar")),
+        )
+    raise ValueError(f"Unsupported type: {data['type']!r}")
+
+
+def from_dict(data: Dict[str, Any]) -> AbstractPeriod:
+    """Decode a period from a dict made by :func:`to_dict`.
+
+    Args:
+        data (Dict[str, Any]): Encoded period.
+    """
+    return _from_dict(data, {})
+
+
+def _pack(period: AbstractPeriod, chunks: List[bytes]) -> None:
+    if isinstance(period, FrozenPeriod):
+        period = period.thaw()
+    if isinstance(period, PeriodAggregation):
+        chunks.append(_KIND.pack(_AGGREGATION_KIND))
+        chunks.append(_AGGREGATION.pack(period.stateful, len(period.periods)))
+        for p in period.periods:
+            _pack(p, chunks)
+    elif isinstance(period, Period):
+        # pylint: disable=protected-access
+        key, timezone_offset = _dump_timezone(period)
+        if key is not None:
+            timezone_kind = _ZONEINFO_TIMEZONE
+        elif timezone_offset is not None:
+            timezone_kind = _FIXED_TIMEZONE
+        else:
+            timezone_kind = _NO_TIMEZONE
+        encoded_key = key.encode() if key is not None else b""
+        is_extended = bool(period._extra_times) or period._window is not None or period._calendar is not None
+        chunks.append(_KIND.pack(_EXTENDED_PERIOD_KIND if is_extended else _PERIOD_KIND))
+        chunks.append(_PERIOD.pack(
+            period._regular_offset,
+            period._time_offset,
+            Weekdays.to_mask(period._weekdays),
+            timezone_kind,
+            timezone_offset or 0,
+            len(encoded_key),
+        ))
+        chunks.append(encoded_key)
+        if is_extended:
+            _pack_extension(period, chunks)
+    else:
+        raise ValueError(f"Can't serialize {period!r}")
+
+
+def _pack_extension(period: Period, chunks: List[bytes]) -> None:
+    # pylint: disable=protected-access
+    extra_times, window = period._extra_times, period._window
+    months, years, months_of_year, days = period._calendar or CalendarWindow()
+    window_start, window_end = window if window is not None else (-1, -1)
+    chunks.append(_EXTENSION.pack(window_start, window_end, len(extra_times), months, years, months_of_year, len(days)))
+    chunks.append(Struct(f"<{len(extra_times)}i{len(days)}b").pack(*extra_times, *days))
+
+
+def _unpack_extension(data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+    window_start, window_end, amount, months, years, months_of_year, amount_of_days = _EXTENSION.unpack_from(
+        data, position,
+    )
+    position += _EXTENSION.size
+    values = Struct(f"<{amount}i{amount_of_days}b")
+    extra_times_and_days = values.unpack_from(data, position)
+    calendar = make_window(
+        None, months=months, years=years, months_of_year=months_of_year, days=extra_times_and_days[amount:],
+    )
+    return {
+        "extra_times": extra_times_and_days[:amount],
+        "window": (window_start, window_end) if window_start >= 0 else None,
+        "calendar": calendar,
+    }, position + values.size
+
+
+def _unpack_period(data: bytes, position: int, cache: Dict[str, tzinfo], is_extended: bool) -> Tuple[Period, int]:
+    regular_offset, time_offset, weekdays, timezone_kind, timezone_offset, key_length = _PERIOD.unpack_from(
+        data, position,
+    )
+    position += _PERIOD.size
+    key = data[position:position + key_length].decode() if timezone_kind == _ZONEINFO_TIMEZONE else None
+    position += key_length
+    extension: Dict[str, Any] = {}
+    if is_extended:
+        extension, position = _unpack_extension(data, position)
+    period = Period._from_values(  # pylint: disable=protected-access
+        regular_offset=regular_offset,
+        time_offset=time_offset,
+        timezone=_load_timezone(key, cache),
+        timezone_offset=timezone_offset if timezone_kind == _FIXED_TIMEZONE else None,
+        weekdays=Weekdays.from_mask(weekdays),
+        **extension,
+    )
+    return period, position
+
+
+def _unpack(data: bytes, position: int, cache: Dict[str, tzinfo]) -> Tuple[AbstractPeriod, int]:
+    (kind,) = _KIND.unpack_from(data, position)
+    position += _KIND.size
+    if kind == _AGGREGATION_KIND:
+        stateful, amount = _AGGREGATION.unpack_from(data, position)
+        position += _AGGREGATION.size
+        periods: List[Period] = []
+        for _ in range(amount):
+            period, position = _unpack(data, position, cache)
+            periods.append(cast(Period, period))
+        return PeriodAggregation(*periods, stateful=stateful), position
+    if kind in (_PERIOD_KIND, _EXTENDED_PERIOD_KIND):
+        return _unpack_period(data, position, cache, kind == _EXTENDED_PERIOD_KIND)
+    raise ValueError(f"Unsupported record kind: {kind}")
+
+
+def _check_header(data: bytes) -> int:
+    magic, version, amount = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Not a packed period")
+    if version != VERSION:
+        raise ValueError(f"Unsupported version: {version}")
+    return amount
+
+
+def to_bytes(period: AbstractPeriod) -> bytes:
+    """Encode a period into the packed binary form.
+
+    It stores the same values as :func:`to_dict` in fixed-width fields, followed by the time zone key.
+
+    Args:
+        period (AbstractPeriod): :class:`Period`, :class:`FrozenPeriod` or :class:`PeriodAggregation`.
+    """
+    return dump_many([period])
+
+
+def from_bytes(data: bytes) -> AbstractPeriod:
+    """Decode a period from the packed binary form made by :func:`to_bytes`.
+
+    Args:
+        data (bytes): Encoded period.
+    """
+    periods = load_many(data)
+    if len(periods) != 1:
+        raise ValueError(f"Expected a single period, got {len(periods)}")
+    return periods[0]
+
+
+def dump_many(periods: Iterable[AbstractPeriod]) -> bytes:
+    """Encode periods into a single buffer of the packed binary form.
+
+    Args:
+        periods (Iterable[AbstractPeriod]): :class:`Period` or :class:`PeriodAggregation` objects.
+    """
+    chunks: List[bytes] = [b""]
+    amount = 0
+    for period in periods:
+        _pack(period, chunks)
+        amount += 1
+    chunks[0] = _HEADER.pack(_MAGIC, VERSION, amount)
+    return b"".join(chunks)
+
+
+def load_many(data: Union[bytes, Iterable[Union[bytes, Dict[str, Any]]]]) -> List[AbstractPeriod]:
+    """Decode lots of periods in one pass. Time zones are shared by all decoded periods.
+
+    Args:
+        data (Union[bytes, Iterable[Union[bytes, Dict[str, Any]]]]):
+            A buffer made by :func:`dump_many`, or an iterable of dicts made by :func:`to_dict`
+            and buffers made by :func:`to_bytes` or :func:`dump_many`.
+    """
+    cache: Dict[str, tzinfo] = {}
+    items: Iterable[Any] = [data] if isinstance(data, (bytes, bytearray, memoryview)) else data
+
+    periods: List[AbstractPeriod] = []
+    for item in items:
+        if isinstance(item, dict):
+            periods.append(_from_dict(item, cache))
+            continue
+        position = _HEADER.size
+        for _ in range(_check_header(item)):
+            period, position = _unpack(item, position, cache)
+            periods.append(period)
+    return periods
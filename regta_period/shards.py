@@ -0,0 +1,75 @@
+from typing import Any, Tuple, Union
+
+from datetime import datetime, timedelta
+
+from .abstract import AbstractPeriod
+from .periods import FrozenPeriod, Period, PeriodAggregation
+from .timestamps import to_timestamp
+
+
+class ShardedPeriod(AbstractPeriod):
+    """View of the moments of a period whose ordinals modulo :math:`n` equal :math:`k`.
+
+    Ordinals are calculated in closed form, see :meth:`Period.index_of`, so replicas running the same
+    period with different :math:`k` share its moments without any coordination, and every moment
+    belongs to exactly one of the shards.
+
+    Args:
+        period (Union[Period, FrozenPeriod, PeriodAggregation, ShardedPeriod]): Period whose moments are numbered.
+        k (int): Index of the shard, :math:`0 \\le k < n`.
+        n (int): Amount of shards.
+
+    Attributes:
+        period (Union[Period, FrozenPeriod, PeriodAggregation, ShardedPeriod]): Sharded period.
+        k (int): Index of the shard.
+        n (int): Amount of shards.
+    """
+
+    def __init__(self, period: Union[Period, FrozenPeriod, PeriodAggregation, "ShardedPeriod"], k: int, n: int):
+        if not isinstance(period, (Period, FrozenPeriod, PeriodAggregation, ShardedPeriod)):
+            raise TypeError(f"Moments of {period!r} aren't numbered, so it can't be sharded")
+        if n < 1 or not 0 <= k < n:
+            raise ValueError(f"Wrong shard {k} of {n}")
+        period.nth(0)  # raises ValueError if moments of the period can't be numbered
+        self.period = period
+        self.k = k
+        self.n = n
+
+    def get_next(self, dt: datetime) -> datetime:
+        ordinal = self.period.index_of(dt) + 1
+        moment = self.period.nth(ordinal + (self.k - ordinal) % self.n)
+        return moment.astimezone(dt.tzinfo) if dt.tzinfo is not None else moment
+
+    def get_interval(self, dt: datetime) -> timedelta:
+        return timedelta(microseconds=to_timestamp(self.get_next(dt)) - to_timestamp(dt))
+
+    @property
+    def is_timezone_in_use(self) -> bool:
+        return self.period.is_timezone_in_use
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        return max(self.index_of(end) - self.index_of(start), 0)
+
+    def index_of(self, dt: datetime) -> int:
+        """Get the ordinal of the last moment of the shard at or before passed moment.
+        The moment with the ordinal :math:`i` is the moment of the period with the ordinal :math:`i n + k`.
+        """
+        return (self.period.index_of(dt) - self.k) // self.n
+
+    def nth(self, n: int) -> datetime:
+        """Get the moment of the shard with the passed ordinal, see :meth:`index_of`."""
+        return self.period.nth(n * self.n + self.k)
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.period, self.k, self.n
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ShardedPeriod):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.period!r}, shard {self.k} of {self.n}>"
@@ -0,0 +1,50 @@
+from typing import Iterable, List, Union
+
+from datetime import datetime, timedelta
+from zlib import crc32
+
+from .abstract import AbstractPeriod
+
+
+def get_phase(key: Union[str, bytes], max_seconds: int) -> int:
+    """Get a stable phase of the key in whole seconds, :math:`0 \\le phase < max\\_seconds`.
+
+    It's CRC-32 of the key rather than :func:`hash`, which is salted per process,
+    so the phase is the same after restarts and on every host, and keys are spread evenly over the window.
+
+    Args:
+        key (Union[str, bytes]): Key of a job. Strings are encoded in UTF-8.
+        max_seconds (int): Length of the window in seconds.
+    """
+    if max_seconds < 1:
+        raise ValueError("Length of the window must be positive")
+    if isinstance(key, str):
+        key = key.encode()
+    return crc32(key) % max_seconds
+
+
+def get_load(
+        periods: Iterable[AbstractPeriod],
+        start: datetime,
+        end: datetime,
+        bucket: timedelta = timedelta(seconds=1),
+) -> List[int]:
+    """Count moments of all the periods in consecutive buckets of the range :math:`(start, end]`.
+
+    Args:
+        periods (Iterable[AbstractPeriod]): Periods, e.g. periods of jobs spread with :meth:`Period.spread`.
+        start (datetime): The beginning of the range, exclusive.
+        end (datetime): The end of the range, inclusive.
+        bucket (timedelta): Length of a bucket, a second by default.
+
+    Return:
+        List[int]: Histogram of the load, the i-th bucket is the range
+        :math:`(start + i \\cdot bucket, start + (i + 1) \\cdot bucket]`.
+    """
+    if bucket <= timedelta(0):
+        raise ValueError("Length of a bucket must be positive")
+    load = [0] * max(-(-(end - start) // bucket), 0)
+    for period in periods:
+        for moment in period.between(start, end):
+            load[(moment - start - timedelta(microseconds=1)) // bucket] += 1
+    return load
@@ -0,0 +1,35 @@
+from typing import Union
+
+from datetime import datetime, timedelta, timezone, tzinfo
+
+from .enums import Weekdays
+
+utc = timezone.utc
+
+MICROSECOND = timedelta(microseconds=1)
+# Durations in microseconds
+MILLISECOND = 1000
+SECOND = 1000 * MILLISECOND
+MINUTE = 60 * SECOND
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+# Nanoseconds in a microsecond
+NANOSECONDS = 1000
+
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = EPOCH.replace(tzinfo=utc)
+# 01.01.1970 is Thursday, so the day number since the epoch must be shifted to get a weekday
+EPOCH_WEEKDAY = Weekdays.THURSDAY.value
+
+
+def to_timestamp(dt: datetime) -> int:
+    """Convert a datetime object into epoch microseconds. Naive datetime objects are considered as UTC."""
+    return (dt - (EPOCH if dt.tzinfo is None else UTC_EPOCH)) // MICROSECOND
+
+
+def from_timestamp(timestamp: int, tz: Union[tzinfo, None] = None) -> datetime:
+    """Convert epoch microseconds into a datetime object in the passed time zone, or a naive UTC one."""
+    if tz is None:
+        return EPOCH + timedelta(microseconds=timestamp)
+    return (UTC_EPOCH + timedelta(microseconds=timestamp)).astimezone(tz)
@@ -0,0 +1,158 @@
+from typing import cast, Dict, Tuple, Union
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone as datetime_timezone, tzinfo
+from threading import Lock
+
+from .timestamps import DAY, from_timestamp, MICROSECOND, SECOND, utc, UTC_EPOCH
+
+_horizon: Tuple[int, int] = (datetime.now().year - 1, datetime.now().year + 10)
+_tables: Dict[tzinfo, "TransitionTable"] = {}
+_lock = Lock()
+
+
+class TransitionTable:
+    """UTC offset transitions of a time zone within the horizon as compact sorted arrays.
+
+    UTC offsets are looked up with a bisect over the transitions. Outside the horizon
+    the time zone object is used directly.
+
+    Local time is mapped to UTC the same way as :class:`zoneinfo.ZoneInfo` does with :code:`fold=0`:
+
+    * Local time in a gap (e.g. 02:30 when clocks spring forward from 02:00 to 03:00)
+      doesn't exist, so it's shifted forward by the gap length (03:30).
+    * Local time in a fold (e.g. 02:30 when clocks fall back from 03:00 to 02:00)
+      occurs twice, and the first occurrence is used.
+
+    Args:
+        timezone (tzinfo): Time zone.
+        start_year (int): The first year of the horizon.
+        end_year (int): The year after the last year of the horizon.
+
+    Attributes:
+        timezone (tzinfo): Time zone.
+        start (int): The beginning of the horizon in epoch microseconds.
+        end (int): The end of the horizon in epoch microseconds.
+        transitions (array.array): Epoch microseconds of the transitions. The first one is the beginning
+            of the horizon.
+        offsets (array.array): UTC offsets in microseconds in effect since the corresponding transitions.
+    """
+
+    def __init__(self, timezone: tzinfo, start_year: int, end_year: int):
+        self.timezone = timezone
+        self.start = (datetime(start_year, 1, 1, tzinfo=utc) - UTC_EPOCH) // MICROSECOND
+        self.end = (datetime(end_year, 1, 1, tzinfo=utc) - UTC_EPOCH) // MICROSECOND
+        self.transitions = array("q", [self.start])
+        self.offsets = array("q", [self._get_timezone_offset(self.start)])
+
+        # Transitions are found by daily samples and refined by a binary search down to a second
+        left = self.start
+        while left < self.end:
+            right = min(left + DAY, self.end)
+            offset = self._get_timezone_offset(right)
+            if offset != self.offsets[-1]:
+                transition_left, transition_right = left, right
+                while transition_right - transition_left > SECOND:
+                    middle = (transition_left + transition_right) // 2 // SECOND * SECOND
+                    if middle <= transition_left:
+                        middle = transition_left + SECOND
+                    if self._get_timezone_offset(middle) == offset:
+                        transition_right = middle
+                    else:
+                        transition_left = middle
+                self.transitions.append(transition_right)
+                self.offsets.append(offset)
+            left = right
+
+        # Local time when each offset comes into effect, it's sorted as well
+        self._local_transitions = array("q", (t + o for t, o in zip(self.transitions, self.offsets)))
+
+    def _get_timezone_offset(self, timestamp: int) -> int:
+        offset = from_timestamp(timestamp, self.timezone).utcoffset()
+        return offset // MICROSECOND if offset is not None else 0
+
+    def utcoffset(self, timestamp: int) -> int:
+        """Get UTC offset in microseconds at the passed epoch microseconds."""
+        if not self.start <= timestamp < self.end:
+            return self._get_timezone_offset(timestamp)
+        return self.offsets[bisect_right(self.transitions, timestamp) - 1]
+
+    def get_next_transition(self, timestamp: int) -> Union[int, None]:
+        """Get epoch microseconds of the first transition after the passed epoch microseconds,
+        or None if it's outside the horizon.
+        """
+        i = bisect_right(self.transitions, timestamp)
+        return self.transitions[i] if 0 < i < len(self.transitions) else None
+
+    def get_prev_transition(self, timestamp: int) -> Union[int, None]:
+        """Get epoch microseconds of the last transition at or before the passed epoch microseconds,
+        or None if it's outside the horizon.
+        """
+        i = bisect_right(self.transitions, timestamp) - 1
+        return self.transitions[i] if i > 0 and timestamp < self.end else None
+
+    def to_local(self, timestamp: int) -> int:
+        """Convert epoch microseconds into local microseconds since 01.01.1970 00:00 local time."""
+        return timestamp + self.utcoffset(timestamp)
+
+    def to_utc(self, local: int) -> int:
+        """Convert local microseconds since 01.01.1970 00:00 local time into epoch microseconds.
+        Gaps and folds are resolved as described in the class docs.
+        """
+        i = bisect_right(self._local_transitions, local) - 1
+        if i < 0 or local - self.offsets[i] >= self.end:
+            naive = datetime(1970, 1, 1) + timedelta(microseconds=local)
+            return (naive.replace(tzinfo=self.timezone) - UTC_EPOCH) // MICROSECOND
+        if i > 0 and local < self.transitions[i] + self.offsets[i - 1]:
+            # the local time before the transition also exists, it's either a fold or a gap
+            return local - self.offsets[i - 1]
+        return local - self.offsets[i]
+
+
+def set_horizon(start_year: int, end_year: int) -> None:
+    """Specify years covered by transition tables and drop tables built for the previous horizon.
+
+    Args:
+        start_year (int): The first year of the horizon.
+        end_year (int): The year after the last year of the horizon.
+    """
+    global _horizon  # pylint: disable=global-statement
+    with _lock:
+        _horizon = (start_year, end_year)
+        _tables.clear()
+
+
+def get_transition_table(timezone: tzinfo) -> TransitionTable:
+    """Get the transition table of the time zone. Tables are built once and shared by all periods.
+
+    Args:
+        timezone (tzinfo): Time zone.
+    """
+    table = _tables.get(timezone)
+    if table is None:
+        with _lock:
+            table = _tables.get(timezone)
+            if table is None:
+                table = _tables[timezone] = TransitionTable(timezone, *_horizon)
+    return table
+
+
+def normalize_timezone(
+        timezone: Union[tzinfo, None], timezone_offset: Union[int, None],
+) -> Tuple[Union[tzinfo, None], Union[int, None]]:
+    """Replace a time zone with a fixed offset in whole seconds by the same offset for the time offset,
+    so periods in the same time zone have the same values however the time zone is passed.
+
+    Args:
+        timezone (Union[tzinfo, None]): Time zone.
+        timezone_offset (Union[int, None]): Offset for the time offset in seconds if time zone object isn't used.
+
+    Return:
+        Tuple[Union[tzinfo, None], Union[int, None]]: Time zone and offset for the time offset.
+    """
+    if isinstance(timezone, datetime_timezone):
+        offset = cast(timedelta, timezone.utcoffset(None))
+        if not offset % timedelta(seconds=1):
+            return None, offset // timedelta(seconds=1)
+    return timezone, timezone_offset
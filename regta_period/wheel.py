@@ -0,0 +1,195 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .abstract import AbstractPeriod
+from .timestamps import MILLISECOND, NANOSECONDS
+
+
+class Entry:
+    """Period scheduled in :class:`TimingWheel`. It's also the handle to cancel it.
+
+    Attributes:
+        period (AbstractPeriod): Period.
+        item (Any): Item returned when the period is due.
+        moment (int): The next moment of the period in nanoseconds since the epoch.
+    """
+
+    __slots__ = ("period", "item", "moment", "_tick", "_level", "_slot")
+
+    def __init__(self, period: AbstractPeriod, item: Any, moment: int):
+        self.period = period
+        self.item = item
+        self.moment = moment
+        self._tick = 0
+        self._level = 0
+        self._slot: Dict["Entry", None] = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.period!r}, item={self.item!r}, moment={self.moment}>"
+
+
+class TimingWheel:  # pylint: disable=too-many-instance-attributes
+    """Hierarchical timing wheel of the next moments of lots of periods.
+
+    Time is divided into ticks of the resolution, and every level has :code:`2 ** bits` slots of ticks.
+    An entry is kept in the level of the highest digit in which its tick differs from the current tick,
+    so slots of the first level are single ticks, and slots of the next levels are ranges of ticks which
+    are moved down when the current tick reaches them. Insertion and cancellation cost O(1), an advance costs
+    O(1) per due entry and per level reached, and levels without entries are skipped, so advancing
+    over a long idle time is cheap. Entries too far in the future wait in an overflow slot.
+
+    Moments are integer epoch nanoseconds as in :meth:`AbstractPeriod.get_next_ns`. Entries are due
+    when their moments have come, rounded up to the resolution, so they're never early and at most
+    one tick late.
+
+    Args:
+        now (int): Current moment in nanoseconds since the epoch, e.g. :func:`time.time_ns`.
+        resolution (int): Length of a tick in nanoseconds, a millisecond by default.
+        bits (int): Binary logarithm of the amount of slots in a level.
+        levels (int): Amount of levels.
+
+    Attributes:
+        now (int): The moment of the last advance in nanoseconds since the epoch.
+        resolution (int): Length of a tick in nanoseconds.
+    """
+
+    def __init__(self, now: int, resolution: int = MILLISECOND * NANOSECONDS, bits: int = 6, levels: int = 5):
+        if resolution < 1 or bits < 1 or levels < 1:
+            raise ValueError("Resolution, bits and levels must be positive")
+        self.now = now
+        self.resolution = resolution
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels = levels
+        self._tick = now // resolution
+        # the last level is the overflow slot
+        self._wheels: List[List[Dict[Entry, None]]] = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._wheels.append([{}])
+        self._sizes = [0] * (levels + 1)
+        # levels by bit lengths of differences between ticks of entries and the current tick
+        self._levels_by_length = [0] + [min((length - 1) // bits, levels) for length in range(1, bits * levels + 1)]
+
+    def _get_slot(self, level: int, tick: int) -> Dict[Entry, None]:
+        if level == self._levels:
+            return self._wheels[level][0]
+        return self._wheels[level][tick >> (level * self._bits) & self._mask]
+
+    def _place(self, entries: Iterable[Entry]) -> None:
+        # pylint: disable=protected-access
+        tick, bits, mask, levels = self._tick, self._bits, self._mask, self._levels
+        wheels, sizes, levels_by_length = self._wheels, self._sizes, self._levels_by_length
+        for entry in entries:
+            length = (entry._tick ^ tick).bit_length()
+            level = levels_by_length[length] if length < len(levels_by_length) else levels
+            slot = wheels[level][entry._tick >> (level * bits) & mask if level < levels else 0]
+            slot[entry] = None
+            entry._level = level
+            entry._slot = slot
+            sizes[level] += 1
+
+    def _schedule(self, entries: Iterable[Entry], now: int) -> None:
+        # pylint: disable=protected-access
+        resolution = self.resolution
+        for entry in entries:
+            entry.moment = entry.period.get_next_ns(now)
+            entry._tick = -(-entry.moment // resolution)  # rounded up, so entries aren't early
+        self._place(entries)
+
+    def insert(self, period: AbstractPeriod, item: Any = None) -> Entry:
+        """Schedule the next moment of the period since the moment of the last advance.
+
+        Args:
+            period (AbstractPeriod): Period, it's rescheduled with :meth:`AbstractPeriod.get_next_ns`
+                every time it's due.
+            item (Any): Item returned when the period is due, the period itself by default.
+
+        Return:
+            Entry: Handle of the scheduled period.
+        """
+        entry = Entry(period, period if item is None else item, 0)
+        self._schedule((entry,), self.now)
+        return entry
+
+    def cancel(self, entry: Entry) -> bool:
+        """Remove a scheduled period.
+
+        Args:
+            entry (Entry): Handle returned by :meth:`insert`.
+
+        Return:
+            bool: If the period was scheduled in this wheel.
+        """
+        # pylint: disable=protected-access
+        slot = entry._slot
+        if entry not in slot:
+            return False
+        del slot[entry]
+        entry._slot = {}
+        self._sizes[entry._level] -= 1
+        return True
+
+    def _cascade(self, level: int) -> None:
+        """Move entries of the slot of the current tick in the level down to lower levels."""
+        slot = self._get_slot(level, self._tick)
+        if not slot:
+            return
+        entries = list(slot)
+        slot.clear()
+        self._sizes[level] -= len(entries)
+        self._place(entries)
+
+    def _step(self, target: int) -> None:
+        """Move the current tick forward to the nearest slot with entries in the lowest level, or to the target."""
+        # pylint: disable=protected-access
+        level = next((level for level, size in enumerate(self._sizes) if size), None)
+        if level is None:
+            self._tick = target
+            return
+        shift = level * self._bits
+        if level == self._levels:
+            # the beginning of the range of the overflow slot with the earliest entry
+            tick = min(entry._tick for entry in self._wheels[level][0]) >> shift << shift
+        else:
+            # entries of a level share higher digits with the current tick, so the next slot is within the range
+            wheel = self._wheels[level]
+            digit = next(i for i in range((self._tick >> shift & self._mask) + 1, len(wheel)) if wheel[i])
+            tick = self._tick >> (shift + self._bits) << (shift + self._bits) | digit << shift
+        tick = min(tick, target)
+        changed = (tick ^ self._tick).bit_length()
+        self._tick = tick
+        for level in range(min((changed - 1) // self._bits, self._levels), 0, -1):
+            self._cascade(level)
+
+    def advance(self, now: int) -> List[Tuple[int, Any]]:
+        """Move the wheel to the passed moment, collect due periods and schedule their next moments.
+
+        Moments which have passed since the due ones are skipped, periods are rescheduled since
+        the passed moment.
+
+        Args:
+            now (int): Current moment in nanoseconds since the epoch. Moments in the past are ignored.
+
+        Return:
+            List[Tuple[int, Any]]: Due moments in nanoseconds since the epoch and items, in ascending order.
+        """
+        if now <= self.now:
+            return []
+        target = now // self.resolution
+        due: List[Entry] = []
+        while True:
+            slot = self._get_slot(0, self._tick)
+            if slot:
+                due.extend(slot)
+                self._sizes[0] -= len(slot)
+                slot.clear()
+            if self._tick >= target:
+                break
+            self._step(target)
+        self.now = now
+
+        due.sort(key=lambda entry: entry.moment)
+        result = [(entry.moment, entry.item) for entry in due]
+        self._schedule(due, now)
+        return result
+
+    def __len__(self) -> int:
+        return sum(self._sizes)
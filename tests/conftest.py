@@ -7,6 +7,17 @@ except ImportError:  # Backward compatibility for python < 3.9
 
 import pytest
 
+from regta_period import Period
+
+# Sample periods shared by the serialization and freezing tests
+SAMPLE_PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().every(3).days.at("17:00").by("Europe/Moscow"),
+    Period().on.weekdays.at("18:00").by(+5.5),
+    Period().every(5).hours.on.saturday.by(timezone.utc),
+    Period().on.weekdays.at("18:00").by(+3) | Period().on.weekends.at("21:00").by("Asia/Tomsk"),
+]
+
 
 @pytest.fixture
 def unix():
@@ -21,3 +32,8 @@ def utc():
 @pytest.fixture
 def utc7():
     return zoneinfo.ZoneInfo('Asia/Tomsk')
+
+
+@pytest.fixture
+def berlin():
+    return zoneinfo.ZoneInfo('Europe/Berlin')
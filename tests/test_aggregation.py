@@ -1,6 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from regta_period import Period, PeriodAggregation
+from regta_period import Period, PeriodAggregation, Weekdays
 
 
 def _assert(p: PeriodAggregation, dt):
@@ -26,3 +26,76 @@ def test_magic_creation(unix: datetime):
 def test_dot_or_creation(unix: datetime):
     p = Period().daily.at("16:00").OR.on.thursday.at("11:00").OR.on.monday.at("9:00")
     _assert(p, unix)
+
+
+class _CountingPeriod(Period):
+    calls = 0
+
+    def get_next(self, dt: datetime) -> datetime:
+        self.calls += 1
+        return super().get_next(dt)
+
+
+def test_stateful_mode(unix: datetime):
+    periods = [_CountingPeriod(minutes=7 * i) for i in range(1, 50)]
+    stateless = PeriodAggregation(*periods)
+    stateful = PeriodAggregation(*periods, stateful=True)
+
+    moments = [unix + timedelta(minutes=i) for i in range(0, 600, 3)]
+    moments += [unix + timedelta(minutes=30), unix + timedelta(days=3)]  # going back and jumping ahead
+    for dt in moments:
+        assert stateful.get_next(dt) == stateless.get_next(dt)
+
+    for period in periods:
+        period.calls = 0
+    for dt in moments[:100]:
+        stateful.get_next(dt + timedelta(days=1))
+    # only the periods whose moments have passed are recalculated
+    assert sum(period.calls for period in periods) < 100 * len(periods) // 4
+
+
+def test_stateful_mode_reset(unix: datetime):
+    p = PeriodAggregation(Period().daily.at("16:00"), stateful=True).OR.every(3).hours
+    assert p.stateful
+    assert p.get_next(unix) == unix + timedelta(hours=3)
+    assert p.every(1).hours.get_next(unix) == unix + timedelta(hours=4)
+
+
+def test_optimization(unix: datetime):
+    p = PeriodAggregation(
+        Period().on.monday.at("18:00"),
+        Period().on.tuesday.AND.wednesday.at("18:00"),
+        Period().every(4).hours,
+        Period().every(12).hours,  # included into every 4 hours
+        Period().every(7).days.at("04:00"),  # included into every 4 hours
+        Period().every(14).days.at("18:00"),  # always on Thursday
+        Period().on.thursday.at("18:00"),
+        Period().daily.at("00:00"),
+        Period().daily.at("24:00"),  # the same as the previous one
+        Period().on.friday.at("18:00").by(+3),  # another time zone
+    )
+    optimized = p.optimize()
+    assert len(optimized.periods) == 3
+    assert p.periods[0]._weekdays == {Weekdays.MONDAY}  # pylint: disable=protected-access
+
+    dt = unix
+    for _ in range(200):
+        dt += timedelta(minutes=97)
+        aware_dt = dt.replace(tzinfo=timezone.utc)
+        assert optimized.periods[-1].get_next(aware_dt) == p.periods[-1].get_next(aware_dt)
+        naive_optimized, naive = PeriodAggregation(*optimized.periods[:-1]), PeriodAggregation(*p.periods[:-1])
+        assert naive_optimized.get_next(dt) == naive.get_next(dt)
+
+
+def test_optimization_of_times_and_windows():
+    p = PeriodAggregation(
+        Period().on.monday.at("09:00", "10:00"),
+        Period().on.tuesday.at("09:00", "11:00"),
+        Period(minutes=5).on.monday.within("09:00", "10:00"),
+        Period(minutes=5).on.tuesday.within("11:00", "12:00"),
+        Period(minutes=5).on.wednesday.within("11:00", "12:00"),
+    )
+    optimized = p.optimize()
+    assert len(optimized.periods) == 4
+    start, end = datetime(2022, 10, 24), datetime(2022, 10, 31)
+    assert list(optimized.between(start, end)) == list(p.between(start, end))
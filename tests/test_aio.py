@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta
+from time import monotonic_ns, time_ns
+
+import pytest
+
+from regta_period import aio, Period
+
+PERIOD = Period(milliseconds=20)
+STEP = 20_000_000  # nanoseconds
+
+
+def test_aiter():
+    async def main():
+        moments = []
+        async for moment in PERIOD.aiter():
+            assert time_ns() >= (moment - datetime(1970, 1, 1)) // timedelta(microseconds=1) * 1000
+            moments.append(moment)
+            if len(moments) == 3:
+                break
+        return moments
+
+    moments = asyncio.run(main())
+    assert all(moment.microsecond % 20_000 == 0 for moment in moments)
+    assert [b - a for a, b in zip(moments, moments[1:])] == [timedelta(milliseconds=20)] * 2
+
+
+def test_aiter_skips_passed_moments():
+    async def main():
+        start = datetime.utcnow() - timedelta(hours=1)
+        async for moment in PERIOD.aiter(start):
+            return moment
+        return None
+
+    assert asyncio.run(main()) > datetime.utcnow() - timedelta(seconds=1)
+
+
+def test_sleep_until_next(utc7):
+    async def main():
+        return await Period(milliseconds=20).by(utc7).sleep_until_next()
+
+    moment = asyncio.run(main())
+    assert moment.tzinfo is not None and moment.microsecond % 20_000 == 0
+    assert time_ns() >= (moment - datetime(1970, 1, 1, tzinfo=moment.tzinfo)) // timedelta(microseconds=1) * 1000
+
+
+def test_shared_timer(monkeypatch):
+    async def main():
+        loop = asyncio.get_running_loop()
+        call_at = loop.call_at
+        handles = []
+        monkeypatch.setattr(loop, "call_at", lambda *args: handles.append(call_at(*args)) or handles[-1])
+        # the clock stands still right after a common moment until all waiters are added, then it goes on
+        start = 150_000_000 * 10_000 + 1_000_000
+        resumed = []
+
+        def now_ns():
+            return start + monotonic_ns() - resumed[0] if resumed else start
+
+        monkeypatch.setattr(aio, "time_ns", now_ns)
+        monkeypatch.setattr(loop, "time", lambda: now_ns() / 1e9)
+
+        periods = [Period(milliseconds=50 * (i % 3 + 1)) for i in range(1000)]
+        tasks = [asyncio.ensure_future(p.sleep_until_next()) for p in periods]
+        await asyncio.sleep(0)
+        assert len(aio.get_timer()) == 1000
+        assert sum(not handle.cancelled() for handle in handles) == 1
+
+        resumed.append(monotonic_ns())
+        tasks[0].cancel()
+        moments = await asyncio.gather(*tasks[1:])
+        assert len(aio.get_timer()) == 0
+        assert all(moment.microsecond % 50_000 == 0 for moment in moments)
+        assert moments[:3] == [datetime(1970, 1, 1, 0, 25, 0, 50_000 * i) for i in (2, 3, 1)]
+
+    asyncio.run(main())
+
+
+def test_drift_correction(monkeypatch):
+    async def main():
+        loop = asyncio.get_running_loop()
+        offset = [1_000_000 * STEP]
+        monkeypatch.setattr(aio, "time_ns", lambda: int(loop.time() * 1e9) + offset[0])
+        deadline = aio.time_ns() + 2 * STEP
+        task = asyncio.ensure_future(aio.sleep_until(deadline))
+        await asyncio.sleep(0)
+
+        # the wall clock goes back, so the timer fires early by the wall clock and is rescheduled
+        offset[0] -= STEP
+        await asyncio.sleep(2.5 * STEP / 1e9)
+        assert not task.done()
+        await task
+        assert aio.time_ns() >= deadline
+
+    asyncio.run(main())
+
+
+def test_max_delay(monkeypatch):
+    async def main():
+        loop = asyncio.get_running_loop()
+        handles = []
+        monkeypatch.setattr(loop, "call_at", lambda when, callback: handles.append(when))
+        aio.get_timer().wait(time_ns() + 3600 * 10 ** 9)
+        assert handles[0] - loop.time() <= aio.MAX_DELAY
+
+    asyncio.run(main())
+
+
+def test_sleep_until_passed_moment():
+    async def main():
+        await aio.sleep_until(0)
+        assert len(aio.get_timer()) == 0
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("p", [PERIOD | Period(milliseconds=30)], ids=repr)
+def test_aggregation(p):
+    async def main():
+        return [moment async for moment in _take(p.aiter(), 3)]
+
+    moments = asyncio.run(main())
+    assert moments == sorted(set(moments))
+    assert all(moment.microsecond % 10_000 == 0 for moment in moments)
+
+
+async def _take(iterator, n):
+    async for item in iterator:
+        yield item
+        n -= 1
+        if not n:
+            break
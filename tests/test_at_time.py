@@ -1,8 +1,12 @@
 from typing import Callable
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 
-from regta_period import Period
+import pytest
+
+from regta_period import Period, PeriodAggregation
+from regta_period.serialization import from_bytes, from_dict, to_bytes, to_dict
 
 
 def _assert_creation(f: Callable[..., Period], reverse: bool = False):
@@ -45,3 +49,61 @@ def test_at_time(unix: datetime):
     moment = next_moment
     next_moment = datetime(year=1970, month=1, day=1+14, hour=16, minute=30, second=30)
     assert p.get_next(moment) == next_moment
+
+
+MULTIPLE_TIMES = [
+    ((), ("17:00", "09:00", "13:00")),
+    ((), ("00:00", "23:59:59", "12:00", "12:00")),
+    ((+3,), ("09:00", "13:00", "17:00")),
+    (("Europe/Berlin",), ("01:30", "02:30", "03:30")),
+    (("Europe/Berlin",), tuple(f"{i // 4}:{i % 4 * 15:02}" for i in range(96))),
+]
+
+
+@pytest.mark.parametrize("weekdays", [(), ("monday", "friday", "sunday")])
+@pytest.mark.parametrize("timezone_args,times", MULTIPLE_TIMES)
+def test_multiple_times(timezone_args, times, weekdays):
+    def create(*at):
+        period = Period().every(2).days.at(*at)
+        for weekday in weekdays:
+            period = getattr(period, weekday)
+        return period.by(*timezone_args) if timezone_args else period
+
+    p = create(*times)
+    aggregation = PeriodAggregation(*(create(time) for time in times))
+    tz = timezone.utc if timezone_args else None
+    start = datetime(2022, 3, 24, 11, 7, tzinfo=tz)
+    moments = [start + timedelta(hours=i * 7, minutes=i) for i in range(60)]
+    assert [p.get_next(dt) for dt in moments] == [aggregation.get_next(dt) for dt in moments]
+    expected = list(aggregation.between(start, start + timedelta(days=10)))
+    assert list(p.between(start, start + timedelta(days=10))) == expected
+    assert p.freeze().get_next_many(moments) == aggregation.get_next_many(moments)
+    epoch_moments = [int(dt.replace(tzinfo=timezone.utc).timestamp()) * 10 ** 6 for dt in moments]
+    assert p.get_next_many(epoch_moments) == aggregation.get_next_many(epoch_moments)
+    assert p.count_between(start, start + timedelta(days=10)) == len(expected)
+    assert from_bytes(to_bytes(p)) == p == from_dict(to_dict(p))
+    assert p == p.freeze() == create(*reversed(times))
+
+
+def test_multiple_times_in_gap():
+    # 02:59 is in the DST gap on 10.03.2024 and is moved forward to 03:59 EDT, after 03:39 EDT
+    p = Period().every(4).days.at("02:59", "03:39").by("America/New_York")
+    start, end = datetime(2024, 3, 5, tzinfo=timezone.utc), datetime(2024, 3, 15, tzinfo=timezone.utc)
+    moments = list(p.between(start, end))
+    assert moments[2:4] == [
+        datetime(2024, 3, 10, 7, 39, tzinfo=timezone.utc),
+        datetime(2024, 3, 10, 7, 59, tzinfo=timezone.utc),
+    ]
+    assert moments == sorted(moments)
+    assert [p.get_next(moment) for moment in [start, *moments[:-1]]] == moments
+    assert [p.get_prev(moment) for moment in moments[1:]] == moments[:-1]
+    assert list(islice(p.iter_reversed(end), len(moments))) == moments[::-1]
+
+
+def test_wrong_multiple_times():
+    _assert_creation(lambda: Period().daily.at("00:00", "24:00").get_next(datetime(2022, 1, 1)), reverse=True)
+    _assert_creation(lambda: Period().daily.at("09:00", "13:00").every(5).hours.get_next(datetime(2022, 1, 1)),
+                     reverse=True)
+    _assert_creation(lambda: Period().daily.at("09:00", "13:00").index_of(datetime(2022, 1, 1)), reverse=True)
+    _assert_creation(lambda: Period(time=["09:00", "13:00"]).freeze())
+    assert Period().daily.at("09:00", "13:00") != Period().daily.at("09:00")
@@ -0,0 +1,70 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from regta_period import batch, Period
+
+PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().every(3).days.at("12:00"),
+    Period().every(5).hours.on.saturday,
+    Period().on.weekdays.at("18:00").by(+3),
+    Period().on.monday.at("9:30").by("Asia/Tomsk"),
+    Period().on.weekdays.at("18:00").by(+3) | Period().on.weekends.at("21:00").by(-5),
+]
+MOMENTS = [datetime(2022, 7, 24) + timedelta(hours=i * 17, microseconds=i) for i in range(50)]
+TIMESTAMPS = [(dt - datetime(1970, 1, 1)) // timedelta(microseconds=1) for dt in MOMENTS]
+
+
+def _expected(p):
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc if p.is_timezone_in_use else None)
+    return [
+        (p.get_next(epoch + timedelta(microseconds=timestamp)) - epoch) // timedelta(microseconds=1)
+        for timestamp in TIMESTAMPS
+    ]
+
+
+@pytest.fixture(params=["numpy", "pure python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(batch, "numpy", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_sequences(p):
+    expected = _expected(p)
+    assert p.get_next_many(TIMESTAMPS) == expected
+    assert p.get_interval_many(TIMESTAMPS) == [e - t for e, t in zip(expected, TIMESTAMPS)]
+
+    result = p.get_next_many(array("q", TIMESTAMPS))
+    assert isinstance(result, array) and result.tolist() == expected
+    result = p.get_interval_many(array("q", TIMESTAMPS))
+    assert isinstance(result, array) and result.tolist() == [e - t for e, t in zip(expected, TIMESTAMPS)]
+
+
+@pytest.mark.parametrize("p", PERIODS[:3], ids=repr)
+def test_datetimes(p):
+    assert p.get_next_many(MOMENTS) == [p.get_next(dt) for dt in MOMENTS]
+    assert p.get_interval_many(MOMENTS) == [p.get_interval(dt) for dt in MOMENTS]
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_numpy(p):
+    numpy = pytest.importorskip("numpy")
+    expected = _expected(p)
+
+    result = p.get_next_many(numpy.array(TIMESTAMPS, dtype=numpy.int64))
+    assert result.dtype == numpy.int64 and result.tolist() == expected
+
+    timestamps = numpy.array(TIMESTAMPS, dtype="datetime64[us]").astype("datetime64[ns]")
+    result = p.get_next_many(timestamps)
+    assert result.dtype == numpy.dtype("datetime64[ns]")
+    assert result.astype("datetime64[us]").astype(numpy.int64).tolist() == expected
+    result = p.get_interval_many(timestamps)
+    assert result.dtype == numpy.dtype("timedelta64[ns]")
+    assert (timestamps + result).astype("datetime64[us]").astype(numpy.int64).tolist() == expected
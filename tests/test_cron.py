@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from regta_period import cron, FrozenPeriod
+from regta_period.aggregation import FrozenPeriodAggregation
+
+
+def _field(field, minimum, maximum, names=()):
+    values = set()
+    for part in field.split(","):
+        part, _, step = part.partition("/")
+        if part == "*":
+            start, end = minimum, maximum
+        elif "-" in part:
+            start, end = (names.index(v) + minimum if v in names else int(v) for v in part.split("-"))
+        else:
+            start = names.index(part) + minimum if part in names else int(part)
+            end = maximum if step else start
+        values.update(range(start, end + 1, int(step or 1)))
+    return values
+
+
+def _brute_force_next(expression, dt):
+    # pylint: disable=protected-access
+    fields = expression.split()
+    minutes, hours, days = _field(fields[0], 0, 59), _field(fields[1], 0, 23), _field(fields[2], 1, 31)
+    months = _field(fields[3], 1, 12, cron._MONTHS)
+    weekdays = {value % 7 for value in _field(fields[4], 0, 7, cron._WEEKDAYS)}
+    either = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    moment = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while True:
+        day_matches = moment.day in days
+        weekday_matches = (moment.weekday() + 1) % 7 in weekdays
+        if moment.month not in months or not (
+            day_matches or weekday_matches if either else day_matches and weekday_matches
+        ):
+            moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+        elif moment.hour not in hours:
+            moment = moment.replace(minute=0) + timedelta(hours=1)
+        elif moment.minute not in minutes:
+            moment += timedelta(minutes=1)
+        else:
+            return moment
+
+
+EXPRESSIONS = [
+    "* * * * *",
+    "*/15 * * * *",
+    "5,35 */2 * * *",
+    "*/15 9-17 * * 1-5",
+    "0 0 * * sun",
+    "30 4 1,15 * *",
+    "0 12 13 * fri",
+    "0 0 1 jan-mar *",
+    "10 3 */10 * mon",
+    "0 9 29 2 *",
+]
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_parse(expression):
+    p = cron.parse(expression)
+    dt = datetime(2023, 12, 28, 11, 22, 33)
+    for _ in range(30):
+        moment = p.get_next(dt)
+        assert moment == _brute_force_next(expression, dt)
+        assert p.get_interval(dt) == moment - dt
+        dt = moment + timedelta(minutes=7)
+
+
+def test_cheapest_form():
+    assert isinstance(cron.parse("* * * * *"), FrozenPeriod)
+    assert isinstance(cron.parse("0 */2 * * *"), FrozenPeriod)
+    assert isinstance(cron.parse("0 9 * * mon-fri"), FrozenPeriod)
+    assert isinstance(cron.parse("0 9,18 * * *"), FrozenPeriodAggregation)
+    assert isinstance(cron.parse("0,30 * * * *"), FrozenPeriod)
+    assert isinstance(cron.parse("0 0 1 * *"), cron.CalendarPeriod)
+    # both day fields restricted and one of them matches every day
+    assert isinstance(cron.parse("0 0 1-31 * mon"), FrozenPeriod)
+
+
+def test_macros_and_memoization():
+    assert cron.parse("@daily") == cron.parse("0 0 * * *")
+    assert cron.parse("0 0 * * *") == cron.parse(" 0  0 * * * ")
+    # results are shared, so they are immutable
+    for expression in ("0 9 * * *", "0 9,21 * * mon", "0 9 1 * *", "0 9,21 1 * *"):
+        p = cron.parse(expression)
+        assert p is cron.parse(expression)
+        with pytest.raises(AttributeError):
+            _ = p.on
+    with pytest.raises(AttributeError):
+        cron.parse("0 9,21 * * *").stateful = True
+    assert cron.parse("0 9 * * *").get_next(datetime(2023, 1, 1)) == datetime(2023, 1, 1, 9)
+    assert cron.parse("@hourly").get_next(datetime(2023, 1, 1, 10, 30)) == datetime(2023, 1, 1, 11)
+
+
+def test_timezone():
+    p = cron.parse("0 9 1 * *", timezone="Europe/Moscow")
+    dt = datetime(2023, 3, 1, 6, 0, tzinfo=timezone.utc)
+    assert p.get_next(dt) == datetime(2023, 4, 1, 6, 0, tzinfo=timezone.utc)
+
+    p = cron.parse("*/30 * * * *", timezone="Europe/Berlin")
+    dt = datetime(2023, 3, 26, 0, 50, tzinfo=timezone.utc)  # after the transition to summer time
+    assert p.get_next(dt) == datetime(2023, 3, 26, 1, 0, tzinfo=timezone.utc)
+
+    p = cron.parse("0 9 * * *", timezone=+3)
+    assert p.get_next(datetime(2023, 3, 1, 6, 0, tzinfo=timezone.utc)) == datetime(2023, 3, 2, 6, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "* * * foo *", "5-1 * * * *", "0 0 30 2 *"],
+)
+def test_errors(expression):
+    with pytest.raises(ValueError):
+        cron.parse(expression)
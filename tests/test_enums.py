@@ -11,3 +11,10 @@ def test_weekdays():
     assert Weekdays.get(datetime(2022, 7, 28, 0, 0, 0)) == Weekdays.THURSDAY
     assert Weekdays.get(datetime(2022, 7, 29, 0, 0, 0)) == Weekdays.FRIDAY
     assert Weekdays.get(datetime(2022, 7, 30, 0, 0, 0)) == Weekdays.SATURDAY
+
+
+def test_weekdays_mask():
+    assert Weekdays.to_mask([]) == 0
+    assert Weekdays.to_mask([Weekdays.MONDAY, Weekdays.SUNDAY]) == 0b1000001
+    assert Weekdays.from_mask(0b1000001) == {Weekdays.MONDAY, Weekdays.SUNDAY}
+    assert Weekdays.from_mask(Weekdays.to_mask(Weekdays)) == set(Weekdays)
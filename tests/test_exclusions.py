@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from regta_period import Period
+from regta_period.exclusions import ExcludedPeriod, ExclusionCalendar
+
+CALENDAR = ExclusionCalendar(
+    windows=[
+        (datetime(2022, 12, 24, 18), datetime(2022, 12, 25, 3)),
+        (datetime(2022, 12, 28, 9, 30), datetime(2022, 12, 28, 10, 30)),
+        (datetime(2022, 12, 28, 10), datetime(2022, 12, 28, 11)),
+    ],
+    dates=[date(2022, 12, 25), date(2022, 12, 26), date(2023, 1, 1)],
+)
+PERIODS = [
+    Period().hourly,
+    Period(minutes=25).on.weekdays,
+    Period().daily.at("10:00") | Period(minutes=45),
+]
+START, END = datetime(2022, 12, 20), datetime(2023, 1, 5)
+
+
+def _excluded(moment):
+    return any(start <= moment < end for start, end in [
+        (datetime(2022, 12, 24, 18), datetime(2022, 12, 27)),
+        (datetime(2022, 12, 28, 9, 30), datetime(2022, 12, 28, 11)),
+        (datetime(2023, 1, 1), datetime(2023, 1, 2)),
+    ])
+
+
+def test_calendar():
+    assert len(CALENDAR) == 3
+    assert CALENDAR == ExclusionCalendar(windows=[
+        (datetime(2022, 12, 28, 9, 30), datetime(2022, 12, 28, 11)),
+        (datetime(2023, 1, 1), datetime(2023, 1, 2)),
+        (datetime(2022, 12, 24, 18), datetime(2022, 12, 27)),
+    ])
+    with pytest.raises(ValueError):
+        ExclusionCalendar().add_window(datetime(2022, 1, 2), datetime(2022, 1, 1))
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_get_next(p):
+    excluded = p.exclude(CALENDAR)
+    assert isinstance(excluded, ExcludedPeriod)
+    expected = [moment for moment in p.between(START, END) if not _excluded(moment)]
+    assert list(excluded.between(START, END)) == expected
+    timestamps = [int(moment.replace(tzinfo=timezone.utc).timestamp()) * 10 ** 9 for moment in expected]
+    assert [excluded.get_next_ns(timestamp) for timestamp in timestamps[:-1]] == timestamps[1:]
+    assert excluded.count_between(START, END) == len(expected)
+    assert excluded.count_between(datetime(2022, 12, 25, 1), datetime(2022, 12, 28, 10, 15)) == len(
+        [moment for moment in expected if datetime(2022, 12, 25, 1) < moment <= datetime(2022, 12, 28, 10, 15)]
+    )
+
+
+def test_timezone(berlin):
+    calendar = ExclusionCalendar(dates=[date(2022, 3, 27)], timezone=berlin)
+    p = Period().hourly.by("Europe/Berlin").exclude(calendar)
+    # the holiday is 23 hours long because of DST
+    moment = p.get_next(datetime(2022, 3, 26, 22, 30, tzinfo=timezone.utc))
+    assert moment == datetime(2022, 3, 27, 22, tzinfo=timezone.utc)
+    assert p.get_interval(datetime(2022, 3, 26, 22, 30, tzinfo=timezone.utc)) == timedelta(hours=23, minutes=30)
+
+
+def test_load(tmp_path):
+    path = tmp_path / "holidays.txt"
+    path.write_text(
+        "# holidays\n"
+        "2022-12-25\n"
+        "\n"
+        "2022-12-26  # boxing day\n"
+        "2022-12-24T18:00 2022-12-25T03:00\n"
+        "2022-12-28T09:30 2022-12-28T10:30\n"
+        "2022-12-28T10:00 2022-12-28T11:00\n"
+        "2023-01-01\n"
+    )
+    assert ExclusionCalendar.load(path) == CALENDAR
+    assert ExclusionCalendar.load(path, timezone=timezone(timedelta(hours=3))) != CALENDAR
+
+    path.write_text("2022-12-25 2022-12-26 2022-12-27\n")
+    with pytest.raises(ValueError):
+        ExclusionCalendar.load(path)
+
+
+def test_long_calendar():
+    calendar = ExclusionCalendar(dates=(date(2000, 1, 1) + timedelta(days=i) for i in range(10000)))
+    assert len(calendar) == 1
+    assert Period(minutes=1).exclude(calendar).get_next(datetime(2001, 1, 1)) == datetime(2027, 5, 19)
+    calendar = ExclusionCalendar(dates=(date(2000, 1, 1) + timedelta(days=2 * i) for i in range(10000)))
+    assert len(calendar) == 10000
+    p = Period(hours=5).exclude(calendar)
+    assert p.get_next(datetime(2010, 1, 1, 23)) == datetime(2010, 1, 3, 2)  # 02.01.2010 is a holiday
+    assert p.count_between(datetime(2000, 1, 1), datetime(2000, 1, 9)) == sum(
+        not calendar.get_end(int(moment.replace(tzinfo=timezone.utc).timestamp()) * 10 ** 6)
+        for moment in Period(hours=5).between(datetime(2000, 1, 1), datetime(2000, 1, 9))
+    )
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import pickle
+
+import pytest
+
+from regta_period import FrozenPeriod, Period, PeriodAggregation, serialization, Weekdays
+
+from .conftest import SAMPLE_PERIODS
+
+PERIODS = SAMPLE_PERIODS
+
+
+def _moments(p, n=20):
+    dt = datetime(2022, 7, 24, 10, 11, 12)
+    if p.is_timezone_in_use:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return [dt + timedelta(hours=i * 13, minutes=i * 7) for i in range(n)]
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_same_moments(p):
+    frozen = p.freeze()
+    for dt in _moments(p):
+        assert frozen.get_next(dt) == p.get_next(dt)
+        assert frozen.get_interval(dt) == p.get_interval(dt)
+    start = _moments(p)[0]
+    assert list(frozen.between(start, start + timedelta(days=3))) == list(p.between(start, start + timedelta(days=3)))
+
+
+def test_immutable():
+    frozen = Period().on.monday.at("12:00").freeze()
+    assert not hasattr(frozen, "__dict__")
+    with pytest.raises(AttributeError):
+        frozen._weekdays = 0  # pylint: disable=protected-access
+    with pytest.raises(AttributeError):
+        frozen.monday  # pylint: disable=pointless-statement,no-member
+    assert frozen.freeze() is frozen
+
+
+def test_equality():
+    a = Period().on.weekdays.at("18:00").by("Europe/Moscow").freeze()
+    b = Period(time="18:00", timezone="Europe/Moscow", weekdays=Weekdays.from_mask(0b11111)).freeze()
+    assert a == b and hash(a) == hash(b) and len({a, b}) == 1
+    assert a != Period().on.weekdays.at("18:30").by("Europe/Moscow").freeze()
+    # no regular offset is a day and all weekdays are no time windows
+    assert Period().freeze() == Period(days=1, weekdays=list(Weekdays)).freeze()
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_thaw():
+    p = Period().every(2).days.at("12:00").on.friday
+    thawed = p.freeze().thaw()
+    assert thawed is not p and thawed.freeze() == p.freeze()
+    thawed.on.monday  # pylint: disable=pointless-statement
+    assert thawed.freeze() != p.freeze()
+
+
+def test_aggregation():
+    p = Period().on.weekdays.at("18:00").freeze() | Period().on.weekends.at("21:00")
+    assert isinstance(p, PeriodAggregation) and isinstance(p.periods[0], FrozenPeriod)
+    frozen = p.freeze()
+    assert all(isinstance(period, FrozenPeriod) for period in frozen.periods)
+    for dt in _moments(p):
+        assert frozen.get_next(dt) == p.get_next(dt)
+
+    optimized = (Period().on.monday.freeze() | Period().on.tuesday.freeze() | Period().hourly.freeze()).optimize()
+    assert optimized.periods == (Period().hourly.freeze(),)
+    optimized = (Period().on.monday.freeze() | Period().on.tuesday.freeze()).optimize()
+    assert optimized.periods == (Period().on.monday.AND.tuesday.freeze(),)
+
+    assert serialization.from_dict(serialization.to_dict(frozen)).freeze().periods == frozen.periods
+
+
+def test_threads():
+    frozen = Period().every(5).hours.on.saturday.by("Europe/Berlin").freeze()
+    moments = _moments(frozen, 200)
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(frozen.get_next, moments)) == [frozen.get_next(dt) for dt in moments]
+
+
+def test_unsatisfiable():
+    with pytest.raises(ValueError):
+        FrozenPeriod(7 * 24 * 60 * 60 * 10 ** 6, 0, weekdays=Weekdays.to_mask([Weekdays.MONDAY]))
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from regta_period import cron, Period, PeriodIntersection
+
+# intersected periods and if they are intersected into a single progression
+CASES = [
+    (Period().every(6).hours, Period().every(4).hours, True),
+    (Period(hours=10), Period(hours=4, minutes=60), True),
+    (Period().every(3).days.at("17:00"), Period().on.weekdays.at("17:00"), True),
+    (
+        Period().every(2).days.at("02:30").by("Europe/Berlin"),
+        Period().every(3).days.at("02:30").on.weekdays.by("Europe/Berlin"),
+        True,
+    ),
+    (Period(minutes=7), Period(minutes=5).within("09:00", "18:00"), False),
+    (Period().monthly.on_days(13), Period().on.friday, False),
+    (Period(minutes=25).by("Europe/Berlin"), Period(minutes=10).by(+3), False),
+    (Period().daily.at("10:00").by(+2), Period().daily.at("09:00").by(+1), False),
+    (cron.parse("0 */2 1-7 * *"), Period().every(3).hours.on.weekends, False),
+    (Period().every(4).hours | Period().every(6).hours, Period().every(3).hours, False),
+]
+
+
+@pytest.mark.parametrize("a,b,is_progression", CASES, ids=repr)
+def test_intersection(a, b, is_progression):
+    start, end = datetime(2022, 1, 1), datetime(2023, 1, 1)
+    if a.is_timezone_in_use:
+        start, end = start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)
+    p = a & b
+    other_moments = set(b.between(start, end))
+    expected = [moment for moment in a.between(start, end) if moment in other_moments]
+    assert expected
+    moments = list(p.between(start, end))
+    assert moments == expected
+    assert p.count_between(start, end) == len(expected)
+    assert [p.get_prev(moment) for moment in moments[1:]] == moments[:-1]
+    assert (p._compiled is not None) == is_progression  # pylint: disable=protected-access
+    assert p == b & a
+    assert hash(p) == hash(b & a)
+
+
+def test_nested():
+    a, b, c = Period().every(2).hours, Period().every(3).hours, Period().on.monday
+    p = (a & b) & (c & a)
+    assert p.periods == (a.freeze(), b.freeze(), c.freeze(), a.freeze())
+    assert p == PeriodIntersection(a, b, c)
+    assert p.get_next(datetime(2022, 10, 19)) == datetime(2022, 10, 24)
+    assert repr(p).startswith("<PeriodIntersection: <FrozenPeriod: regular_offset=7200.0s, time_offset=0s> AND ")
+    # periods are frozen, so later changes aren't applied
+    p = a & b
+    _ = a.every(5).hours
+    assert p.get_next(datetime(2022, 10, 19)) == datetime(2022, 10, 19, 6)
+
+
+def test_far_moments():
+    p = Period().yearly.in_months(2).on_days(29) & Period().on.monday
+    assert p.get_next(datetime(2022, 1, 1)) == datetime(2044, 2, 29)
+    assert p.get_prev(datetime(2022, 1, 1)) == datetime(2016, 2, 29)
+
+
+def test_no_common_moments():
+    with pytest.raises(ValueError):
+        _ = Period(days=2).at("10:00") & Period().daily.at("11:00")
+    with pytest.raises(ValueError):
+        _ = Period().every(7).days & Period().on.monday
+    with pytest.raises(ValueError):
+        _ = Period(minutes=5).within("09:00", "10:00") & Period(minutes=5).within("11:00", "12:00")
+    with pytest.raises(TypeError):
+        _ = Period(minutes=5) & Period(minutes=5).by("Europe/Berlin")
+    with pytest.raises(ValueError):
+        PeriodIntersection()
+    with pytest.raises(TypeError):
+        (Period().every(6).hours & Period().every(4).hours).get_next(datetime(2022, 1, 1, tzinfo=timezone.utc))
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+from regta_period import Period
+
+
+def _iterate_by_get_next(p, dt, n):
+    moments = []
+    for _ in range(n):
+        dt = p.get_next(dt)
+        moments.append(dt)
+    return moments
+
+
+def test_period_iter(unix: datetime):
+    for p in (
+        Period().every(90).minutes,
+        Period().every(3).days.at("12:00"),
+        Period().every(5).hours.on.saturday.AND.monday,
+    ):
+        assert list(islice(p.iter(unix), 100)) == _iterate_by_get_next(p, unix, 100)
+
+
+def test_aggregation_iter(unix: datetime):
+    p = Period().daily.at("16:00") | Period().on.thursday.at("11:00") | Period().every(12).hours
+    moments = list(islice(p.iter(unix), 100))
+    assert moments == _iterate_by_get_next(p, unix, 100)
+    assert len(set(moments)) == len(moments)
+
+
+def test_between(unix: datetime):
+    p = Period().every(6).hours
+    assert list(p.between(unix, unix + timedelta(days=1))) == [
+        unix + timedelta(hours=6),
+        unix + timedelta(hours=12),
+        unix + timedelta(hours=18),
+        unix + timedelta(hours=24),
+    ]
+    assert not list(p.between(unix, unix + timedelta(hours=5)))
+
+    p = Period().on.weekdays.at("18:00") | Period().on.weekends.at("21:00")
+    moments = list(p.between(datetime(2022, 7, 24), datetime(2022, 7, 31)))
+    assert moments == [datetime(2022, 7, 24, 21)] + [datetime(2022, 7, day, 18) for day in range(25, 30)] + [
+        datetime(2022, 7, 30, 21),
+    ]
@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta, timezone
+import pickle
+
+import pytest
+
+from regta_period import Period, PeriodAggregation
+from regta_period.serialization import from_bytes, from_dict, to_bytes, to_dict
+
+
+def _is_last_business_day(day: date) -> bool:
+    following = (day + timedelta(days=i) for i in range(1, 4))
+    return day.weekday() < 5 and all(d.month != day.month or d.weekday() >= 5 for d in following)
+
+
+def _is_second_to_last_day(day: date) -> bool:
+    return (day + timedelta(days=2)).month != day.month and (day + timedelta(days=1)).month == day.month
+
+
+# periods with days of month, the same periods on all days, time zones and filters of local days
+CASES = [
+    (Period().monthly, Period().daily, None, lambda d: d.day == 1),
+    (Period().every(3).months.at("09:30"), Period().daily.at("09:30"), None, lambda d: d.day == 1 and d.month % 3 == 1),
+    (
+        Period().monthly.on.weekdays.on_days(-1).at("18:00").by("Europe/Berlin"),
+        Period().daily.at("18:00").by("Europe/Berlin"),
+        "Europe/Berlin",
+        _is_last_business_day,
+    ),
+    (Period().yearly.in_months(2).on_days(29), Period().daily, None, lambda d: (d.month, d.day) == (2, 29)),
+    (
+        Period(hours=6).on_days(1, 15).in_months(1, 7).by(+3),
+        Period(hours=6).by(+3),
+        timezone(timedelta(hours=3)),
+        lambda d: d.day in (1, 15) and d.month in (1, 7),
+    ),
+    (
+        Period(minutes=30).within("01:00", "04:00").on_days(-2).by("Europe/Berlin"),
+        Period(minutes=30).within("01:00", "04:00").by("Europe/Berlin"),
+        "Europe/Berlin",
+        _is_second_to_last_day,
+    ),
+    (
+        Period().every(2).years.in_months(12).on_days(31),
+        Period().daily,
+        None,
+        lambda d: d.year % 2 == 0 and (d.month, d.day) == (12, 31),
+    ),
+    (Period().monthly.at("09:00", "17:00"), Period().daily.at("09:00", "17:00"), None, lambda d: d.day == 1),
+    (
+        Period(months=1, days_of_month=[1, -1]),
+        Period().daily,
+        None,
+        lambda d: d.day == 1 or (d + timedelta(days=1)).day == 1,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "p,base,tz,is_allowed", CASES, ids=lambda value: repr(value) if isinstance(value, Period) else "",
+)
+def test_months(p, base, tz, is_allowed, berlin):
+    tz = berlin if tz == "Europe/Berlin" else tz
+    start, end = datetime(2019, 10, 20, 5), datetime(2022, 10, 31, 3)
+    if tz is not None:
+        start, end = start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)
+    expected = [
+        moment for moment in base.between(start, end)
+        if is_allowed((moment.astimezone(tz) if tz is not None else moment).date())
+    ]
+    assert expected
+    moments = list(p.between(start, end))
+    assert moments == expected
+    assert p.count_between(start, end) == len(expected)
+    assert p.get_next_many(moments) == moments[1:] + [p.get_next(moments[-1])]
+    assert from_bytes(to_bytes(p)) == p == from_dict(to_dict(p)) == p.freeze() == pickle.loads(pickle.dumps(p.freeze()))
+    assert p != base
+
+
+def test_far_moments():
+    p = Period().yearly.in_months(2).on_days(29)
+    assert p.get_next(datetime(2096, 3, 1)) == datetime(2104, 2, 29)  # 2100 isn't a leap year
+    assert p.get_next(datetime(1601, 1, 1)) == datetime(1604, 2, 29)
+    assert Period().monthly.on.friday.on_days(-1).get_next(datetime(9000, 1, 1)) == datetime(9000, 1, 31)
+
+
+def test_aggregation():
+    p = Period().monthly.at("10:00") | Period().monthly.on_days(15).at("10:00") | Period().on.sunday.at("10:00")
+    start, end = datetime(2022, 1, 1), datetime(2022, 3, 1)
+    expected = [
+        moment for moment in Period().daily.at("10:00").between(start, end)
+        if moment.day in (1, 15) or moment.weekday() == 6
+    ]
+    assert list(p.between(start, end)) == expected
+    assert p.count_between(start, end) == len(expected)
+    optimized = PeriodAggregation(Period().monthly.on.monday, Period().monthly.on.tuesday).optimize()
+    assert len(optimized.periods) == 2
+
+
+def test_wrong_months():
+    with pytest.raises(ValueError):
+        _ = Period().monthly.every(2).days
+    with pytest.raises(ValueError):
+        _ = Period().daily.monthly
+    with pytest.raises(ValueError):
+        _ = Period().monthly.yearly
+    with pytest.raises(ValueError):
+        Period().yearly.in_months(2).on_days(30).get_next(datetime(2022, 1, 1))
+    with pytest.raises(ValueError):
+        Period().monthly.on_days(0)
+    with pytest.raises(ValueError):
+        Period().monthly.in_months(13)
+    with pytest.raises(ValueError):
+        Period().monthly.index_of(datetime(2022, 1, 1))
+    assert Period().every(12).months == Period().monthly.every(11).months
+    assert repr(Period().monthly.on.weekdays.on_days(-1)).startswith(
+        "<Period: regular_offset=86400.0s, time_offset=0s, months=1, days_of_month=-1, weekdays="
+    )
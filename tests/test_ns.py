@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from regta_period import cron, Period, PeriodAggregation
+
+PERIODS = [
+    Period(milliseconds=250),
+    Period().every(5).seconds,
+    Period(seconds=7, milliseconds=3),
+    Period().every(3).days.at("17:00").by("Europe/Moscow"),
+    Period().on.weekdays.at("18:00").by(+5.5),
+    Period().every(5).hours.on.saturday,
+    Period().every(5).hours.on.saturday.by("Europe/Berlin").freeze(),
+    Period().on.weekdays.at("18:00").by(+3) | Period().on.weekends.at("21:00").by("Asia/Tomsk"),
+    PeriodAggregation(Period().hourly, Period().daily.at("12:30"), Period(milliseconds=1700), stateful=True),
+    cron.parse("30 4 1,15 * *"),
+]
+
+
+def _to_ns(dt):
+    return (dt.replace(tzinfo=dt.tzinfo or timezone.utc) - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(
+        microseconds=1,
+    ) * 1000
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_same_moments(p):
+    dt = datetime(2022, 7, 24, 10, 11, 12, 345678)
+    if p.is_timezone_in_use:
+        dt = dt.replace(tzinfo=timezone.utc)
+    for i in range(50):
+        dt += timedelta(hours=i * 3, minutes=i * 7, microseconds=i * 1001)
+        epoch_ns = _to_ns(dt)
+        assert p.get_next_ns(epoch_ns) == _to_ns(p.get_next(dt))
+        assert p.get_interval_ns(epoch_ns) == p.get_interval(dt) // timedelta(microseconds=1) * 1000
+
+
+def test_fractions_of_microsecond():
+    p = Period(milliseconds=250)
+    assert p.get_next_ns(999) == 250_000_000
+    assert p.get_next_ns(250_000_000 - 1) == 250_000_000
+    assert p.get_next_ns(250_000_000) == 500_000_000
+    assert p.get_interval_ns(250_000_001) == 249_999_999
@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+import os
+import subprocess
+import sys
+
+import pytest
+
+from regta_period import Period
+from regta_period.exclusions import ExcludedPeriod, ExclusionCalendar
+from regta_period.occurrences import OccurrenceTable, write_table
+
+START = 1_656_000_000_123_456_789
+SECOND = 10 ** 9
+HORIZON = 3 * 86400 * SECOND
+
+PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().hourly.on.weekdays,
+    Period().daily.at("18:00").by("Europe/Moscow"),
+    Period().daily.at("12:00") | Period(hours=5),
+    Period().every(5).days,
+]
+MOMENTS = [START + i * 3_333_333_333_333 for i in range(-2, 80)]
+
+
+def _check(table, periods):
+    for i, p in enumerate(periods):
+        for moment in MOMENTS:
+            expected = p.get_next_ns(moment)
+            if table.start <= moment < table.end and expected <= table.end:
+                assert table.get_next_ns(i, moment) == expected
+            else:
+                assert table.get_next_ns(i, moment) is None
+
+
+def test_table(tmp_path):
+    path = tmp_path / "table"
+    write_table(path, PERIODS, START, START + HORIZON)
+    with OccurrenceTable(path) as table:
+        assert len(table) == len(PERIODS)
+        assert (table.start, table.end) == (START, START + HORIZON)
+        _check(table, PERIODS)
+        assert table.get_moments(1, START, START + 3 * 3600 * SECOND) == [
+            moment for moment in table.get_moments(1, START, START + HORIZON) if moment <= START + 3 * 3600 * SECOND
+        ]
+        with pytest.raises(IndexError):
+            table.get_next_ns(len(PERIODS), START)
+
+
+def test_refresh(tmp_path, monkeypatch):
+    path = tmp_path / "table"
+    write_table(path, PERIODS, START, START + HORIZON)
+    table = OccurrenceTable(path)
+    assert not table.reload()
+
+    periods = PERIODS[:2] + [Period(minutes=13)] + PERIODS[3:] + [Period(minutes=1)]
+    calculated = []
+    for p in PERIODS[:2] + PERIODS[3:]:
+        monkeypatch.setattr(p, "get_next_ns", lambda moment, get_next_ns=p.get_next_ns: (
+            calculated.append(moment) or get_next_ns(moment)
+        ))
+    write_table(path, periods, START + HORIZON // 2, START + 2 * HORIZON)
+    # moments of reused rows are calculated only after the end of the old horizon
+    assert calculated and min(calculated) == START + HORIZON
+
+    assert table.reload()
+    assert (table.start, table.end) == (START + HORIZON // 2, START + 2 * HORIZON)
+    _check(table, periods)
+
+    write_table(path, periods, START + HORIZON, START + HORIZON + 3600 * SECOND)
+    assert table.reload()
+    _check(table, periods)
+    table.close()
+
+
+def test_reuse_across_hash_seeds(tmp_path):
+    # weekdays are a set, so their order depends on the hash seed of the process
+    code = (
+        "import sys; from regta_period import Period; from regta_period.occurrences import write_table; "
+        f"write_table(sys.argv[1], [Period().hourly.on.monday.wednesday.friday.sunday], {START}, {START + HORIZON})"
+    )
+    path = tmp_path / "table"
+    fingerprints = []
+    for seed in ("1", "2", "3"):
+        subprocess.run([sys.executable, "-c", code, path], env={**os.environ, "PYTHONHASHSEED": seed}, check=True)
+        with OccurrenceTable(path) as table:
+            fingerprints.append(table._index[0])  # pylint: disable=protected-access
+    assert len(set(fingerprints)) == 1 and fingerprints[0] != -1
+
+
+def test_changed_calendar(tmp_path):
+    def excluded(*days):
+        dates = [datetime.fromtimestamp(START // SECOND + day * 86400, timezone.utc).date() for day in days]
+        return ExcludedPeriod(Period().hourly, ExclusionCalendar(dates=dates))
+
+    path = tmp_path / "table"
+    write_table(path, [excluded(1)], START, START + HORIZON)
+    # the same amount of windows, but other ones
+    periods = [excluded(2)]
+    write_table(path, periods, START, START + HORIZON)
+    with OccurrenceTable(path) as table:
+        _check(table, periods)
+
+
+def test_wrong_file(tmp_path):
+    path = tmp_path / "table"
+    path.write_bytes(b"not a table at all, just some bytes")
+    with pytest.raises(ValueError):
+        OccurrenceTable(path)
+    write_table(path, PERIODS, START, START + HORIZON)
+    with OccurrenceTable(path) as table:
+        assert len(table) == len(PERIODS)
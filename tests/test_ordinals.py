@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from itertools import product
+
+import pytest
+
+from regta_period import cron, Period, PeriodAggregation
+from regta_period.ordinals import floor_sum
+
+PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().every(5).hours.on.saturday,
+    Period().on.weekdays.at("18:00").by(+3),
+    Period().every(3).days.at("17:00").by("Europe/Moscow"),
+    Period().on.monday.wednesday.at("2:30").by("Europe/Berlin"),
+    Period(hours=7).on.tuesday.by(-5.5).freeze(),
+    Period(minutes=13).on.weekends,
+]
+AGGREGATIONS = [
+    Period(minutes=10) | Period(minutes=15) | Period(minutes=6),
+    Period().hourly.on.weekdays | Period(minutes=20).on.friday.saturday | Period(days=3).at("1:00"),
+    Period().daily.at("12:00").by("Europe/Berlin") | Period(days=2).at("12:00").by("Europe/Berlin").on.monday,
+    PeriodAggregation(*(Period(minutes=i + 2) for i in range(8)), stateful=True),
+]
+RANGES = [
+    (datetime(2022, 3, 20, 5, 17), datetime(2022, 4, 2, 1, 1)),
+    (datetime(2022, 10, 28), datetime(2022, 10, 31, 3, 3, 3)),
+    (datetime(1969, 12, 25), datetime(1970, 1, 3)),
+]
+
+
+def _ranges(p):
+    if p.is_timezone_in_use:
+        return [(start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)) for start, end in RANGES]
+    return RANGES
+
+
+def test_floor_sum():
+    for n, m, a, b in product(range(5), range(1, 6), range(-7, 8), range(-9, 10)):
+        assert floor_sum(n, m, a, b) == sum((a * i + b) // m for i in range(n))
+
+
+@pytest.mark.parametrize("p", PERIODS + AGGREGATIONS, ids=repr)
+def test_count_between(p):
+    for start, end in _ranges(p):
+        assert p.count_between(start, end) == sum(1 for _ in p.between(start, end))
+        assert p.count_between(end, start) == 0
+
+
+@pytest.mark.parametrize("p", PERIODS + AGGREGATIONS, ids=repr)
+def test_ordinals(p):
+    for start, end in _ranges(p):
+        first = p.index_of(start)
+        moments = list(p.between(start, end))
+        assert [p.index_of(moment) for moment in moments[::7]] == list(range(first + 1, first + 1 + len(moments), 7))
+        assert [p.nth(first + 1 + i) for i in range(0, len(moments), 400)] == moments[::400]
+        if moments:
+            assert p.index_of(moments[0] - timedelta(microseconds=1)) == first
+
+
+def test_initial_moment():
+    assert Period(hours=5).index_of(datetime(1970, 1, 1)) == 0
+    assert Period(hours=5).nth(-1) == datetime(1969, 12, 31, 19)
+    assert Period().daily.at("12:00").by(+3).nth(0) == datetime(1970, 1, 1, 9, tzinfo=timezone.utc)
+    assert (Period(hours=5) | Period(hours=7)).nth(0) == datetime(1970, 1, 1)
+    assert (Period(hours=5) | Period(hours=7)).index_of(datetime(1970, 1, 1, 14)) == 4
+
+    # moments are numbered since the epoch rather than since the initial moment of 31.12.1969 22:00 UTC
+    p = Period().daily.at("01:00").by(+3)
+    assert p.nth(0) == PeriodAggregation(p).nth(0) == datetime(1970, 1, 1, 22, tzinfo=timezone.utc)
+    assert p.index_of(datetime(1970, 1, 1, tzinfo=timezone.utc)) == -1
+
+
+def test_fallback(utc7):
+    start, end = datetime(2022, 3, 20, tzinfo=timezone.utc), datetime(2022, 4, 2, tzinfo=timezone.utc)
+    p = Period(hours=5).on.sunday.by("Europe/Berlin")
+    assert p.count_between(start, end) == sum(1 for _ in p.between(start, end))
+    with pytest.raises(ValueError):
+        p.index_of(start)
+    with pytest.raises(ValueError):
+        p.nth(0)
+
+    aggregation = Period().daily.at("12:00").by(utc7) | Period().hourly.by(+7)
+    assert aggregation.count_between(start, end) == sum(1 for _ in aggregation.between(start, end))
+    with pytest.raises(ValueError):
+        aggregation.index_of(start)
+
+    calendar = cron.parse("30 4 1,15 * *")
+    assert calendar.count_between(datetime(2022, 1, 1), datetime(2023, 1, 1)) == 24
+
+
+def test_wrong_datetime():
+    with pytest.raises(TypeError):
+        Period().hourly.count_between(datetime(2022, 1, 1, tzinfo=timezone.utc), datetime(2022, 1, 2))
+    with pytest.raises(TypeError):
+        (Period().hourly | Period().daily).index_of(datetime(2022, 1, 1, tzinfo=timezone.utc))
+
+
+def test_large_range():
+    start, end = datetime(2000, 1, 1), datetime(2029, 12, 31, 23, 59, 59)
+    assert Period(seconds=1).count_between(start, end) == (end - start) // timedelta(seconds=1)
+    days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+    assert Period(seconds=1).on.weekdays.count_between(start, end) == sum(day.weekday() < 5 for day in days) * 86400
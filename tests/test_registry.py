@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from regta_period import FrozenPeriod, Period, PeriodAggregation
+from regta_period.registry import PeriodRegistry
+
+
+def test_equality():
+    a = Period().on.weekdays.at("18:00").by("Europe/Moscow")
+    b = Period().on.monday.tuesday.wednesday.thursday.friday.at("18:00").by("Europe/Moscow")
+    assert a == b and hash(a) == hash(b)
+    assert a == b.freeze() and hash(a) == hash(b.freeze())
+    assert a != Period().on.weekdays.at("18:00").by("Europe/Samara")
+    assert a != Period().on.weekdays.at("18:00").by(+3)
+    assert Period() == Period().daily == Period(days=1).on.weekdays.AND.weekends
+    assert Period().hourly != Period().daily
+
+    assert (a | Period().hourly) == (Period().hourly | b | Period(hours=1))
+    assert hash(a | Period().hourly) == hash(Period().hourly | b)
+    assert (a | Period().hourly) != (a | Period().daily)
+    assert a != PeriodAggregation(a)
+
+
+def test_intern():
+    registry = PeriodRegistry()
+    a = registry.intern(Period().on.weekdays.at("18:00").by("Europe/Moscow"))
+    b = registry.intern(Period(time="18:00", timezone="Europe/Moscow").on.weekdays)
+    assert a is b and isinstance(a, FrozenPeriod)
+    c = registry.intern(Period().hourly | Period().daily.at("12:30"))
+    assert c is registry.intern(Period().daily.at("12:30") | Period().hourly)
+    assert len(registry) == 2 and Period().on.weekdays.at("18:00").by("Europe/Moscow") in registry
+
+
+def test_intern_fixed_timezones():
+    registry = PeriodRegistry()
+    utc = registry.intern(Period().daily.at("12:00").by(0))
+    assert utc is registry.intern(Period().daily.at("12:00").by(timezone.utc))
+    plus_3 = registry.intern(Period().daily.at("12:00").by(timezone(timedelta(hours=3))))
+    assert plus_3 is registry.intern(Period().daily.at("12:00").by(3))
+    assert len(registry) == 2 and utc != plus_3
+
+
+class CountingPeriod(Period):
+    calls = 0
+
+    def get_next(self, dt):
+        CountingPeriod.calls += 1
+        return super().get_next(dt)
+
+
+def test_tick_cache():
+    registry = PeriodRegistry()
+    jobs = [CountingPeriod(hours=1) for _ in range(100)]
+    tick = datetime(2023, 1, 1, 10, 30)
+    for _ in range(3):
+        assert {registry.get_next(period, tick) for period in jobs} == {tick + timedelta(minutes=30)}
+        assert registry.get_interval(jobs[0], tick) == timedelta(minutes=30)
+        tick += timedelta(hours=1)
+    assert CountingPeriod.calls == 3
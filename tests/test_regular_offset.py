@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from regta_period import Period
 
@@ -59,3 +59,27 @@ def test_daily_and_hourly():
 
     assert Period().hourly.get_interval(dt) == timedelta(seconds=15)
     assert Period().daily.get_interval(dt) == timedelta(hours=21, minutes=0, seconds=15)
+
+
+def test_sub_second_precision():
+    p = Period(milliseconds=100)
+    dt = datetime(9000, 12, 31, 23, 59, 59, 950000)
+    assert p.get_next(dt) == datetime(9001, 1, 1, 0, 0, 0)
+    assert p.get_interval(dt) == timedelta(milliseconds=50)
+
+    p = Period(seconds=7, milliseconds=3)
+    dt = datetime(3000, 1, 1)
+    assert (p.get_next(dt) - datetime.utcfromtimestamp(0)) % timedelta(seconds=7, milliseconds=3) == timedelta(0)
+
+
+def test_compiled_form_is_reset():
+    dt = datetime.utcfromtimestamp(0)
+    p = Period().every(2).days
+    assert p.get_next(dt) == dt + timedelta(days=2)
+    p.at("10:00")
+    assert p.get_next(dt) == dt + timedelta(hours=10)
+    p.by(+1)
+    assert p.get_next(dt.replace(tzinfo=timezone.utc)) == dt.replace(tzinfo=timezone.utc) + timedelta(hours=9)
+    p = Period().every(2).hours
+    assert p.get_interval(dt) == timedelta(hours=2)
+    assert p.every(1).hours.get_interval(dt) == timedelta(hours=3)
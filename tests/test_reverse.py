@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from regta_period import cron, Period
+from regta_period.exclusions import ExclusionCalendar
+
+PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().every(3).days.at("17:00").by(+3),
+    Period().daily.at("02:30").by("Europe/Berlin"),
+    Period().every(25).minutes.on.weekdays.by("Europe/Berlin"),
+    Period().every(5).hours.on.saturday,
+    Period().on.weekdays.at("09:00", "13:00", "17:00").by("Europe/Berlin"),
+    Period().every(7).minutes.within("01:30", "03:15").by("Europe/Berlin"),
+    Period().every(25).minutes.on.weekdays.within("22:00", "06:00").by(+3),
+    Period().monthly.on.weekdays.on_days(-1).at("18:00").by("Europe/Berlin"),
+    Period().yearly.in_months(2).on_days(29),
+    Period().on.weekdays.at("18:00").by(+3) | Period().on.weekends.at("21:00").by("Europe/Berlin"),
+    Period().every(4).hours | Period().every(6).hours,
+    # the generic implementation
+    Period().hourly.exclude(ExclusionCalendar(dates=[date(2022, 3, 26), date(2022, 10, 30)])),
+    cron.parse("*/20 9-17 1,15 * *"),
+    Period().every(3).hours.shard(1, 3),
+]
+STARTS = [datetime(2022, 3, 27, 1, 59), datetime(2022, 10, 30, 3), datetime(2024, 3, 1)]
+
+
+def _to_ns(moment):
+    moment = moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1) * 1000
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_get_prev(p):
+    for start in STARTS:
+        if p.is_timezone_in_use:
+            start = start.replace(tzinfo=timezone.utc)
+        moments = list(islice(p.iter_reversed(start), 50))
+        assert moments == sorted(set(moments), reverse=True)
+        assert moments[0] < start
+        assert list(p.between(moments[-1], start - timedelta(microseconds=1))) == moments[-2::-1]
+        assert [p.get_prev(moment) for moment in moments[:-1]] == moments[1:]
+        assert [p.get_prev(moment + timedelta(microseconds=1)) for moment in moments] == moments
+        timestamp = _to_ns(start)
+        assert p.get_prev_ns(timestamp) == _to_ns(moments[0]) == p.get_prev_ns(_to_ns(moments[0]) + 1)
+        assert p.get_prev_ns(_to_ns(moments[0])) == _to_ns(moments[1])
+
+
+def test_catch_up():
+    p = Period().on.weekdays.at("09:00")
+    # the last missed moment after a restart on Monday morning is on Friday
+    assert p.get_prev(datetime(2022, 10, 24, 8)) == datetime(2022, 10, 21, 9)
+    assert p.get_prev(datetime(2022, 10, 24, 9)) == datetime(2022, 10, 21, 9)
+    assert p.get_prev(datetime(2022, 10, 24, 9, 0, 0, 1)) == datetime(2022, 10, 24, 9)
+    with pytest.raises(TypeError):
+        p.get_prev(datetime(2022, 10, 24, tzinfo=timezone.utc))
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+
+from regta_period import Period, PeriodAggregation, serialization
+
+from .conftest import SAMPLE_PERIODS
+
+PERIODS = [
+    *SAMPLE_PERIODS,
+    PeriodAggregation(Period().hourly, Period().daily.at("12:30"), stateful=True),
+]
+
+
+def _assert_same(p, loaded):
+    assert serialization.to_dict(loaded) == serialization.to_dict(p)
+    dt = datetime(2022, 7, 24, 10, 11, 12)
+    if p.is_timezone_in_use:
+        dt = dt.replace(tzinfo=timezone.utc)
+    for _ in range(20):
+        assert loaded.get_next(dt) == p.get_next(dt)
+        dt += timedelta(hours=13, minutes=7)
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_dict(p):
+    data = json.loads(json.dumps(serialization.to_dict(p)))
+    _assert_same(p, serialization.from_dict(data))
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_bytes(p):
+    _assert_same(p, serialization.from_bytes(serialization.to_bytes(p)))
+
+
+@pytest.mark.parametrize("tz", [timezone.utc, timezone(timedelta(hours=5, minutes=30, seconds=15))], ids=repr)
+def test_fixed_timezone(tz):
+    p = Period().daily.at("12:30").by(tz)
+    assert serialization.from_dict(serialization.to_dict(p)) == p
+    assert serialization.from_bytes(serialization.to_bytes(p)) == p
+
+
+def test_load_many():
+    loaded = serialization.load_many(serialization.dump_many(PERIODS * 100))
+    assert len(loaded) == len(PERIODS) * 100
+    for p, loaded_p in zip(PERIODS * 100, loaded):
+        assert serialization.to_dict(loaded_p) == serialization.to_dict(p)
+
+    loaded = serialization.load_many([serialization.to_dict(PERIODS[1]), serialization.to_bytes(PERIODS[1])])
+    # time zones are shared
+    assert loaded[0]._timezone is loaded[1]._timezone  # pylint: disable=protected-access
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        serialization.from_bytes(b"XX\x01\x00\x00\x00\x00")
+    with pytest.raises(ValueError):
+        serialization.from_dict({"version": 0, "type": "period"})
+
+    class CustomTimezone(timezone.__base__):  # type: ignore
+        def utcoffset(self, dt):  # pylint: disable=unused-argument
+            return timedelta(0)
+
+    with pytest.raises(ValueError):
+        serialization.to_dict(Period().by(CustomTimezone()))
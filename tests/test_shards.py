@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from regta_period import cron, Period, PeriodAggregation
+
+PERIODS = [
+    Period(seconds=7, milliseconds=3),
+    Period().on.weekdays.at("18:00").by(+3),
+    Period().daily.at("2:30").by("Europe/Berlin"),
+    Period().hourly.on.weekdays | Period(minutes=20).on.friday.saturday,
+    PeriodAggregation(Period(minutes=10), Period(minutes=15), stateful=True),
+    Period(minutes=5).shard(1, 2),
+]
+
+
+@pytest.mark.parametrize("p", PERIODS, ids=repr)
+def test_shards(p):
+    start = datetime(2022, 3, 24, 13, 14, 15, tzinfo=timezone.utc if p.is_timezone_in_use else None)
+    moments = [moment for _, moment in zip(range(60), p.iter(start))]
+    shards = [p.shard(k, 3) for k in range(3)]
+    sharded = [[moment for _, moment in zip(range(20), shard.iter(start))] for shard in shards]
+
+    first = p.index_of(moments[0])
+    for k, shard_moments in enumerate(sharded):
+        assert shard_moments == [moment for i, moment in enumerate(moments, first) if i % 3 == k]
+        assert [shards[k].nth(shards[k].index_of(moment)) for moment in shard_moments] == shard_moments
+        assert shards[k].count_between(start, moments[-1]) == 20
+    assert shards[0].get_interval(start) == sharded[0][0] - start
+    assert shards[0].get_next(moments[-1] + timedelta(days=30)) in p.iter(moments[-1] + timedelta(days=29))
+
+
+def test_same_shards_of_aggregation():
+    start = datetime(2022, 3, 24, 13, 14, 15, tzinfo=timezone.utc)
+    p = Period().daily.at("01:00").by(+3)
+    for k in range(3):
+        moments = [moment for _, moment in zip(range(10), p.shard(k, 3).iter(start))]
+        assert moments == [moment for _, moment in zip(range(10), PeriodAggregation(p).shard(k, 3).iter(start))]
+
+
+def test_equality():
+    assert Period().hourly.shard(1, 3) == Period(hours=1).shard(1, 3)
+    assert hash(Period().hourly.shard(1, 3)) == hash(Period(hours=1).shard(1, 3))
+    assert Period().hourly.shard(1, 3) != Period().hourly.shard(2, 3)
+
+
+def test_wrong_shards():
+    with pytest.raises(ValueError):
+        Period().hourly.shard(3, 3)
+    with pytest.raises(ValueError):
+        Period().hourly.shard(0, 0)
+    with pytest.raises(ValueError):
+        Period(hours=5).on.sunday.by("Europe/Berlin").shard(0, 2)
+    with pytest.raises(TypeError):
+        cron.parse("0 0 1 * *").shard(0, 2)
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+from zlib import crc32
+
+import pytest
+
+from regta_period import Period
+from regta_period.serialization import from_bytes, to_bytes
+from regta_period.spread import get_load, get_phase
+
+START = datetime(2022, 1, 1)
+
+
+def test_phase():
+    assert get_phase("job-42", 300) == crc32(b"job-42") % 300
+    assert get_phase(b"job-42", 300) == get_phase("job-42", 300)
+    assert all(0 <= get_phase(f"job-{i}", 7) < 7 for i in range(100))
+    with pytest.raises(ValueError):
+        get_phase("job-42", 0)
+
+
+def test_spread():
+    p = Period().every(5).minutes.spread("job-42", 300)
+    phase = timedelta(seconds=get_phase("job-42", 300))
+    assert p == Period().every(5).minutes.spread("job-42", 300)
+    assert p.get_next(START) == START + phase
+    assert p.get_next(START + phase) == START + phase + timedelta(minutes=5)
+    assert from_bytes(to_bytes(p)) == p
+
+    daily = Period().daily.at("18:00").by(+3).spread("job-42", 3600)
+    moment = datetime(2022, 7, 1, 15, tzinfo=timezone.utc) + timedelta(seconds=get_phase("job-42", 3600))
+    assert daily.get_next(datetime(2022, 7, 1, tzinfo=timezone.utc)) == moment
+
+
+def test_wrong_window():
+    with pytest.raises(ValueError):
+        Period().every(5).minutes.spread("job-42", 301)
+    Period().daily.spread("job-42", 86400)
+
+
+def test_load():
+    end = START + timedelta(minutes=5)
+    assert get_load([Period().every(5).minutes] * 1000, START, end) == [0] * 299 + [1000]
+    spread = [Period().every(5).minutes.spread(f"job-{i}", 300) for i in range(1000)]
+    load = get_load(spread, START, end)
+    assert len(load) == 300 and sum(load) == 1000 and max(load) < 15
+    assert get_load(spread, START, end, timedelta(minutes=1)) == [
+        sum(load[i:i + 60]) for i in range(0, 300, 60)
+    ]
+    assert get_load(spread, end, START) == []
+    with pytest.raises(ValueError):
+        get_load(spread, START, end, timedelta(0))
@@ -0,0 +1,81 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from regta_period import Period
+from regta_period.serialization import from_bytes, from_dict, to_bytes, to_dict
+
+# periods with time windows and the same periods without them, local time zones and windows
+CASES = [
+    (Period(minutes=5).within("09:00", "18:00"), Period(minutes=5), None, (time(9), time(18))),
+    (
+        Period(minutes=25).on.weekdays.within("22:00", "06:00").by(+3),
+        Period(minutes=25).on.weekdays.by(+3),
+        timezone(timedelta(hours=3)),
+        (time(22), time(6)),
+    ),
+    (
+        Period(minutes=7).within("01:30", "03:15").by("Europe/Berlin"),
+        Period(minutes=7).by("Europe/Berlin"),
+        "Europe/Berlin",
+        (time(1, 30), time(3, 15)),
+    ),
+    (
+        Period(hours=5).on.saturday.sunday.within("10:00", "24:00").by("Europe/Berlin"),
+        Period(hours=5).on.saturday.sunday.by("Europe/Berlin"),
+        "Europe/Berlin",
+        (time(10), time(0)),
+    ),
+    (Period(seconds=7, milliseconds=3).within("23:59", "00:01"), Period(seconds=7, milliseconds=3), None,
+     (time(23, 59), time(0, 1))),
+]
+RANGES = [
+    (datetime(2022, 3, 25, 5, 17), datetime(2022, 3, 28, 1, 1)),
+    (datetime(2022, 10, 28), datetime(2022, 10, 31, 3, 3, 3)),
+]
+
+
+def _is_allowed(moment, window):
+    start, end = window
+    local = moment.time()
+    return start <= local < end if start < end else local >= start or local < end
+
+
+@pytest.mark.parametrize("p,base,tz,window", CASES, ids=lambda value: repr(value) if isinstance(value, Period) else "")
+def test_within(p, base, tz, window, berlin):
+    tz = berlin if tz == "Europe/Berlin" else tz
+    for start, end in RANGES:
+        if tz is not None:
+            start, end = start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)
+        expected = [
+            moment for moment in base.between(start, end)
+            if _is_allowed(moment.astimezone(tz) if tz is not None else moment, window)
+        ]
+        moments = list(p.between(start, end))
+        assert moments == expected
+        assert p.count_between(start, end) == len(expected)
+        assert p.freeze().get_next_many(moments) == moments[1:] + [p.get_next(moments[-1])]
+        timestamps = [1_648_200_000_000_000, 1_667_000_000_000_001, 0]
+        assert p.get_next_many(timestamps) == [p.get_next_ns(value * 1000) // 1000 for value in timestamps]
+    assert from_bytes(to_bytes(p)) == p == from_dict(to_dict(p)) == p.freeze()
+    assert p != base
+
+
+def test_jump():
+    # the next moment after the window is found without stepping through the closed hours
+    p = Period(seconds=1).within("09:00", "09:00:01").on.monday
+    assert p.get_next(datetime(2022, 10, 24, 9)) == datetime(2022, 10, 31, 9)
+
+
+def test_wrong_window():
+    with pytest.raises(ValueError):
+        Period(minutes=5).within("09:00", "09:00")
+    with pytest.raises(ValueError):
+        Period(minutes=5).within("00:00", "24:00")
+    with pytest.raises(ValueError):
+        Period().daily.at("03:00").within("09:00", "18:00").freeze()
+    with pytest.raises(ValueError):
+        Period().daily.at("09:00", "10:00").within("09:00", "18:00").get_next(datetime(2022, 1, 1))
+    with pytest.raises(ValueError):
+        Period(minutes=5).within("09:00", "18:00").index_of(datetime(2022, 1, 1))
+    assert Period(minutes=5, window=("09:00", "18:00")) == Period(minutes=5).within("09:00", "18:00")
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from regta_period import Period, timezones
+from regta_period.timestamps import from_timestamp, to_timestamp
+
+
+@pytest.fixture(name="table")
+def fixture_table(berlin):
+    timezones.set_horizon(2020, 2025)
+    yield timezones.get_transition_table(berlin)
+    timezones.set_horizon(datetime.now().year - 1, datetime.now().year + 10)
+
+
+def test_table_offsets(table: timezones.TransitionTable, berlin):
+    assert table is timezones.get_transition_table(berlin)
+    assert len(table.transitions) == 1 + 2 * 5
+    for hours in range(0, 24 * 365 * 8, 7):
+        dt = datetime(2019, 1, 1, tzinfo=timezone.utc) + timedelta(hours=hours, seconds=hours % 60)
+        assert table.utcoffset(to_timestamp(dt)) == dt.astimezone(berlin).utcoffset() // timedelta(microseconds=1)
+
+
+def test_table_gap_and_fold(table: timezones.TransitionTable):
+    def to_utc(*args):
+        local = to_timestamp(datetime(*args))
+        return from_timestamp(table.to_utc(local), timezone.utc)
+
+    # 27.03.2022 02:00 CET -> 03:00 CEST, local time in the gap is shifted forward by the gap length
+    assert to_utc(2022, 3, 27, 1, 59) == datetime(2022, 3, 27, 0, 59, tzinfo=timezone.utc)
+    assert to_utc(2022, 3, 27, 2, 30) == datetime(2022, 3, 27, 1, 30, tzinfo=timezone.utc)
+    assert to_utc(2022, 3, 27, 3, 0) == datetime(2022, 3, 27, 1, 0, tzinfo=timezone.utc)
+    # 30.10.2022 03:00 CEST -> 02:00 CET, local time in the fold is the first occurrence
+    assert to_utc(2022, 10, 30, 1, 59) == datetime(2022, 10, 29, 23, 59, tzinfo=timezone.utc)
+    assert to_utc(2022, 10, 30, 2, 30) == datetime(2022, 10, 30, 0, 30, tzinfo=timezone.utc)
+    assert to_utc(2022, 10, 30, 3, 0) == datetime(2022, 10, 30, 2, 0, tzinfo=timezone.utc)
+    # outside the horizon the time zone is used directly with the same rules
+    assert to_utc(2030, 3, 31, 2, 30) == datetime(2030, 3, 31, 1, 30, tzinfo=timezone.utc)
+    assert to_utc(2030, 10, 27, 2, 30) == datetime(2030, 10, 27, 0, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.usefixtures("table")
+def test_wall_clock_time(berlin):
+    p = Period().daily.at("17:00").by("Europe/Berlin")
+    dt = datetime(2022, 3, 25, 12, tzinfo=berlin)
+    assert list(islice(p.iter(dt), 3)) == [
+        datetime(2022, 3, 25, 17, tzinfo=berlin),
+        datetime(2022, 3, 26, 17, tzinfo=berlin),
+        datetime(2022, 3, 27, 17, tzinfo=berlin),
+    ]
+    # 23 hours since the clocks spring forward
+    assert p.get_interval(datetime(2022, 3, 26, 17, tzinfo=berlin)) == timedelta(hours=23)
+    assert p.get_next(datetime(2022, 3, 26, 17, tzinfo=timezone.utc)) == datetime(
+        2022, 3, 27, 15, tzinfo=timezone.utc,
+    )
+
+
+@pytest.mark.usefixtures("table")
+def test_gap_and_fold(berlin):
+    p = Period().daily.at("02:30").by("Europe/Berlin")
+    # 02:30 doesn't exist on 27.03.2022, so it's 03:30 CEST
+    assert p.get_next(datetime(2022, 3, 27, tzinfo=berlin)) == datetime(2022, 3, 27, 1, 30, tzinfo=timezone.utc)
+    # 02:30 occurs twice on 30.10.2022, only the first one is a moment
+    moments = list(p.between(datetime(2022, 10, 29, 12, tzinfo=berlin), datetime(2022, 10, 31, 12, tzinfo=berlin)))
+    assert [to_timestamp(moment) for moment in moments] == [
+        to_timestamp(datetime(2022, 10, 30, 0, 30, tzinfo=timezone.utc)),
+        to_timestamp(datetime(2022, 10, 31, 1, 30, tzinfo=timezone.utc)),
+    ]
+
+
+@pytest.mark.usefixtures("table")
+def test_elapsed_time(berlin):
+    p = Period().every(1).hours.on.sunday.by("Europe/Berlin")
+    dt = datetime(2022, 10, 30, 1, 30, tzinfo=berlin)
+    moments = list(islice(p.iter(dt), 23))
+    # intervals are elapsed time even across the transition
+    timestamps = [to_timestamp(moment) for moment in moments]
+    assert all(b - a == 60 * 60 * 10 ** 6 for a, b in zip(timestamps, timestamps[1:]))
+    # and weekdays are local, Monday 00:00 CET isn't a moment
+    assert moments[-1] == datetime(2022, 10, 30, 23, tzinfo=berlin)
+    assert p.get_next(moments[-1]) == datetime(2022, 11, 6, 0, tzinfo=berlin)
+
+
+@pytest.mark.usefixtures("table")
+def test_elapsed_time_window_in_summer(utc):
+    # every 16 hours falls into the window only in winter, when local time is UTC+1
+    p = Period().every(16).hours.within("07:00", "08:30").by("Europe/Berlin")
+    assert p.get_next(datetime(2024, 6, 1, tzinfo=utc)) == datetime(2024, 10, 27, 7, tzinfo=utc)
+    assert p.get_prev(datetime(2024, 6, 1, tzinfo=utc)) == datetime(2024, 3, 29, 7, tzinfo=utc)
+    # outside the horizon of the table transitions are unknown, so moments are checked one by one
+    assert p.get_next(datetime(2027, 6, 1, tzinfo=utc)) == datetime(2027, 11, 1, 7, tzinfo=utc)
+    assert p.get_prev(datetime(2027, 6, 1, tzinfo=utc)) == datetime(2027, 3, 26, 7, tzinfo=utc)
+    with pytest.raises(ValueError):
+        Period().every(16).hours.within("12:00", "12:30").by("Europe/Berlin").freeze()
+
+
+def test_table_transitions(table: timezones.TransitionTable, utc):
+    dt = datetime(2024, 6, 1, tzinfo=utc)
+    assert from_timestamp(table.get_next_transition(to_timestamp(dt)), utc) == datetime(2024, 10, 27, 1, tzinfo=utc)
+    assert from_timestamp(table.get_prev_transition(to_timestamp(dt)), utc) == datetime(2024, 3, 31, 1, tzinfo=utc)
+    assert table.get_next_transition(to_timestamp(datetime(2026, 6, 1, tzinfo=utc))) is None
+    assert table.get_prev_transition(to_timestamp(datetime(2020, 2, 1, tzinfo=utc))) is None
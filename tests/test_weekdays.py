@@ -1,7 +1,9 @@
 # pylint: disable=protected-access
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from regta_period import Period, Weekdays
+import pytest
+
+from regta_period import Period, PeriodAggregation, Weekdays
 
 
 def test_creation():
@@ -39,3 +41,41 @@ def test_weekdays_and_weekends():
     weekends = {Weekdays.SATURDAY, Weekdays.SUNDAY}
     assert Period().weekends._weekdays == weekends
     assert Period().on.weekends.AND.monday._weekdays == (weekends | {Weekdays.MONDAY})
+
+
+def test_sparse_calculations():
+    dt = datetime(2022, 7, 24, 0, 0, 0, 0)  # Sunday
+    assert Period().every(5).minutes.on.saturday.get_next(dt) == datetime(2022, 7, 30, 0, 0, 0, 0)
+    assert Period().every(7).hours.on.friday.get_next(dt) == datetime(2022, 7, 29, 4, 0, 0, 0)
+    # Every 3 days since Thursday 01.01.1970 fall on Monday once in 3 weeks
+    p = Period().every(3).days.on.monday
+    moment = p.get_next(dt)
+    assert moment == datetime(2022, 8, 8, 0, 0, 0, 0)
+    assert p.get_next(moment) == moment + timedelta(weeks=3)
+
+
+def test_weekdays_in_period_timezone():
+    p = Period().on.monday.at("01:00").by(+3)
+    dt = datetime(2022, 7, 24, 0, 0, 0, 0, tzinfo=timezone.utc)  # Sunday
+    # 01:00 on Monday by UTC+3 is still Sunday by UTC
+    assert p.get_next(dt) == datetime(2022, 7, 24, 22, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def test_unsatisfiable_weekdays(unix: datetime):
+    with pytest.raises(ValueError):
+        _ = Period().every(7).days.on.monday
+    with pytest.raises(ValueError):
+        _ = Period().on.monday.every(7).days
+    with pytest.raises(ValueError):
+        Period(days=14, weekdays=[Weekdays.FRIDAY])
+    # every 7 days since Thursday, it may still get an exact time on Friday
+    p = Period(days=7).on.friday
+    with pytest.raises(ValueError):
+        PeriodAggregation(Period().hourly, p)
+    assert Period().every(7).days.on.thursday.get_next(unix) == unix + timedelta(days=7)
+
+    # the period is checked as a whole, so the order of the builder calls doesn't matter
+    p1 = Period().every(7).days.on.friday.at("24:00")
+    p2 = Period().every(7).days.at("24:00").on.friday
+    assert p1.get_next(unix) == p2.get_next(unix) == unix + timedelta(days=1)
+    assert p1.freeze() == p2.freeze()
@@ -0,0 +1,79 @@
+from random import Random
+
+import pytest
+
+from regta_period import Period
+from regta_period.wheel import TimingWheel
+
+START = 1_656_000_000_123_456_789
+SECOND = 10 ** 9
+
+PERIODS = [
+    Period(seconds=1),
+    Period(seconds=7, milliseconds=3),
+    Period(minutes=5),
+    Period().hourly,
+    Period().on.weekdays.at("18:00").by("Europe/Moscow"),
+    Period().daily.at("12:00") | Period(hours=5),
+    Period().every(3).days.at("17:00"),
+]
+
+
+def _reference(periods, start, moments):
+    """Moments and indexes of periods due at each passed moment, computed directly."""
+    next_moments = [p.get_next_ns(start) for p in periods]
+    result = []
+    for now in moments:
+        due = sorted((moment, i) for i, moment in enumerate(next_moments) if moment <= now)
+        for _, i in due:
+            next_moments[i] = periods[i].get_next_ns(now)
+        result.append(due)
+    return result
+
+
+@pytest.mark.parametrize("bits,levels", [(6, 5), (2, 2), (1, 1)])
+def test_advance(bits, levels):
+    random = Random(bits)
+    moments, now = [], START
+    for _ in range(300):
+        now += random.choice([1, 999_999, SECOND // 3, 17 * SECOND, 3600 * SECOND, 5 * 86400 * SECOND])
+        moments.append(now)
+
+    wheel = TimingWheel(START, resolution=1, bits=bits, levels=levels)
+    for i, p in enumerate(PERIODS):
+        wheel.insert(p, i)
+    assert len(wheel) == len(PERIODS)
+    assert [sorted(wheel.advance(now)) for now in moments] == _reference(PERIODS, START, moments)
+    assert len(wheel) == len(PERIODS)
+
+
+def test_resolution():
+    wheel = TimingWheel(START, resolution=SECOND)
+    wheel.insert(Period(milliseconds=1500))
+    moment = Period(milliseconds=1500).get_next_ns(START)
+    # moments are rounded up to the resolution, so they're never early
+    assert wheel.advance(moment) == []
+    assert wheel.advance(-(-moment // SECOND) * SECOND) == [(moment, Period(milliseconds=1500))]
+
+
+def test_cancel():
+    wheel = TimingWheel(START)
+    entries = [wheel.insert(Period(seconds=i + 1), i) for i in range(100)]
+    assert all(wheel.cancel(entry) for entry in entries[::2])
+    assert not wheel.cancel(entries[0])
+    assert len(wheel) == 50
+    due = wheel.advance(START + 100 * SECOND)
+    assert sorted(item for _, item in due) == list(range(1, 100, 2))
+    assert wheel.cancel(entries[1]) and len(wheel) == 49
+
+
+def test_past():
+    wheel = TimingWheel(START)
+    wheel.insert(Period(seconds=1))
+    assert wheel.advance(START - SECOND) == []
+    assert len(wheel.advance(START + SECOND)) == 1
+
+
+def test_wrong_arguments():
+    with pytest.raises(ValueError):
+        TimingWheel(START, resolution=0)